@@ -0,0 +1,113 @@
+"""
+Script de backup do banco de dados.
+
+Como usar:
+    python backup_banco.py criar                 -> backup em <pasta de dados>/backups
+    python backup_banco.py criar --compactar     -> backup compactado (.db.gz)
+    python backup_banco.py criar --destino X.db  -> backup em um arquivo específico
+    python backup_banco.py listar                -> lista os backups existentes
+    python backup_banco.py rotacionar --manter 7 -> apaga os backups mais antigos
+    python backup_banco.py restaurar ARQUIVO     -> restaura um backup
+
+O backup pode ser feito com o sistema aberto. Para restaurar,
+feche o sistema em todos os caixas.
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+
+from database.backup import (
+    PASTA_BACKUPS,
+    MANTER_BACKUPS,
+    fazer_backup,
+    listar_backups,
+    rotacionar_backups,
+    restaurar_backup
+)
+
+
+def _mostrar_progresso(copiadas, total):
+    percentual = copiadas / total * 100 if total else 100
+    print(f"\r   Copiando páginas: {copiadas}/{total} ({percentual:.0f}%)", end="", flush=True)
+
+
+def comando_criar(args):
+    print("💾 Criando backup...")
+    arquivo = fazer_backup(
+        destino=args.destino,
+        compactar=args.compactar,
+        ao_progresso=_mostrar_progresso
+    )
+    print()
+    print(f"✓ Backup criado: {arquivo}")
+    return True
+
+
+def comando_listar(args):
+    backups = listar_backups()
+    if not backups:
+        print(f"Nenhum backup encontrado em {PASTA_BACKUPS}")
+        return True
+
+    print(f"Backups em {PASTA_BACKUPS}:")
+    for arquivo in backups:
+        data = datetime.fromtimestamp(os.path.getmtime(arquivo)).strftime("%d/%m/%Y %H:%M")
+        tamanho = os.path.getsize(arquivo) / 1024
+        print(f"   {data}  {tamanho:>10.0f} KB  {os.path.basename(arquivo)}")
+    return True
+
+
+def comando_rotacionar(args):
+    apagados = rotacionar_backups(manter=args.manter)
+    print(f"✓ {len(apagados)} backup(s) antigo(s) apagado(s)")
+    return True
+
+
+def comando_restaurar(args):
+    print(f"⚠ O banco atual será substituído pelo backup:\n   {args.arquivo}")
+    if not args.sim:
+        resposta = input("Digite SIM para confirmar: ")
+        if resposta.strip().upper() != "SIM":
+            print("Restauração cancelada.")
+            return False
+
+    try:
+        restaurar_backup(args.arquivo)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"❌ {e}")
+        return False
+
+    print("✓ Backup restaurado com sucesso!")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backup do banco de dados do Sistema PDV")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+
+    criar = subcomandos.add_parser("criar", help="Cria um backup do banco")
+    criar.add_argument("--destino", help="Arquivo de destino")
+    criar.add_argument("--compactar", action="store_true", help="Compacta o backup com gzip")
+    criar.set_defaults(funcao=comando_criar)
+
+    listar = subcomandos.add_parser("listar", help="Lista os backups existentes")
+    listar.set_defaults(funcao=comando_listar)
+
+    rotacionar = subcomandos.add_parser("rotacionar", help="Apaga os backups mais antigos")
+    rotacionar.add_argument("--manter", type=int, default=MANTER_BACKUPS, help="Quantos backups manter")
+    rotacionar.set_defaults(funcao=comando_rotacionar)
+
+    restaurar = subcomandos.add_parser("restaurar", help="Restaura um backup")
+    restaurar.add_argument("arquivo", help="Arquivo de backup (.db ou .db.gz)")
+    restaurar.add_argument("--sim", action="store_true", help="Não pede confirmação")
+    restaurar.set_defaults(funcao=comando_restaurar)
+
+    args = parser.parse_args()
+    sucesso = args.funcao(args)
+    sys.exit(0 if sucesso else 1)
+
+
+if __name__ == "__main__":
+    main()
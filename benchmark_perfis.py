@@ -0,0 +1,108 @@
+"""
+Benchmark dos perfis de desempenho do banco de dados.
+Mede a latência do commit de registrar_venda em cada perfil de PERFIS_BANCO.
+
+Como usar:
+1. Execute: python benchmark_perfis.py
+   (opcional) python benchmark_perfis.py 500   -> número de vendas por perfil
+2. Compare as latências no terminal
+
+O benchmark usa bancos temporários: o banco da loja não é alterado.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import statistics
+import time
+
+from database.conexao import PERFIS_BANCO, configurar_banco, fechar_conexoes
+from dao.produtos_dao import inserir_produto
+from dao.vendas_dao import registrar_venda
+from models.produto import Produto
+from models.venda import Venda, ItemVenda
+
+
+QUANTIDADE_PRODUTOS = 200
+ITENS_POR_VENDA = 3
+
+
+def preparar_produtos():
+    """Cadastra os produtos usados nas vendas do benchmark."""
+    produtos = []
+    for i in range(QUANTIDADE_PRODUTOS):
+        produto = inserir_produto(Produto(
+            codigo_barras=f"789{i:010d}",
+            nome=f"Produto Benchmark {i}",
+            categoria="Teste",
+            preco_custo=10.0,
+            preco_venda=25.0,
+            estoque=1_000_000
+        ))
+        produtos.append(produto)
+    return produtos
+
+
+def medir_perfil(perfil, quantidade_vendas):
+    """
+    Registra vendas em um banco novo usando o perfil informado.
+
+    Returns:
+        list[float]: Latência de cada registrar_venda em milissegundos
+    """
+    pasta = tempfile.mkdtemp(prefix=f"pdv_bench_{perfil}_")
+    try:
+        configurar_banco(os.path.join(pasta, "benchmark.db"), perfil=perfil)
+        produtos = preparar_produtos()
+
+        latencias = []
+        for i in range(quantidade_vendas):
+            venda = Venda(forma_pagamento="DINHEIRO")
+            for j in range(ITENS_POR_VENDA):
+                produto = produtos[(i * ITENS_POR_VENDA + j) % len(produtos)]
+                item = ItemVenda(
+                    produto_id=produto.id,
+                    quantidade=1,
+                    preco_unitario=produto.preco_venda
+                )
+                item.calcular_subtotal()
+                venda.itens.append(item)
+            venda.total = sum(item.subtotal for item in venda.itens)
+
+            inicio = time.perf_counter()
+            registrar_venda(venda)
+            latencias.append((time.perf_counter() - inicio) * 1000)
+
+        return latencias
+    finally:
+        fechar_conexoes()
+        shutil.rmtree(pasta, ignore_errors=True)
+
+
+def executar_benchmark(quantidade_vendas=200):
+    print("=" * 60)
+    print("⏱️  BENCHMARK DOS PERFIS DE BANCO - registrar_venda")
+    print("=" * 60)
+    print(f"\n{quantidade_vendas} vendas por perfil, {ITENS_POR_VENDA} itens por venda\n")
+
+    print(f"{'Perfil':<12} {'média':>9} {'mediana':>9} {'p95':>9} {'máx':>9}   (ms)")
+    print("-" * 60)
+
+    for perfil in PERFIS_BANCO:
+        latencias = sorted(medir_perfil(perfil, quantidade_vendas))
+        p95 = latencias[int(len(latencias) * 0.95) - 1]
+        print(
+            f"{perfil:<12} "
+            f"{statistics.mean(latencias):>9.3f} "
+            f"{statistics.median(latencias):>9.3f} "
+            f"{p95:>9.3f} "
+            f"{latencias[-1]:>9.3f}"
+        )
+
+    print()
+
+
+if __name__ == "__main__":
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    executar_benchmark(quantidade)
@@ -4,6 +4,7 @@ Gerencia todas as operações relacionadas a produtos
 """
 
 from database import conectar
+from dao import produtos_dao
 from models import Produto
 
 
@@ -59,38 +60,9 @@ class ProdutoController:
             ativo=1
         )
         
-        # Salva no banco
-        conexao = conectar()
-        cursor = conexao.cursor()
-        
-        try:
-            cursor.execute("""
-                INSERT INTO produtos (
-                    codigo_barras, nome, categoria, tamanho, cor,
-                    preco_custo, preco_venda, estoque, ativo
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                produto.codigo_barras,
-                produto.nome,
-                produto.categoria,
-                produto.tamanho,
-                produto.cor,
-                produto.preco_custo,
-                produto.preco_venda,
-                produto.estoque,
-                produto.ativo
-            ))
-            
-            conexao.commit()
-            produto.id = cursor.lastrowid
-            
-            return produto
-            
-        except Exception as e:
-            conexao.rollback()
-            raise e
-        finally:
-            conexao.close()
+        # Salva pelo DAO: o estoque inicial entra no histórico de estoque
+        # e as telas abertas são avisadas (ProdutosAlterados)
+        return produtos_dao.inserir_produto(produto)
     
     @staticmethod
     def atualizar_produto(produto):
@@ -106,45 +78,8 @@ class ProdutoController:
         if not produto.id:
             raise ValueError("O ID do produto é obrigatório para atualização")
         
-        conexao = conectar()
-        cursor = conexao.cursor()
-        
-        try:
-            cursor.execute("""
-                UPDATE produtos SET
-                    codigo_barras = ?,
-                    nome = ?,
-                    categoria = ?,
-                    tamanho = ?,
-                    cor = ?,
-                    preco_custo = ?,
-                    preco_venda = ?,
-                    estoque = ?,
-                    ativo = ?
-                WHERE id = ?
-            """, (
-                produto.codigo_barras,
-                produto.nome,
-                produto.categoria,
-                produto.tamanho,
-                produto.cor,
-                produto.preco_custo,
-                produto.preco_venda,
-                produto.estoque,
-                produto.ativo,
-                produto.id
-            ))
-            
-            if cursor.rowcount == 0:
-                raise ValueError(f"Produto com ID {produto.id} não encontrado")
-            
-            conexao.commit()
-            
-        except Exception as e:
-            conexao.rollback()
-            raise e
-        finally:
-            conexao.close()
+        # A diferença de estoque entra no histórico como AJUSTE
+        produtos_dao.atualizar_produto(produto)
     
     @staticmethod
     def buscar_por_id(produto_id):
@@ -289,16 +224,7 @@ class ProdutoController:
         Args:
             produto_id (int): ID do produto a desativar
         """
-        conexao = conectar()
-        cursor = conexao.cursor()
-        
-        cursor.execute(
-            "UPDATE produtos SET ativo = 0 WHERE id = ?",
-            (produto_id,)
-        )
-        
-        conexao.commit()
-        conexao.close()
+        produtos_dao.desativar_produto(produto_id)
     
     @staticmethod
     def reativar_produto(produto_id):
@@ -308,16 +234,7 @@ class ProdutoController:
         Args:
             produto_id (int): ID do produto a reativar
         """
-        conexao = conectar()
-        cursor = conexao.cursor()
-        
-        cursor.execute(
-            "UPDATE produtos SET ativo = 1 WHERE id = ?",
-            (produto_id,)
-        )
-        
-        conexao.commit()
-        conexao.close()
+        produtos_dao.reativar_produto(produto_id)
     
     @staticmethod
     def _linha_para_produto(linha):
@@ -0,0 +1,138 @@
+"""
+Cache em memória de produtos por código de barras.
+
+Usado na tela de vendas: cada leitura do leitor de código de barras
+é resolvida em um dicionário, sem abrir conexão nem consultar o banco.
+
+O cache só fica ativo depois de carregado (aquecer_cache_codigo_barras
+em produtos_dao) e até ser descartado (ao fechar a tela de vendas).
+Cada carregar() conta um usuário e cada descartar() tira um: com duas
+telas de vendas abertas, fechar uma não desliga o cache da outra.
+O cache assina os eventos publicados pelos DAOs (utils/eventos.py):
+produtos alterados saem do cache (a próxima leitura daquele código
+volta a consultar o banco); mudanças de estoque, que já trazem o
+estoque novo, atualizam os produtos sem tirá-los do cache.
+
+O estoque guardado aqui pode ficar defasado (ex.: venda em outro
+caixa); registrar_venda confere o estoque no banco antes de gravar.
+"""
+
+import copy
+import threading
+
+from utils.eventos import assinar, ProdutosAlterados, EstoqueAlterado
+
+
+_lock = threading.Lock()
+_ativo = False
+_usuarios = 0            # carregar() sem o descartar() correspondente
+_produtos_por_codigo = {}
+_codigo_por_id = {}
+
+
+def cache_ativo():
+    """Retorna True se o cache está carregado."""
+    return _ativo
+
+
+def carregar(produtos):
+    """
+    Substitui o conteúdo do cache, o ativa e conta mais um usuário.
+
+    Args:
+        produtos: Produtos ativos (os sem código de barras são ignorados)
+    """
+    global _ativo, _usuarios
+
+    with _lock:
+        _usuarios += 1
+        _produtos_por_codigo.clear()
+        _codigo_por_id.clear()
+        for produto in produtos:
+            if produto.codigo_barras and produto.ativo == 1:
+                _produtos_por_codigo[produto.codigo_barras] = produto
+                _codigo_por_id[produto.id] = produto.codigo_barras
+        _ativo = True
+
+
+def obter(codigo_barras):
+    """
+    Busca um produto no cache.
+
+    Returns:
+        Produto | None: Uma cópia do produto, ou None se não estiver no cache
+    """
+    produto = _produtos_por_codigo.get(codigo_barras)
+    # Cópia: quem recebe pode alterar o objeto sem estragar o cache
+    return copy.copy(produto) if produto else None
+
+
+def guardar(produto):
+    """Guarda um produto lido do banco (apenas com o cache ativo)."""
+    with _lock:
+        if _ativo and produto.codigo_barras and produto.ativo == 1:
+            _produtos_por_codigo[produto.codigo_barras] = produto
+            _codigo_por_id[produto.id] = produto.codigo_barras
+
+
+def invalidar_produtos(produto_ids):
+    """
+    Remove produtos do cache depois de uma alteração no banco.
+
+    Args:
+        produto_ids: IDs dos produtos alterados
+    """
+    if not _ativo:
+        return
+
+    with _lock:
+        for produto_id in produto_ids:
+            codigo = _codigo_por_id.pop(produto_id, None)
+            if codigo is not None:
+                _produtos_por_codigo.pop(codigo, None)
+
+
+def atualizar_estoques(estoques):
+    """
+    Troca o estoque de produtos do cache, sem removê-los.
+
+    Args:
+        estoques: dict {produto_id: estoque atual}
+    """
+    if not _ativo:
+        return
+
+    with _lock:
+        for produto_id, estoque in estoques.items():
+            codigo = _codigo_por_id.get(produto_id)
+            if codigo is None:
+                continue
+
+            # Objeto novo: uma leitura em andamento (obter) não vê meio-termo
+            produto = copy.copy(_produtos_por_codigo[codigo])
+            produto.estoque = estoque
+            _produtos_por_codigo[codigo] = produto
+
+
+def descartar():
+    """Tira um usuário; o último a sair esvazia e desativa o cache."""
+    global _ativo, _usuarios
+
+    with _lock:
+        # Nunca abaixo de zero: o carregamento pode ter falhado
+        _usuarios = max(_usuarios - 1, 0)
+        if _usuarios:
+            return
+
+        _ativo = False
+        _produtos_por_codigo.clear()
+        _codigo_por_id.clear()
+
+
+# =========================
+# Avisos dos DAOs
+# =========================
+# Chamados na thread que gravou, logo depois do commit
+
+assinar(ProdutosAlterados, lambda evento: invalidar_produtos(evento.produto_ids))
+assinar(EstoqueAlterado, lambda evento: atualizar_estoques(evento.estoques))
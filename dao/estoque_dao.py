@@ -1,11 +1,15 @@
 from database.conexao import conectar
-from dao.produtos_dao import buscar_produto_por_id
+from models.nota_entrada import NotaEntrada, ItemNotaEntrada
+from utils.eventos import publicar, MovimentacaoRegistrada
 from datetime import datetime
 
 
 def registrar_entrada(produto_id, quantidade, observacao=None):
     """
     Registra uma entrada de estoque para um produto.
+
+    Raises:
+        ValueError: Se a quantidade for inválida ou o produto não existir
     """
     if quantidade <=0:
         raise ValueError("A quantidade deve ser maior que zero.")
@@ -13,68 +17,90 @@ def registrar_entrada(produto_id, quantidade, observacao=None):
     conexao = conectar()
     cursor = conexao.cursor()
 
-    data_atual = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
 
-    # Registra movimentação
-    cursor.execute("""
-        INSERT INTO movimentacoes_estoque (
-            produto_id,
-            tipo,
-            quantidade,
-            data,
-            observacao
-        ) VALUES (?, 'ENTRADA', ?, ?, ?)
-    """, (produto_id, quantidade, data_atual, observacao))
+        # Atualiza estoque do produto
+        cursor.execute("""
+            UPDATE produtos
+            SET estoque = estoque + ?
+            WHERE id = ?
+        """, (quantidade, produto_id))
 
-    # Atualiza estoque do produto
-    cursor.execute("""
-        UPDATE produtos
-        SET estoque = estoque + ?
-        WHERE id = ?
-    """, (quantidade, produto_id))
+        if cursor.rowcount == 0:
+            raise ValueError("Produto não encontrado.")
 
-    conexao.commit()
-    conexao.close()
+        # Registra movimentação
+        lancar_movimentacoes(cursor, {produto_id: quantidade}, "MANUAL", observacao=observacao)
+
+        # Estoque resultante, lido na mesma transação, para o aviso às telas
+        cursor.execute("SELECT estoque FROM produtos WHERE id = ?", (produto_id,))
+        estoque = cursor.fetchone()[0]
+
+        conexao.commit()
+
+    except Exception as e:
+        conexao.rollback()
+        raise e
+
+    finally:
+        conexao.close()
+
+    publicar(MovimentacaoRegistrada({produto_id: estoque}, "ENTRADA"))
 
 def registrar_saida(produto_id, quantidade, observacao=None):
     """
     Registra uma saída de estoque para um produto.
+
+    A conferência e a baixa são um único UPDATE condicional
+    (estoque >= quantidade) dentro de uma transação BEGIN IMMEDIATE:
+    dois caixas retirando o mesmo produto ao mesmo tempo nunca deixam
+    o estoque negativo.
+
+    Raises:
+        ValueError: Se a quantidade for inválida, o produto não existir
+                    ou o estoque for insuficiente
     """
     if quantidade <= 0:
         raise ValueError("A quantidade deve ser maior que zero.")
 
-    produto = buscar_produto_por_id(produto_id)
-    if not produto:
-        raise ValueError("Produto não encontrado.")
-
-    if produto.estoque < quantidade:
-        raise ValueError("Estoque insuficiente.")
-
     conexao = conectar()
     cursor = conexao.cursor()
 
-    data_atual = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
 
-    # Registra movimentação
-    cursor.execute("""
-        INSERT INTO movimentacoes_estoque (
-            produto_id,
-            tipo,
-            quantidade,
-            data,
-            observacao
-        ) VALUES (?, 'SAIDA', ?, ?, ?)
-    """, (produto_id, quantidade, data_atual, observacao))
+        # Baixa só se houver estoque suficiente
+        cursor.execute("""
+            UPDATE produtos
+            SET estoque = estoque - ?
+            WHERE id = ? AND estoque >= ?
+        """, (quantidade, produto_id, quantidade))
 
-    # Atualiza estoque do produto
-    cursor.execute("""
-        UPDATE produtos
-        SET estoque = estoque - ?
-        WHERE id = ?
-    """, (quantidade, produto_id))
+        if cursor.rowcount == 0:
+            # Nada foi alterado: descobre o motivo para a mensagem
+            cursor.execute("SELECT estoque FROM produtos WHERE id = ?", (produto_id,))
+            if not cursor.fetchone():
+                raise ValueError("Produto não encontrado.")
+            raise ValueError("Estoque insuficiente.")
 
-    conexao.commit()
-    conexao.close()
+        # Registra movimentação
+        lancar_movimentacoes(cursor, {produto_id: -quantidade}, "MANUAL", observacao=observacao)
+
+        # Estoque resultante, lido na mesma transação, para o aviso às telas
+        cursor.execute("SELECT estoque FROM produtos WHERE id = ?", (produto_id,))
+        estoque = cursor.fetchone()[0]
+
+        conexao.commit()
+
+    except Exception as e:
+        conexao.rollback()
+        raise e
+
+    finally:
+        conexao.close()
+
+    publicar(MovimentacaoRegistrada({produto_id: estoque}, "SAIDA"))
 
 def listar_movimentacoes(produto_id=None):
     """
@@ -106,3 +132,358 @@ def listar_movimentacoes(produto_id=None):
     conexao.close()
 
     return movimentacoes
+
+def listar_movimentacoes_pagina(produto_id=None, cursor=None, tamanho_pagina=100, direcao="proxima"):
+    """
+    Lista um bloco de movimentações, da mais recente para a mais antiga,
+    com paginação por cursor (keyset) em (data, id).
+
+    O custo de cada bloco não depende da posição dele no histórico:
+    a busca começa direto no índice idx_mov_estoque_data (ou em
+    idx_mov_estoque_produto_data, com produto_id).
+
+    Args:
+        produto_id: Se informado, filtra pelo produto
+        cursor: cursor_inicio ou cursor_fim de um bloco já lido (None = ponta da lista)
+        tamanho_pagina: Quantidade de movimentações do bloco
+        direcao: "proxima" (mais antigas que o cursor) ou "anterior" (mais recentes)
+
+    Returns:
+        dict: movimentacoes (lista de Row), cursor_inicio, cursor_fim e tem_mais
+    """
+    if direcao not in ("proxima", "anterior"):
+        raise ValueError("A direção deve ser 'proxima' ou 'anterior'.")
+
+    # A lista é exibida da mais recente para a mais antiga; indo para
+    # trás, a consulta percorre o índice no sentido inverso.
+    recentes_primeiro = direcao == "proxima"
+    direcao_sql = "DESC" if recentes_primeiro else "ASC"
+
+    condicoes = []
+    parametros = []
+
+    if produto_id:
+        condicoes.append("m.produto_id = ?")
+        parametros.append(produto_id)
+
+    if cursor is not None:
+        data, movimentacao_id = cursor
+        comparacao = "<" if recentes_primeiro else ">"
+        # O primeiro termo permite a busca no índice; o segundo desempata pelo id
+        condicoes.append(f"m.data {comparacao}= ?")
+        condicoes.append(f"(m.data, m.id) {comparacao} (?, ?)")
+        parametros += [data, data, movimentacao_id]
+
+    where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+
+    conexao = conectar()
+    cursor_sql = conexao.cursor()
+
+    # Uma linha a mais para saber se existe outro bloco
+    cursor_sql.execute(f"""
+        SELECT m.id, m.tipo, m.quantidade, m.data, m.observacao,
+               p.nome, p.tamanho, p.cor
+        FROM movimentacoes_estoque m
+        JOIN produtos p ON p.id = m.produto_id
+        {where}
+        ORDER BY m.data {direcao_sql}, m.id {direcao_sql}
+        LIMIT ?
+    """, parametros + [tamanho_pagina + 1])
+
+    linhas = cursor_sql.fetchall()
+    conexao.close()
+
+    tem_mais = len(linhas) > tamanho_pagina
+    linhas = linhas[:tamanho_pagina]
+
+    if not recentes_primeiro:
+        linhas.reverse()
+
+    return {
+        "movimentacoes": linhas,
+        "cursor_inicio": (linhas[0]["data"], linhas[0]["id"]) if linhas else None,
+        "cursor_fim": (linhas[-1]["data"], linhas[-1]["id"]) if linhas else None,
+        "tem_mais": tem_mais
+    }
+
+def contar_movimentacoes(produto_id=None):
+    """
+    Conta as movimentações de estoque (de um produto, se informado).
+    """
+    conexao = conectar()
+    cursor = conexao.cursor()
+
+    if produto_id:
+        cursor.execute(
+            "SELECT COUNT(*) FROM movimentacoes_estoque WHERE produto_id = ?",
+            (produto_id,)
+        )
+    else:
+        cursor.execute("SELECT COUNT(*) FROM movimentacoes_estoque")
+
+    total = cursor.fetchone()[0]
+    conexao.close()
+
+    return total
+
+def registrar_nota_entrada(nota):
+    """
+    Registra uma nota de entrada: o cabeçalho, uma movimentação de
+    ENTRADA por produto e o aumento do estoque, tudo em uma transação.
+
+    Se qualquer linha falhar (ex.: produto inexistente), nada é gravado.
+    Produtos repetidos na nota são somados em uma única linha.
+
+    Args:
+        nota: NotaEntrada com pelo menos um item
+
+    Returns:
+        tuple: (nota_id, estoques), onde estoques é um dict
+               {produto_id: estoque depois da entrada}
+
+    Raises:
+        ValueError: Se a nota estiver vazia, tiver quantidade inválida
+                    ou produto inexistente
+    """
+    if not nota.itens:
+        raise ValueError("A nota deve ter pelo menos um item.")
+
+    # Quantidade total por produto, na ordem em que foram lidos
+    quantidades = {}
+    for item in nota.itens:
+        if item.quantidade <= 0:
+            raise ValueError("A quantidade deve ser maior que zero.")
+        quantidades[item.produto_id] = quantidades.get(item.produto_id, 0) + item.quantidade
+
+    conexao = conectar()
+    cursor = conexao.cursor()
+
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+
+        if not nota.data:
+            nota.data = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        # 1. CABEÇALHO
+        cursor.execute("""
+            INSERT INTO notas_entrada (
+                data,
+                numero,
+                fornecedor,
+                observacao,
+                usuario_id,
+                total_itens,
+                total_unidades
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (
+            nota.data,
+            nota.numero,
+            nota.fornecedor,
+            nota.observacao,
+            nota.usuario_id,
+            len(quantidades),
+            sum(quantidades.values())
+        ))
+
+        nota_id = cursor.lastrowid
+
+        # 2. AUMENTA O ESTOQUE (todos de uma vez)
+        cursor.executemany("""
+            UPDATE produtos
+            SET estoque = estoque + ?
+            WHERE id = ?
+        """, [
+            (quantidade, produto_id)
+            for produto_id, quantidade in quantidades.items()
+        ])
+
+        if cursor.rowcount != len(quantidades):
+            raise ValueError("Um ou mais produtos da nota não foram encontrados.")
+
+        # 3. UMA MOVIMENTAÇÃO POR PRODUTO, LIGADA À NOTA
+        observacao = f"Nota de entrada #{nota_id}"
+        if nota.numero:
+            observacao += f" - NF {nota.numero}"
+        if nota.fornecedor:
+            observacao += f" - {nota.fornecedor}"
+
+        cursor.executemany("""
+            INSERT INTO movimentacoes_estoque (
+                produto_id,
+                tipo,
+                quantidade,
+                data,
+                observacao,
+                usuario_id,
+                nota_entrada_id,
+                origem_tipo,
+                origem_id
+            ) VALUES (?, 'ENTRADA', ?, ?, ?, ?, ?, 'NOTA_ENTRADA', ?)
+        """, [
+            (produto_id, quantidade, nota.data, observacao, nota.usuario_id, nota_id, nota_id)
+            for produto_id, quantidade in quantidades.items()
+        ])
+
+        # Estoque resultante, para o aviso às telas
+        marcadores = ", ".join("?" for _ in quantidades)
+        cursor.execute(
+            f"SELECT id, estoque FROM produtos WHERE id IN ({marcadores})",
+            list(quantidades)
+        )
+        estoques = {linha["id"]: linha["estoque"] for linha in cursor.fetchall()}
+
+        conexao.commit()
+
+    except Exception as e:
+        conexao.rollback()
+        raise e
+
+    finally:
+        conexao.close()
+
+    nota.id = nota_id
+    publicar(MovimentacaoRegistrada(estoques, "ENTRADA"))
+
+    return nota_id, estoques
+
+def buscar_nota_entrada(nota_id):
+    """
+    Busca uma nota de entrada com os seus itens.
+
+    Returns:
+        NotaEntrada | None: A nota, ou None se não existir
+    """
+    conexao = conectar()
+    cursor = conexao.cursor()
+
+    cursor.execute("SELECT * FROM notas_entrada WHERE id = ?", (nota_id,))
+    linha = cursor.fetchone()
+
+    if not linha:
+        conexao.close()
+        return None
+
+    cursor.execute("""
+        SELECT m.produto_id, m.quantidade, p.nome
+        FROM movimentacoes_estoque m
+        JOIN produtos p ON p.id = m.produto_id
+        WHERE m.nota_entrada_id = ?
+        ORDER BY m.id
+    """, (nota_id,))
+    itens = [
+        ItemNotaEntrada(
+            produto_id=item["produto_id"],
+            quantidade=item["quantidade"],
+            produto_nome=item["nome"]
+        )
+        for item in cursor.fetchall()
+    ]
+    conexao.close()
+
+    return NotaEntrada(
+        id=linha["id"],
+        data=linha["data"],
+        numero=linha["numero"],
+        fornecedor=linha["fornecedor"],
+        observacao=linha["observacao"],
+        usuario_id=linha["usuario_id"],
+        itens=itens
+    )
+
+
+# =========================
+# Histórico de estoque
+# =========================
+
+def lancar_movimentacoes(
+    cursor,
+    variacoes,
+    origem_tipo,
+    origem_id=None,
+    data=None,
+    observacao=None,
+    usuario_id=None
+):
+    """
+    Grava no histórico as alterações de estoque de uma operação.
+
+    Chamar com o cursor da transação que altera produtos.estoque, antes
+    do commit: a alteração e a movimentação entram juntas ou nenhuma
+    entra. Usada por todas as operações que alteram o estoque.
+
+    Args:
+        cursor: Cursor da transação em andamento
+        variacoes: dict {produto_id: variação do estoque} (negativa = saída);
+                   variações zero são ignoradas
+        origem_tipo: Origem da alteração (ex.: "VENDA", "CANCELAMENTO_VENDA")
+        origem_id: ID do registro de origem (ex.: vendas.id)
+        data: Data "YYYY-MM-DD HH:MM:SS" (None = agora)
+        observacao: Texto exibido no histórico
+        usuario_id: Usuário responsável (opcional)
+
+    Exemplo:
+        lancar_movimentacoes(cursor, {3: -2, 7: -1}, "VENDA", venda_id, venda.data)
+    """
+    data = data or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    cursor.executemany("""
+        INSERT INTO movimentacoes_estoque (
+            produto_id,
+            tipo,
+            quantidade,
+            data,
+            observacao,
+            usuario_id,
+            origem_tipo,
+            origem_id
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, [
+        (
+            produto_id,
+            "ENTRADA" if variacao > 0 else "SAIDA",
+            abs(variacao),
+            data,
+            observacao,
+            usuario_id,
+            origem_tipo,
+            origem_id
+        )
+        for produto_id, variacao in variacoes.items()
+        if variacao
+    ])
+
+def obter_estoque_na_data(produto_id, data):
+    """
+    Calcula o estoque de um produto ao fim de um dia, pelo histórico.
+
+    Soma as movimentações do produto até a data: uma faixa do índice
+    idx_mov_estoque_produto_data, sem ler vendas nem notas.
+
+    Args:
+        produto_id: ID do produto
+        data: Dia "YYYY-MM-DD" (inclusive) ou data e hora "YYYY-MM-DD HH:MM:SS"
+
+    Returns:
+        int: Estoque do produto naquele momento (0 antes da primeira movimentação)
+
+    Exemplo:
+        obter_estoque_na_data(3, "2025-12-31")
+    """
+    # Só o dia: inclui o dia inteiro
+    limite = f"{data} 23:59:59" if len(data) == 10 else data
+
+    conexao = conectar()
+    cursor = conexao.cursor()
+
+    cursor.execute("""
+        SELECT COALESCE(SUM(
+            CASE tipo WHEN 'ENTRADA' THEN quantidade ELSE -quantidade END
+        ), 0)
+        FROM movimentacoes_estoque
+        WHERE produto_id = ? AND data <= ?
+    """, (produto_id, limite))
+
+    estoque = cursor.fetchone()[0]
+    conexao.close()
+
+    return estoque
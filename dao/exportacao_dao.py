@@ -0,0 +1,255 @@
+"""
+Exportação de dados para CSV ou JSONL (ex.: para a contabilidade).
+
+As linhas saem de um cursor em blocos de tamanho fixo (fetchmany) e
+são escritas no arquivo à medida que chegam: exportar anos de vendas
+usa a mesma memória que exportar um dia. As consultas seguem a ordem
+dos índices (data, id), sem ordenação em memória antes da primeira
+linha.
+
+O arquivo é escrito com um nome temporário e só recebe o nome final
+no fim: uma exportação interrompida não deixa um arquivo pela metade.
+
+Exemplo:
+    linhas = exportar_dados(
+        "vendas",
+        "vendas_2025.csv.gz",
+        data_inicial="2025-01-01",
+        data_final="2025-12-31"
+    )
+"""
+
+import csv
+import gzip
+import json
+import os
+from datetime import date, timedelta
+
+from database.conexao import conectar
+
+
+# Linhas lidas do cursor por vez
+TAMANHO_BLOCO = 1000
+
+FORMATOS = ("csv", "jsonl")
+
+# Consultas de cada exportação. {filtro} recebe o período (se houver);
+# produtos e clientes são cadastros e saem sempre completos.
+CONSULTAS_EXPORTACAO = {
+    "produtos": {
+        "sql": """
+            SELECT
+                id, codigo_barras, nome, categoria, tamanho, cor,
+                preco_custo, preco_venda, estoque, ativo
+            FROM produtos
+            ORDER BY id
+        """,
+        "coluna_data": None,
+    },
+    "clientes": {
+        "sql": """
+            SELECT
+                id, nome, cpf_cnpj, telefone, email, endereco,
+                cidade, estado, cep, observacoes, data_cadastro, ativo
+            FROM clientes
+            ORDER BY id
+        """,
+        "coluna_data": None,
+    },
+    # Uma linha por item vendido, com os dados da venda repetidos
+    "vendas": {
+        "sql": """
+            SELECT
+                v.id AS venda_id,
+                v.data,
+                v.forma_pagamento,
+                v.desconto,
+                v.total AS total_venda,
+                v.cancelada,
+                v.cliente_id,
+                c.nome AS cliente_nome,
+                v.usuario_id,
+                i.id AS item_id,
+                i.produto_id,
+                p.codigo_barras,
+                p.nome AS produto_nome,
+                i.quantidade,
+                i.preco_unitario,
+                i.subtotal
+            FROM vendas v
+            JOIN itens_venda i ON i.venda_id = v.id
+            LEFT JOIN produtos p ON p.id = i.produto_id
+            LEFT JOIN clientes c ON c.id = v.cliente_id
+            WHERE 1=1 {filtro}
+            ORDER BY v.data, v.id, i.id
+        """,
+        "coluna_data": "v.data",
+    },
+    "movimentacoes": {
+        "sql": """
+            SELECT
+                m.id,
+                m.data,
+                m.tipo,
+                m.quantidade,
+                m.produto_id,
+                p.codigo_barras,
+                p.nome AS produto_nome,
+                m.observacao,
+                m.usuario_id,
+                m.origem_tipo,
+                m.origem_id
+            FROM movimentacoes_estoque m
+            LEFT JOIN produtos p ON p.id = m.produto_id
+            WHERE 1=1 {filtro}
+            ORDER BY m.data, m.id
+        """,
+        "coluna_data": "m.data",
+    },
+}
+
+
+def iterar_exportacao(tabela, data_inicial=None, data_final=None, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Lê as linhas de uma exportação, um bloco por vez.
+
+    Args:
+        tabela: "produtos", "clientes", "vendas" ou "movimentacoes"
+        data_inicial: Data inicial "YYYY-MM-DD" (vendas e movimentações)
+        data_final: Data final "YYYY-MM-DD", inclusive
+        tamanho_bloco: Linhas por fetchmany
+
+    Yields:
+        Primeiro a tupla com os nomes das colunas; depois listas de
+        até tamanho_bloco linhas (tuplas)
+
+    Raises:
+        ValueError: Se a tabela não existir na exportação
+    """
+    if tabela not in CONSULTAS_EXPORTACAO:
+        raise ValueError(
+            f"Exportação desconhecida: '{tabela}'. "
+            f"Use {', '.join(CONSULTAS_EXPORTACAO)}."
+        )
+
+    consulta = CONSULTAS_EXPORTACAO[tabela]
+    sql = consulta["sql"]
+    parametros = []
+
+    if consulta["coluna_data"]:
+        filtro = ""
+        # Compara a própria coluna data (sem date()), para usar o índice
+        if data_inicial:
+            filtro += f" AND {consulta['coluna_data']} >= ?"
+            parametros.append(data_inicial)
+        if data_final:
+            filtro += f" AND {consulta['coluna_data']} < ?"
+            parametros.append(_dia_seguinte(data_final))
+        sql = sql.format(filtro=filtro)
+
+    conexao = conectar()
+    try:
+        cursor = conexao.cursor()
+        cursor.row_factory = None  # Tuplas simples: mais rápidas que sqlite3.Row
+        cursor.execute(sql, parametros)
+
+        yield tuple(coluna[0] for coluna in cursor.description)
+
+        while True:
+            bloco = cursor.fetchmany(tamanho_bloco)
+            if not bloco:
+                break
+            yield bloco
+    finally:
+        conexao.close()
+
+
+def exportar_dados(
+    tabela,
+    destino,
+    formato=None,
+    data_inicial=None,
+    data_final=None,
+    compactar=None,
+    tamanho_bloco=TAMANHO_BLOCO,
+    ao_progresso=None
+):
+    """
+    Exporta uma tabela para um arquivo CSV ou JSONL.
+
+    Args:
+        tabela: "produtos", "clientes", "vendas" ou "movimentacoes"
+        destino: Arquivo de saída (ex.: "vendas.csv" ou "vendas.jsonl.gz")
+        formato: "csv" ou "jsonl" (None = pela extensão do destino)
+        data_inicial: Data inicial "YYYY-MM-DD" (vendas e movimentações)
+        data_final: Data final "YYYY-MM-DD", inclusive
+        compactar: Gravar com gzip (None = se o destino terminar em .gz)
+        tamanho_bloco: Linhas lidas do banco por vez
+        ao_progresso: Função opcional chamada a cada bloco como ao_progresso(linhas)
+
+    Returns:
+        int: Quantidade de linhas exportadas (sem o cabeçalho)
+
+    Raises:
+        ValueError: Se a tabela ou o formato forem inválidos
+    """
+    if compactar is None:
+        compactar = destino.endswith(".gz")
+
+    if formato is None:
+        nome = destino[:-3] if destino.endswith(".gz") else destino
+        formato = os.path.splitext(nome)[1].lstrip(".").lower() or "csv"
+
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato inválido: '{formato}'. Use csv ou jsonl.")
+
+    blocos = iterar_exportacao(tabela, data_inicial, data_final, tamanho_bloco)
+    colunas = next(blocos)
+
+    temporario = destino + ".parcial"
+    quantidade = 0
+    try:
+        if compactar:
+            arquivo = gzip.open(temporario, "wt", encoding="utf-8", newline="")
+        else:
+            arquivo = open(temporario, "w", encoding="utf-8", newline="")
+
+        with arquivo:
+            if formato == "csv":
+                escritor = csv.writer(arquivo, delimiter=";")
+                escritor.writerow(colunas)
+                escrever = escritor.writerows
+            else:
+                def escrever(bloco):
+                    arquivo.writelines(
+                        json.dumps(dict(zip(colunas, linha)), ensure_ascii=False) + "\n"
+                        for linha in bloco
+                    )
+
+            for bloco in blocos:
+                escrever(bloco)
+                quantidade += len(bloco)
+                if ao_progresso:
+                    ao_progresso(quantidade)
+
+        os.replace(temporario, destino)
+
+    except BaseException:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+
+    finally:
+        # Devolve a conexão ao pool mesmo se a escrita parar no meio
+        blocos.close()
+
+    return quantidade
+
+
+# =========================
+# Funções auxiliares internas
+# =========================
+
+def _dia_seguinte(data):
+    """'YYYY-MM-DD' do dia seguinte (limite exclusivo do período)."""
+    return (date.fromisoformat(data) + timedelta(days=1)).strftime("%Y-%m-%d")
@@ -0,0 +1,386 @@
+"""
+Importação em massa de produtos a partir de um CSV (catálogo de fornecedor).
+
+O arquivo é lido como fluxo, linha por linha, sem carregar o catálogo
+inteiro na memória. As linhas válidas são gravadas em lotes com
+executemany e um commit por lote; produtos com um código de barras já
+cadastrado são atualizados (upsert), os demais são inseridos.
+
+Linhas rejeitadas (sem código, sem nome, preço inválido...) não param
+a importação: vão para um arquivo de erros, com o número da linha e o
+motivo, para serem corrigidas e importadas de novo.
+
+Exemplo:
+    resultado = importar_produtos_csv(
+        "catalogo.csv",
+        mapeamento={"codigo_barras": "EAN", "nome": "Descrição", "preco_venda": "Preço"},
+        ao_progresso=lambda lidas, importadas, rejeitadas: print(lidas)
+    )
+    print(f"{resultado['linhas_por_segundo']:.0f} linhas/s")
+"""
+
+import csv
+import math
+import time
+
+from database.conexao import conectar
+from dao.estoque_dao import lancar_movimentacoes
+from utils.eventos import publicar, ProdutosAlterados
+from utils.validadores import normalizar_numero
+
+
+# Linhas gravadas por executemany/commit
+TAMANHO_LOTE = 500
+
+# Campos do produto que podem vir do CSV. Mapeamento padrão: a coluna
+# do CSV tem o mesmo nome do campo.
+CAMPOS_IMPORTACAO = (
+    "codigo_barras",
+    "nome",
+    "categoria",
+    "tamanho",
+    "cor",
+    "preco_custo",
+    "preco_venda",
+    "estoque",
+)
+
+CAMPOS_OBRIGATORIOS = ("codigo_barras", "nome", "preco_venda")
+
+# O estoque só é usado em produtos novos: o de produtos já cadastrados
+# muda pela movimentação de estoque, não pelo catálogo do fornecedor.
+# O estoque dos novos entra no histórico de estoque (origem IMPORTACAO).
+SQL_UPSERT = """
+    INSERT INTO produtos (
+        codigo_barras,
+        nome,
+        categoria,
+        tamanho,
+        cor,
+        preco_custo,
+        preco_venda,
+        estoque,
+        ativo
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1)
+    ON CONFLICT (codigo_barras) DO UPDATE SET
+        nome = excluded.nome,
+        categoria = excluded.categoria,
+        tamanho = excluded.tamanho,
+        cor = excluded.cor,
+        preco_custo = excluded.preco_custo,
+        preco_venda = excluded.preco_venda
+"""
+
+
+def importar_produtos_csv(
+    caminho,
+    mapeamento=None,
+    delimitador=None,
+    codificacao="utf-8-sig",
+    tamanho_lote=TAMANHO_LOTE,
+    arquivo_erros=None,
+    ao_progresso=None
+):
+    """
+    Importa (insere ou atualiza) produtos de um arquivo CSV.
+
+    Args:
+        caminho: Arquivo CSV com cabeçalho na primeira linha
+        mapeamento: dict {campo do produto: coluna do CSV}; campos não
+                    informados usam a coluna de mesmo nome, se existir
+        delimitador: Separador das colunas (None = detecta entre ; , e tab)
+        codificacao: Codificação do arquivo (utf-8-sig aceita o BOM do Excel)
+        tamanho_lote: Linhas gravadas por commit
+        arquivo_erros: CSV com as linhas rejeitadas
+                       (padrão: <caminho>.erros.csv, criado só se houver erro)
+        ao_progresso: Função opcional chamada a cada lote como
+                      ao_progresso(lidas, importadas, rejeitadas)
+
+    Returns:
+        dict: lidas, importadas, inseridas, atualizadas, rejeitadas,
+              segundos, linhas_por_segundo e arquivo_erros (ou None)
+
+    Raises:
+        ValueError: Se faltar no CSV uma coluna obrigatória
+    """
+    if tamanho_lote < 1:
+        raise ValueError("O tamanho do lote deve ser maior que zero.")
+
+    arquivo_erros = arquivo_erros or f"{caminho}.erros.csv"
+    inicio = time.perf_counter()
+
+    lidas = importadas = rejeitadas = 0
+    erros = _ArquivoErros(arquivo_erros, codificacao)
+
+    conexao = conectar()
+    cursor = conexao.cursor()
+
+    try:
+        total_antes = cursor.execute("SELECT COUNT(*) FROM produtos").fetchone()[0]
+
+        with open(caminho, newline="", encoding=codificacao) as arquivo:
+            leitor = csv.reader(arquivo, delimiter=delimitador or _detectar_delimitador(arquivo))
+            cabecalho = next(leitor, None)
+            if not cabecalho:
+                raise ValueError("O arquivo está vazio.")
+
+            colunas = _resolver_colunas(cabecalho, mapeamento or {})
+            erros.cabecalho = cabecalho
+
+            lote = []
+            for numero_linha, linha in enumerate(leitor, start=2):
+                if not any(valor.strip() for valor in linha):
+                    continue  # Linha em branco
+
+                lidas += 1
+                try:
+                    lote.append((numero_linha, linha, _converter_linha(linha, colunas)))
+                except ValueError as e:
+                    erros.registrar(numero_linha, linha, str(e))
+                    rejeitadas += 1
+
+                if len(lote) >= tamanho_lote:
+                    gravadas, falhas = _gravar_lote(conexao, lote, erros)
+                    importadas += gravadas
+                    rejeitadas += falhas
+                    lote = []
+                    if ao_progresso:
+                        ao_progresso(lidas, importadas, rejeitadas)
+
+            if lote:
+                gravadas, falhas = _gravar_lote(conexao, lote, erros)
+                importadas += gravadas
+                rejeitadas += falhas
+
+        total_depois = cursor.execute("SELECT COUNT(*) FROM produtos").fetchone()[0]
+
+    finally:
+        conexao.close()
+        erros.fechar()
+
+    if ao_progresso:
+        ao_progresso(lidas, importadas, rejeitadas)
+
+    segundos = time.perf_counter() - inicio
+    inseridas = total_depois - total_antes
+
+    return {
+        "lidas": lidas,
+        "importadas": importadas,
+        "inseridas": inseridas,
+        "atualizadas": importadas - inseridas,
+        "rejeitadas": rejeitadas,
+        "segundos": segundos,
+        "linhas_por_segundo": lidas / segundos if segundos > 0 else 0.0,
+        "arquivo_erros": arquivo_erros if erros.usado else None,
+    }
+
+
+# =========================
+# Funções auxiliares internas
+# =========================
+
+def _gravar_lote(conexao, lote, erros):
+    """
+    Grava um lote em uma transação.
+
+    Se o lote falhar (ex.: um código de barras repetido que o banco
+    recusou), ele é desfeito e as linhas são gravadas uma a uma, para
+    que só as linhas com problema fiquem de fora.
+
+    Returns:
+        tuple: (linhas gravadas, linhas rejeitadas)
+    """
+    cursor = conexao.cursor()
+    valores = [produto for _, _, produto in lote]
+    existentes = _codigos_existentes(cursor, [produto[0] for produto in valores])
+
+    try:
+        cursor.executemany(SQL_UPSERT, valores)
+        ids = _ids_por_codigo(cursor, [produto[0] for produto in valores])
+        _lancar_estoque_novos(cursor, valores, existentes)
+        conexao.commit()
+        publicar(ProdutosAlterados(ids))
+        return len(lote), 0
+
+    except Exception:
+        conexao.rollback()
+
+    falhas = 0
+    gravados = []
+    for numero_linha, linha, produto in lote:
+        try:
+            cursor.execute(SQL_UPSERT, produto)
+            gravados.append(produto)
+        except Exception as e:
+            erros.registrar(numero_linha, linha, str(e))
+            falhas += 1
+
+    gravadas = len(gravados)
+    ids = _ids_por_codigo(cursor, [produto[0] for produto in gravados])
+    _lancar_estoque_novos(cursor, gravados, existentes)
+    conexao.commit()
+    publicar(ProdutosAlterados(ids))
+    return gravadas, falhas
+
+
+def _ids_por_codigo(cursor, codigos):
+    """IDs dos produtos de um lote (para avisar telas e cache)."""
+    if not codigos:
+        return []
+
+    marcadores = ", ".join("?" * len(codigos))
+    cursor.execute(
+        f"SELECT id FROM produtos WHERE codigo_barras IN ({marcadores})",
+        codigos
+    )
+    return [linha[0] for linha in cursor.fetchall()]
+
+
+def _codigos_existentes(cursor, codigos):
+    """Códigos do lote que já estão cadastrados (antes da gravação)."""
+    marcadores = ", ".join("?" * len(codigos))
+    cursor.execute(
+        f"SELECT codigo_barras FROM produtos WHERE codigo_barras IN ({marcadores})",
+        codigos
+    )
+    return {linha[0] for linha in cursor.fetchall()}
+
+
+def _lancar_estoque_novos(cursor, valores, existentes):
+    """Registra no histórico de estoque o estoque dos produtos inseridos."""
+    # Código repetido no lote: vale o estoque da primeira linha (a que inseriu)
+    estoques = {}
+    for produto in valores:
+        if produto[0] not in existentes and produto[7]:
+            estoques.setdefault(produto[0], produto[7])
+
+    if not estoques:
+        return
+
+    marcadores = ", ".join("?" * len(estoques))
+    cursor.execute(
+        f"SELECT id, codigo_barras FROM produtos WHERE codigo_barras IN ({marcadores})",
+        list(estoques)
+    )
+    lancar_movimentacoes(
+        cursor,
+        {linha[0]: estoques[linha[1]] for linha in cursor.fetchall()},
+        "IMPORTACAO",
+        observacao="Estoque inicial da importação de produtos"
+    )
+
+
+def _detectar_delimitador(arquivo):
+    """Descobre o separador pelo começo do arquivo (padrão: ponto e vírgula)."""
+    amostra = arquivo.read(4096)
+    arquivo.seek(0)
+
+    try:
+        return csv.Sniffer().sniff(amostra, delimiters=";,\t").delimiter
+    except csv.Error:
+        return ";"
+
+
+def _resolver_colunas(cabecalho, mapeamento):
+    """
+    Converte o mapeamento em {campo: índice da coluna}.
+
+    Raises:
+        ValueError: Campo desconhecido, coluna inexistente ou obrigatória ausente
+    """
+    desconhecidos = set(mapeamento) - set(CAMPOS_IMPORTACAO)
+    if desconhecidos:
+        raise ValueError(f"Campos desconhecidos no mapeamento: {', '.join(sorted(desconhecidos))}")
+
+    posicoes = {nome.strip(): i for i, nome in enumerate(cabecalho)}
+    colunas = {}
+
+    for campo in CAMPOS_IMPORTACAO:
+        coluna = mapeamento.get(campo, campo)
+        if coluna in posicoes:
+            colunas[campo] = posicoes[coluna]
+        elif campo in mapeamento:
+            raise ValueError(f"Coluna '{coluna}' (campo {campo}) não existe no arquivo.")
+
+    faltando = [campo for campo in CAMPOS_OBRIGATORIOS if campo not in colunas]
+    if faltando:
+        raise ValueError(f"Colunas obrigatórias ausentes no arquivo: {', '.join(faltando)}")
+
+    return colunas
+
+
+def _converter_linha(linha, colunas):
+    """
+    Valida uma linha e monta a tupla do SQL_UPSERT.
+
+    Raises:
+        ValueError: Com o motivo da rejeição
+    """
+    def valor(campo):
+        indice = colunas.get(campo)
+        if indice is None or indice >= len(linha):
+            return ""
+        return linha[indice].strip()
+
+    codigo_barras = valor("codigo_barras")
+    if not codigo_barras:
+        raise ValueError("Código de barras vazio (obrigatório na importação).")
+
+    nome = valor("nome")
+    if not nome:
+        raise ValueError("Nome vazio.")
+
+    if not valor("preco_venda"):
+        raise ValueError("Preço de venda vazio.")
+
+    preco_venda = normalizar_numero(valor("preco_venda"))
+    preco_custo = normalizar_numero(valor("preco_custo")) if valor("preco_custo") else None
+    estoque = normalizar_numero(valor("estoque"))
+
+    # float() aceita "inf" e "nan": não são preço nem estoque
+    if not all(math.isfinite(numero) for numero in (preco_venda, preco_custo or 0, estoque)):
+        raise ValueError("Número inválido (infinito ou NaN).")
+
+    if preco_venda < 0 or (preco_custo is not None and preco_custo < 0):
+        raise ValueError("Preço negativo.")
+
+    if estoque < 0 or estoque != int(estoque):
+        raise ValueError(f"Estoque inválido: '{valor('estoque')}'")
+
+    return (
+        codigo_barras,
+        nome,
+        valor("categoria") or None,
+        valor("tamanho") or None,
+        valor("cor") or None,
+        preco_custo,
+        preco_venda,
+        int(estoque),
+    )
+
+
+class _ArquivoErros:
+    """CSV das linhas rejeitadas, criado só na primeira rejeição."""
+
+    def __init__(self, caminho, codificacao):
+        self.caminho = caminho
+        self.codificacao = codificacao
+        self.cabecalho = []
+        self.usado = False
+        self._arquivo = None
+        self._escritor = None
+
+    def registrar(self, numero_linha, linha, motivo):
+        if self._arquivo is None:
+            self._arquivo = open(self.caminho, "w", newline="", encoding=self.codificacao)
+            self._escritor = csv.writer(self._arquivo, delimiter=";")
+            self._escritor.writerow(["linha", "erro"] + list(self.cabecalho))
+            self.usado = True
+
+        self._escritor.writerow([numero_linha, motivo] + list(linha))
+
+    def fechar(self):
+        if self._arquivo is not None:
+            self._arquivo.close()
+            self._arquivo = None
@@ -1,5 +1,12 @@
+import copy
+import re
+import sqlite3
+
 from database.conexao import conectar
+from dao import cache_produtos
+from dao.estoque_dao import lancar_movimentacoes
 from models.produto import Produto
+from utils.eventos import publicar, ProdutosAlterados
 
 def inserir_produto(produto:Produto):
     conexao = conectar()
@@ -19,21 +26,40 @@ def inserir_produto(produto:Produto):
         ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
     """
 
-    cursor.execute(sql, (
-        produto.codigo_barras,
-        produto.nome,
-        produto.categoria,
-        produto.tamanho,
-        produto.cor,
-        produto.preco_custo,
-        produto.preco_venda,
-        produto.estoque,
-        produto.ativo
-    ))
+    try:
+        cursor.execute(sql, (
+            produto.codigo_barras,
+            produto.nome,
+            produto.categoria,
+            produto.tamanho,
+            produto.cor,
+            produto.preco_custo,
+            produto.preco_venda,
+            produto.estoque,
+            produto.ativo
+        ))
+
+        produto_id = cursor.lastrowid
+
+        # Estoque inicial no histórico de estoque (mesma transação)
+        lancar_movimentacoes(
+            cursor,
+            {produto_id: produto.estoque or 0},
+            "CADASTRO",
+            observacao="Estoque inicial do cadastro"
+        )
 
-    conexao.commit()
-    produto.id = cursor.lastrowid
-    conexao.close()
+        conexao.commit()
+
+    except Exception as e:
+        conexao.rollback()
+        raise e
+
+    finally:
+        conexao.close()
+
+    produto.id = produto_id
+    publicar(ProdutosAlterados([produto.id]))
 
     return produto
 
@@ -55,21 +81,46 @@ def atualizar_produto(produto: Produto):
         WHERE id = ?
     """
 
-    cursor.execute(sql, (
-        produto.codigo_barras,
-        produto.nome,
-        produto.categoria,
-        produto.tamanho,
-        produto.cor,
-        produto.preco_custo,
-        produto.preco_venda,
-        produto.estoque,
-        produto.ativo,
-        produto.id
-    ))
+    try:
+        # Lê o estoque anterior e grava na mesma transação: a diferença
+        # vai para o histórico de estoque como AJUSTE
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute("SELECT estoque FROM produtos WHERE id = ?", (produto.id,))
+        linha = cursor.fetchone()
+        if not linha:
+            raise ValueError(f"Produto com ID {produto.id} não encontrado")
+        estoque_anterior = linha["estoque"]
+
+        cursor.execute(sql, (
+            produto.codigo_barras,
+            produto.nome,
+            produto.categoria,
+            produto.tamanho,
+            produto.cor,
+            produto.preco_custo,
+            produto.preco_venda,
+            produto.estoque,
+            produto.ativo,
+            produto.id
+        ))
+
+        lancar_movimentacoes(
+            cursor,
+            {produto.id: produto.estoque - estoque_anterior},
+            "AJUSTE",
+            observacao="Estoque alterado no cadastro do produto"
+        )
 
-    conexao.commit()
-    conexao.close()
+        conexao.commit()
+
+    except Exception as e:
+        conexao.rollback()
+        raise e
+
+    finally:
+        conexao.close()
+
+    publicar(ProdutosAlterados([produto.id]))
 
 def listar_produtos(
     ativos_apenas=True, 
@@ -89,11 +140,11 @@ def listar_produtos(
     
     Parâmetros:
         ativos_apenas (bool): Se True, mostra apenas produtos ativos
-        filtro_nome (str): Filtra produtos que contenham este texto no nome
-        filtro_categoria (str): Filtra produtos que contenham este texto na categoria
-        filtro_codigo (str): Filtra produtos que contenham este texto no código de barras
-        filtro_tamanho (str): Filtra produtos que contenham este texto no tamanho
-        filtro_cor (str): Filtra produtos que contenham este texto na cor
+        filtro_nome (str): Filtra produtos com palavras do nome começando com este texto
+        filtro_categoria (str): Filtra pela categoria (mesma regra do nome)
+        filtro_codigo (str): Filtra pelo código de barras (mesma regra do nome)
+        filtro_tamanho (str): Filtra pelo tamanho (mesma regra do nome)
+        filtro_cor (str): Filtra pela cor (mesma regra do nome)
         preco_min (float): Preço de venda mínimo
         preco_max (float): Preço de venda máximo
         estoque_baixo (int): Se informado, filtra produtos com estoque <= este valor
@@ -103,6 +154,10 @@ def listar_produtos(
     Retorna:
         lista de objetos Produto ordenados conforme especificado
     
+    Os filtros de texto usam o índice de busca (FTS5): ignoram acentos e
+    maiúsculas, e cada palavra digitada é buscada como início de palavra
+    ("cam azu" encontra "Camiseta Azul").
+    
     Exemplos de uso:
         # Buscar produtos com estoque baixo (5 ou menos)
         produtos = listar_produtos(estoque_baixo=5)
@@ -118,57 +173,18 @@ def listar_produtos(
             ordem_crescente=False
         )
     """
-    conexao = conectar()
-    cursor = conexao.cursor()
-
-    # Começa a montar a query SQL
-    sql = "SELECT * FROM produtos WHERE 1=1"
-    parametros = []
+    filtros = dict(
+        ativos_apenas=ativos_apenas,
+        filtro_nome=filtro_nome,
+        filtro_categoria=filtro_categoria,
+        filtro_codigo=filtro_codigo,
+        filtro_tamanho=filtro_tamanho,
+        filtro_cor=filtro_cor,
+        preco_min=preco_min,
+        preco_max=preco_max,
+        estoque_baixo=estoque_baixo
+    )
 
-    # Filtro: Produtos ativos/inativos
-    if ativos_apenas:
-        sql += " AND ativo = 1"
-    
-    # Filtro: Nome do produto
-    if filtro_nome and filtro_nome.strip():
-        sql += " AND nome LIKE ?"
-        parametros.append(f"%{filtro_nome.strip()}%")
-    
-    # Filtro: Categoria
-    if filtro_categoria and filtro_categoria.strip():
-        sql += " AND categoria LIKE ?"
-        parametros.append(f"%{filtro_categoria.strip()}%")
-    
-    # Filtro: Código de barras
-    if filtro_codigo and filtro_codigo.strip():
-        sql += " AND codigo_barras LIKE ?"
-        parametros.append(f"%{filtro_codigo.strip()}%")
-    
-    # NOVO: Filtro de Tamanho
-    if filtro_tamanho and filtro_tamanho.strip():
-        sql += " AND tamanho LIKE ?"
-        parametros.append(f"%{filtro_tamanho.strip()}%")
-    
-    # NOVO: Filtro de Cor
-    if filtro_cor and filtro_cor.strip():
-        sql += " AND cor LIKE ?"
-        parametros.append(f"%{filtro_cor.strip()}%")
-    
-    # NOVO: Filtro de Preço Mínimo
-    if preco_min is not None:
-        sql += " AND preco_venda >= ?"
-        parametros.append(preco_min)
-    
-    # NOVO: Filtro de Preço Máximo
-    if preco_max is not None:
-        sql += " AND preco_venda <= ?"
-        parametros.append(preco_max)
-    
-    # NOVO: Filtro de Estoque Baixo
-    if estoque_baixo is not None:
-        sql += " AND estoque <= ?"
-        parametros.append(estoque_baixo)
-    
     # NOVO: Ordenação
     # Valida a coluna para evitar SQL injection
     colunas_validas = ["nome", "categoria", "preco_venda", "estoque", "tamanho", "cor", "preco_custo"]
@@ -176,12 +192,9 @@ def listar_produtos(
         ordenar_por = "nome"
     
     direcao = "ASC" if ordem_crescente else "DESC"
-    sql += f" ORDER BY {ordenar_por} {direcao}"
+    ordem = f" ORDER BY {ordenar_por} {direcao}"
 
-    # Executa a query
-    cursor.execute(sql, parametros)
-    linhas = cursor.fetchall()
-    conexao.close()
+    linhas = _consultar_produtos("SELECT * FROM produtos", filtros, ordem)
 
     # Converte as linhas do banco em objetos Produto
     produtos = []
@@ -190,6 +203,153 @@ def listar_produtos(
 
     return produtos
 
+def listar_produtos_pagina(
+    ativos_apenas=True,
+    filtro_nome=None,
+    filtro_categoria=None,
+    filtro_codigo=None,
+    filtro_tamanho=None,
+    filtro_cor=None,
+    preco_min=None,
+    preco_max=None,
+    estoque_baixo=None,
+    ordenar_por="nome",
+    ordem_crescente=True,
+    cursor=None,
+    tamanho_pagina=16,
+    direcao="proxima"
+):
+    """
+    Lista uma página de produtos usando paginação por cursor (keyset).
+
+    Em vez de OFFSET, cada página começa logo depois (ou antes) da
+    última linha vista, com uma busca no índice da coluna ordenada.
+    O custo de cada página é proporcional ao tamanho da página, não
+    à posição dela no catálogo.
+
+    Parâmetros:
+        (filtros): Os mesmos de listar_produtos
+        ordenar_por (str): Coluna para ordenação (as mesmas de listar_produtos)
+        ordem_crescente (bool): True para crescente, False para decrescente
+        cursor (tuple): Chave de onde a página começa, vinda de uma página
+                        anterior (cursor_inicio ou cursor_fim). None = ponta da lista
+        tamanho_pagina (int): Quantidade de produtos por página
+        direcao (str): "proxima" (depois do cursor) ou "anterior" (antes do cursor).
+                       Com cursor=None, "anterior" traz a última página
+
+    Retorna:
+        dict com:
+        - produtos: lista de Produto da página, na ordem de exibição
+        - cursor_inicio: chave do primeiro produto (para ir à página anterior)
+        - cursor_fim: chave do último produto (para ir à próxima página)
+        - tem_mais: True se existem mais produtos na direção pedida
+
+    Exemplo:
+        pagina = listar_produtos_pagina(ordenar_por="preco_venda")
+        seguinte = listar_produtos_pagina(
+            ordenar_por="preco_venda",
+            cursor=pagina["cursor_fim"]
+        )
+    """
+    if direcao not in ("proxima", "anterior"):
+        raise ValueError("A direção deve ser 'proxima' ou 'anterior'.")
+
+    if ordenar_por not in _EXPRESSOES_ORDENACAO:
+        ordenar_por = "nome"
+
+    expressao = _EXPRESSOES_ORDENACAO[ordenar_por]
+
+    # Indo para trás, a consulta percorre o índice no sentido inverso
+    # e o resultado é desvirado no final.
+    crescente = ordem_crescente if direcao == "proxima" else not ordem_crescente
+    direcao_sql = "ASC" if crescente else "DESC"
+
+    complemento = ""
+    parametros_cursor = []
+
+    if cursor is not None:
+        valor, produto_id = cursor
+        comparacao = ">" if crescente else "<"
+        # O primeiro termo permite a busca no índice; o segundo desempata pelo id
+        complemento += (
+            f" AND {expressao} {comparacao}= ?"
+            f" AND ({expressao}, id) {comparacao} (?, ?)"
+        )
+        parametros_cursor += [valor, valor, produto_id]
+
+    complemento += f" ORDER BY {expressao} {direcao_sql}, id {direcao_sql} LIMIT ?"
+    # Uma linha a mais para saber se existe outra página
+    parametros_cursor.append(tamanho_pagina + 1)
+
+    filtros = dict(
+        ativos_apenas=ativos_apenas,
+        filtro_nome=filtro_nome,
+        filtro_categoria=filtro_categoria,
+        filtro_codigo=filtro_codigo,
+        filtro_tamanho=filtro_tamanho,
+        filtro_cor=filtro_cor,
+        preco_min=preco_min,
+        preco_max=preco_max,
+        estoque_baixo=estoque_baixo
+    )
+
+    linhas = _consultar_produtos(
+        f"SELECT *, {expressao} AS chave_ordem FROM produtos",
+        filtros,
+        complemento,
+        parametros_cursor
+    )
+
+    tem_mais = len(linhas) > tamanho_pagina
+    linhas = linhas[:tamanho_pagina]
+
+    if direcao == "anterior":
+        linhas.reverse()
+
+    produtos = [_linha_para_produto(linha) for linha in linhas]
+
+    return {
+        "produtos": produtos,
+        "cursor_inicio": (linhas[0]["chave_ordem"], linhas[0]["id"]) if linhas else None,
+        "cursor_fim": (linhas[-1]["chave_ordem"], linhas[-1]["id"]) if linhas else None,
+        "tem_mais": tem_mais
+    }
+
+
+def contar_produtos(
+    ativos_apenas=True,
+    filtro_nome=None,
+    filtro_categoria=None,
+    filtro_codigo=None,
+    filtro_tamanho=None,
+    filtro_cor=None,
+    preco_min=None,
+    preco_max=None,
+    estoque_baixo=None
+):
+    """
+    Conta os produtos que atendem aos filtros (os mesmos de listar_produtos).
+
+    Usado no total da tela de produtos, sem carregar os produtos.
+
+    Retorna:
+        int: Quantidade de produtos
+    """
+    filtros = dict(
+        ativos_apenas=ativos_apenas,
+        filtro_nome=filtro_nome,
+        filtro_categoria=filtro_categoria,
+        filtro_codigo=filtro_codigo,
+        filtro_tamanho=filtro_tamanho,
+        filtro_cor=filtro_cor,
+        preco_min=preco_min,
+        preco_max=preco_max,
+        estoque_baixo=estoque_baixo
+    )
+
+    linhas = _consultar_produtos("SELECT COUNT(*) AS total FROM produtos", filtros)
+    return linhas[0]["total"]
+
 def buscar_produto_por_id(produto_id):
     conexao = conectar()
     cursor = conexao.cursor()
@@ -207,7 +367,49 @@ def buscar_produto_por_id(produto_id):
     
     return None
 
+def buscar_produtos_por_ids(produto_ids):
+    """
+    Busca vários produtos pelo id em uma consulta (ativos ou não).
+
+    Usado pelas telas para atualizar só os produtos avisados em um
+    evento de alteração.
+
+    Parâmetros:
+        produto_ids: IDs dos produtos
+
+    Retorna:
+        list[Produto]: Produtos encontrados (ids inexistentes são ignorados)
+    """
+    produto_ids = list(produto_ids)
+    if not produto_ids:
+        return []
+
+    conexao = conectar()
+    cursor = conexao.cursor()
+
+    marcadores = ", ".join("?" * len(produto_ids))
+    cursor.execute(
+        f"SELECT * FROM produtos WHERE id IN ({marcadores})",
+        produto_ids
+    )
+
+    linhas = cursor.fetchall()
+    conexao.close()
+
+    return [_linha_para_produto(linha) for linha in linhas]
+
 def buscar_produto_por_codigo_barras(codigo_barras):
+    """
+    Busca um produto ativo pelo código de barras.
+
+    Com o cache de códigos ativo (tela de vendas aberta), a busca é
+    feita em memória; só os códigos fora do cache consultam o banco.
+    """
+    if cache_produtos.cache_ativo():
+        produto = cache_produtos.obter(codigo_barras)
+        if produto:
+            return produto
+
     conexao = conectar()
     cursor = conexao.cursor()
 
@@ -220,10 +422,49 @@ def buscar_produto_por_codigo_barras(codigo_barras):
     conexao.close()
 
     if linha:
-        return _linha_para_produto(linha)
+        produto = _linha_para_produto(linha)
+        cache_produtos.guardar(copy.copy(produto))
+        return produto
 
     return None
 
+def aquecer_cache_codigo_barras(produtos=None):
+    """
+    Carrega o cache de códigos de barras de uma só vez.
+
+    Cada chamada deve ter o seu descartar_cache_codigo_barras(): o
+    cache continua ativo até o último usuário descartá-lo.
+
+    Parâmetros:
+        produtos (list): Produtos ativos já carregados. Se None, lê do banco
+                         com uma única consulta
+
+    Exemplo:
+        aquecer_cache_codigo_barras()
+        produto = buscar_produto_por_codigo_barras("789123")  # sem consulta
+    """
+    if produtos is None:
+        conexao = conectar()
+        cursor = conexao.cursor()
+
+        cursor.execute(
+            "SELECT * FROM produtos WHERE ativo = 1 AND codigo_barras IS NOT NULL"
+        )
+
+        linhas = cursor.fetchall()
+        conexao.close()
+
+        produtos = [_linha_para_produto(linha) for linha in linhas]
+    else:
+        # O cache guarda cópias: a lista de quem chamou continua independente
+        produtos = [copy.copy(produto) for produto in produtos]
+
+    cache_produtos.carregar(produtos)
+
+def descartar_cache_codigo_barras():
+    """Libera o cache de códigos de barras (ex.: ao fechar a tela de vendas); desativa no último."""
+    cache_produtos.descartar()
+
 def desativar_produto(produto_id):
     conexao = conectar()
     cursor = conexao.cursor()
@@ -236,6 +477,8 @@ def desativar_produto(produto_id):
     conexao.commit()
     conexao.close()
 
+    publicar(ProdutosAlterados([produto_id]))
+
 def reativar_produto(produto_id):
     """
     Reativa um produto que estava desativado.
@@ -251,10 +494,131 @@ def reativar_produto(produto_id):
     conexao.commit()
     conexao.close()
 
+    publicar(ProdutosAlterados([produto_id]))
+
 # =========================
-# Função auxiliar interna
+# Funções auxiliares internas
 # =========================
 
+# Expressão de ordenação de cada coluna na paginação por cursor.
+# Colunas que aceitam NULL usam COALESCE para que a comparação com o
+# cursor funcione; as expressões batem com os índices da migração 3.
+_EXPRESSOES_ORDENACAO = {
+    "nome": "nome",
+    "categoria": "COALESCE(categoria, '')",
+    "tamanho": "COALESCE(tamanho, '')",
+    "cor": "COALESCE(cor, '')",
+    "preco_custo": "COALESCE(preco_custo, 0)",
+    "preco_venda": "preco_venda",
+    "estoque": "estoque",
+}
+
+
+def _consultar_produtos(sql_select, filtros, complemento="", parametros_complemento=()):
+    """
+    Executa sql_select + WHERE dos filtros + complemento.
+
+    Usa o índice de busca (FTS5); se o banco não tiver o índice, repete a
+    consulta com LIKE.
+
+    Returns:
+        list[sqlite3.Row]: Linhas retornadas
+    """
+    conexao = conectar()
+    cursor = conexao.cursor()
+
+    try:
+        try:
+            where, parametros = _montar_filtros(usar_indice_busca=True, **filtros)
+            cursor.execute(sql_select + where + complemento, parametros + list(parametros_complemento))
+        except sqlite3.OperationalError as e:
+            if "produtos_busca" not in str(e):
+                raise
+            where, parametros = _montar_filtros(usar_indice_busca=False, **filtros)
+            cursor.execute(sql_select + where + complemento, parametros + list(parametros_complemento))
+
+        return cursor.fetchall()
+    finally:
+        conexao.close()
+
+
+def _montar_filtros(
+    ativos_apenas=True,
+    filtro_nome=None,
+    filtro_categoria=None,
+    filtro_codigo=None,
+    filtro_tamanho=None,
+    filtro_cor=None,
+    preco_min=None,
+    preco_max=None,
+    estoque_baixo=None,
+    usar_indice_busca=True
+):
+    """
+    Monta a cláusula WHERE dos filtros de produtos.
+
+    Os filtros de texto usam o índice FTS5 (produtos_busca): cada palavra
+    digitada vira uma busca por prefixo na coluna, sem diferenciar
+    acentos nem maiúsculas. Com usar_indice_busca=False, usa LIKE.
+
+    O código de barras usa sempre LIKE '%...%': no balcão é comum buscar
+    pelos últimos dígitos, que a busca por prefixo não encontra.
+
+    Returns:
+        tuple: (sql_where, lista_de_parametros)
+    """
+    sql = " WHERE 1=1"
+    parametros = []
+
+    # Filtro: Produtos ativos/inativos
+    if ativos_apenas:
+        sql += " AND ativo = 1"
+
+    # (coluna, texto digitado, pode usar o índice FTS5)
+    filtros_texto = [
+        ("nome", filtro_nome, True),
+        ("categoria", filtro_categoria, True),
+        ("codigo_barras", filtro_codigo, False),
+        ("tamanho", filtro_tamanho, True),
+        ("cor", filtro_cor, True),
+    ]
+
+    termos_busca = []
+    for coluna, texto, usa_indice in filtros_texto:
+        if not texto or not texto.strip():
+            continue
+
+        palavras = re.findall(r"\w+", texto) if usar_indice_busca and usa_indice else []
+
+        if palavras:
+            # As palavras vêm de \w+, então não têm aspas nem operadores do FTS5
+            termos_busca.extend(f'{coluna} : "{palavra}"*' for palavra in palavras)
+        else:
+            sql += f" AND {coluna} LIKE ?"
+            parametros.append(f"%{texto.strip()}%")
+
+    if termos_busca:
+        sql += " AND id IN (SELECT rowid FROM produtos_busca WHERE produtos_busca MATCH ?)"
+        parametros.append(" AND ".join(termos_busca))
+
+    # NOVO: Filtro de Preço Mínimo
+    if preco_min is not None:
+        sql += " AND preco_venda >= ?"
+        parametros.append(preco_min)
+    
+    # NOVO: Filtro de Preço Máximo
+    if preco_max is not None:
+        sql += " AND preco_venda <= ?"
+        parametros.append(preco_max)
+    
+    # NOVO: Filtro de Estoque Baixo
+    if estoque_baixo is not None:
+        sql += " AND estoque <= ?"
+        parametros.append(estoque_baixo)
+
+    return sql, parametros
+
+
 def _linha_para_produto(linha):
     return Produto(
         id=linha["id"],
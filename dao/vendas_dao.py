@@ -1,5 +1,7 @@
 from database.conexao import conectar
+from dao.estoque_dao import lancar_movimentacoes
 from models.venda import Venda, ItemVenda
+from utils.eventos import publicar, VendaRegistrada, VendaCancelada
 from datetime import datetime
 
 
@@ -7,16 +9,23 @@ def registrar_venda(venda: Venda):
     """
     Registra uma nova venda no banco de dados.
     
-    Esta função faz 3 coisas importantes:
+    Esta função faz 4 coisas importantes:
     1. Salva a venda (tabela vendas)
     2. Salva os itens da venda (tabela itens_venda)
     3. Dá baixa no estoque dos produtos vendidos
+    4. Registra a baixa no histórico de estoque (origem VENDA)
+    
+    Tudo acontece em uma única transação (BEGIN IMMEDIATE), com o mesmo
+    número de consultas para qualquer tamanho de carrinho.
     
     Args:
         venda: Objeto Venda com os dados da venda e seus itens
         
     Returns:
-        O ID da venda criada
+        tuple: (ID da venda criada, {produto_id: estoque depois da venda})
+        
+        O estoque novo de cada produto vendido permite atualizar a tela
+        sem recarregar o catálogo.
         
     Raises:
         ValueError: Se a venda não tiver itens ou houver estoque insuficiente
@@ -39,20 +48,49 @@ def registrar_venda(venda: Venda):
         ))
         
         # Registrar no banco
-        venda_id = registrar_venda(venda)
+        venda_id, estoques = registrar_venda(venda)
+        print(estoques)  # {1: 8}
     """
     if not venda.itens:
         raise ValueError("A venda deve ter pelo menos um item.")
     
+    # Quantidade total por produto (o mesmo produto pode aparecer em mais de um item)
+    quantidades = {}
+    for item in venda.itens:
+        quantidades[item.produto_id] = quantidades.get(item.produto_id, 0) + item.quantidade
+    
     conexao = conectar()
     cursor = conexao.cursor()
     
     try:
+        # BEGIN IMMEDIATE reserva a escrita já na conferência do estoque:
+        # outro caixa não consegue vender o mesmo produto entre a
+        # conferência e a baixa.
+        cursor.execute("BEGIN IMMEDIATE")
+        
         # Define a data atual se não foi informada
         if not venda.data:
             venda.data = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
-        # 1. INSERIR A VENDA (cabeçalho)
+        # 1. CONFERE O ESTOQUE DE TODOS OS PRODUTOS (uma consulta)
+        marcadores = ", ".join("?" for _ in quantidades)
+        cursor.execute(
+            f"SELECT id, estoque FROM produtos WHERE id IN ({marcadores})",
+            list(quantidades)
+        )
+        estoques = {linha["id"]: linha["estoque"] for linha in cursor.fetchall()}
+        
+        for produto_id, quantidade in quantidades.items():
+            if produto_id not in estoques:
+                raise ValueError(f"Produto ID {produto_id} não encontrado.")
+            
+            if estoques[produto_id] < quantidade:
+                raise ValueError(
+                    f"Estoque insuficiente para o produto ID {produto_id}. "
+                    f"Estoque atual: {estoques[produto_id]}, solicitado: {quantidade}"
+                )
+        
+        # 2. INSERIR A VENDA (cabeçalho)
         cursor.execute("""
             INSERT INTO vendas (
                 data,
@@ -77,51 +115,72 @@ def registrar_venda(venda: Venda):
         
         venda_id = cursor.lastrowid
         
-        # 2. INSERIR OS ITENS DA VENDA
-        for item in venda.itens:
-            # Verifica se há estoque suficiente
-            cursor.execute("SELECT estoque FROM produtos WHERE id = ?", (item.produto_id,))
-            resultado = cursor.fetchone()
-            
-            if not resultado:
-                raise ValueError(f"Produto ID {item.produto_id} não encontrado.")
-            
-            estoque_atual = resultado["estoque"]
-            
-            if estoque_atual < item.quantidade:
-                raise ValueError(
-                    f"Estoque insuficiente para o produto ID {item.produto_id}. "
-                    f"Estoque atual: {estoque_atual}, solicitado: {item.quantidade}"
-                )
-            
-            # Insere o item da venda
-            cursor.execute("""
-                INSERT INTO itens_venda (
-                    venda_id,
-                    produto_id,
-                    quantidade,
-                    preco_unitario,
-                    subtotal
-                ) VALUES (?, ?, ?, ?, ?)
-            """, (
+        # 3. INSERIR OS ITENS DA VENDA (todos de uma vez)
+        cursor.executemany("""
+            INSERT INTO itens_venda (
                 venda_id,
-                item.produto_id,
-                item.quantidade,
-                item.preco_unitario,
-                item.subtotal
-            ))
-            
-            # 3. DÁ BAIXA NO ESTOQUE
-            cursor.execute("""
-                UPDATE produtos
-                SET estoque = estoque - ?
-                WHERE id = ?
-            """, (item.quantidade, item.produto_id))
+                produto_id,
+                quantidade,
+                preco_unitario,
+                subtotal
+            ) VALUES (?, ?, ?, ?, ?)
+        """, [
+            (venda_id, item.produto_id, item.quantidade, item.preco_unitario, item.subtotal)
+            for item in venda.itens
+        ])
+        
+        # 4. DÁ BAIXA NO ESTOQUE
+        # A condição estoque >= ? garante que a baixa nunca deixa o
+        # estoque negativo; se algum produto não for atualizado, a
+        # venda inteira é desfeita.
+        cursor.executemany("""
+            UPDATE produtos
+            SET estoque = estoque - ?
+            WHERE id = ? AND estoque >= ?
+        """, [
+            (quantidade, produto_id, quantidade)
+            for produto_id, quantidade in quantidades.items()
+        ])
+        
+        if cursor.rowcount != len(quantidades):
+            raise ValueError("Estoque insuficiente: o estoque foi alterado durante a venda.")
+        
+        # 5. REGISTRA A BAIXA NO HISTÓRICO DE ESTOQUE (uma SAIDA por produto)
+        lancar_movimentacoes(
+            cursor,
+            {produto_id: -quantidade for produto_id, quantidade in quantidades.items()},
+            "VENDA",
+            venda_id,
+            data=venda.data,
+            observacao=f"Venda #{venda_id}",
+            usuario_id=venda.usuario_id
+        )
+        
+        # 6. ATUALIZA O RESUMO DIÁRIO (usado pelo painel)
+        if not venda.cancelada:
+            _somar_ao_resumo(
+                cursor,
+                venda.data,
+                venda.forma_pagamento,
+                vendas=1,
+                total=venda.total,
+                desconto=venda.desconto or 0,
+                unidades=sum(quantidades.values()),
+                vendas_com_valor=1 if venda.total > 0 else 0
+            )
         
         # Commit de tudo de uma vez
         conexao.commit()
         
-        return venda_id
+        # Estoque depois da venda: lido e baixado dentro da mesma
+        # transação, então não precisa de outra consulta
+        novos_estoques = {
+            produto_id: estoques[produto_id] - quantidade
+            for produto_id, quantidade in quantidades.items()
+        }
+        publicar(VendaRegistrada(venda_id, novos_estoques))
+        
+        return venda_id, novos_estoques
         
     except Exception as e:
         # Se der erro, desfaz tudo (rollback)
@@ -225,15 +284,16 @@ def listar_vendas(data_inicial=None, data_final=None, incluir_canceladas=False):
     if not incluir_canceladas:
         sql += " AND cancelada = 0"
     
-    # Filtro por data inicial
+    # Filtro por período, comparando a própria coluna data (sem date()),
+    # para que o índice idx_vendas_data seja usado
     if data_inicial:
-        sql += " AND date(data) >= ?"
+        sql += " AND data >= ?"
         parametros.append(data_inicial)
     
-    # Filtro por data final
+    # Intervalo meio-aberto: tudo antes do início do dia seguinte
     if data_final:
-        sql += " AND date(data) <= ?"
-        parametros.append(data_final)
+        sql += " AND data < ?"
+        parametros.append(_dia_seguinte(data_final))
     
     sql += " ORDER BY data DESC"
     
@@ -273,19 +333,28 @@ def cancelar_venda(venda_id):
     cursor = conexao.cursor()
     
     try:
-        # Verifica se a venda existe e não está cancelada
+        # BEGIN IMMEDIATE + UPDATE condicional: de dois cancelamentos
+        # simultâneos da mesma venda, só um devolve o estoque
+        cursor.execute("BEGIN IMMEDIATE")
+        
+        # Marca a venda como cancelada (só se ainda estiver ativa)
         cursor.execute(
-            "SELECT cancelada FROM vendas WHERE id = ?",
+            "UPDATE vendas SET cancelada = 1 WHERE id = ? AND cancelada = 0",
             (venda_id,)
         )
-        resultado = cursor.fetchone()
         
-        if not resultado:
-            raise ValueError("Venda não encontrada.")
-        
-        if resultado["cancelada"] == 1:
+        if cursor.rowcount == 0:
+            cursor.execute("SELECT 1 FROM vendas WHERE id = ?", (venda_id,))
+            if not cursor.fetchone():
+                raise ValueError("Venda não encontrada.")
             raise ValueError("Esta venda já está cancelada.")
         
+        cursor.execute(
+            "SELECT data, total, desconto, forma_pagamento FROM vendas WHERE id = ?",
+            (venda_id,)
+        )
+        resultado = cursor.fetchone()
+        
         # Busca os itens para devolver ao estoque
         cursor.execute(
             "SELECT produto_id, quantidade FROM itens_venda WHERE venda_id = ?",
@@ -294,21 +363,55 @@ def cancelar_venda(venda_id):
         itens = cursor.fetchall()
         
         # Devolve cada item ao estoque
+        devolucoes = {}
         for item in itens:
-            cursor.execute("""
-                UPDATE produtos
-                SET estoque = estoque + ?
-                WHERE id = ?
-            """, (item["quantidade"], item["produto_id"]))
+            devolucoes[item["produto_id"]] = devolucoes.get(item["produto_id"], 0) + item["quantidade"]
+
+        cursor.executemany("""
+            UPDATE produtos
+            SET estoque = estoque + ?
+            WHERE id = ?
+        """, [
+            (quantidade, produto_id)
+            for produto_id, quantidade in devolucoes.items()
+        ])
+
+        # Uma ENTRADA por produto no histórico de estoque
+        lancar_movimentacoes(
+            cursor,
+            devolucoes,
+            "CANCELAMENTO_VENDA",
+            venda_id,
+            observacao=f"Cancelamento da venda #{venda_id}"
+        )
         
-        # Marca a venda como cancelada
-        cursor.execute(
-            "UPDATE vendas SET cancelada = 1 WHERE id = ?",
-            (venda_id,)
+        # Retira a venda do resumo diário
+        _somar_ao_resumo(
+            cursor,
+            resultado["data"],
+            resultado["forma_pagamento"],
+            vendas=-1,
+            total=-resultado["total"],
+            desconto=-(resultado["desconto"] or 0),
+            unidades=-sum(item["quantidade"] for item in itens),
+            vendas_com_valor=-1 if resultado["total"] > 0 else 0
         )
         
+        # Estoque depois da devolução, para o aviso às telas
+        produto_ids = list(devolucoes)
+        estoques = {}
+        if produto_ids:
+            marcadores = ", ".join("?" * len(produto_ids))
+            cursor.execute(
+                f"SELECT id, estoque FROM produtos WHERE id IN ({marcadores})",
+                produto_ids
+            )
+            estoques = {linha["id"]: linha["estoque"] for linha in cursor.fetchall()}
+        
         conexao.commit()
         
+        publicar(VendaCancelada(venda_id, estoques))
+        
     except Exception as e:
         conexao.rollback()
         raise e
@@ -331,12 +434,12 @@ def obter_total_vendas_periodo(data_inicial, data_final):
     conexao = conectar()
     cursor = conexao.cursor()
     
+    # Lê do resumo diário: uma linha por dia e forma de pagamento
     cursor.execute("""
-        SELECT COALESCE(SUM(total), 0) as total_vendas
-        FROM vendas
-        WHERE cancelada = 0
-        AND date(data) >= ?
-        AND date(data) <= ?
+        SELECT COALESCE(SUM(valor_total), 0) as total_vendas
+        FROM resumo_vendas_diario
+        WHERE dia >= ?
+        AND dia <= ?
     """, (data_inicial, data_final))
     
     resultado = cursor.fetchone()
@@ -389,11 +492,11 @@ def obter_vendas_por_forma_pagamento():
     cursor.execute("""
         SELECT 
             forma_pagamento,
-            COUNT(*) as quantidade,
-            SUM(total) as total
-        FROM vendas
-        WHERE cancelada = 0
+            SUM(quantidade_vendas) as quantidade,
+            SUM(valor_total) as total
+        FROM resumo_vendas_diario
         GROUP BY forma_pagamento
+        HAVING SUM(quantidade_vendas) > 0
         ORDER BY total DESC
     """)
     
@@ -488,14 +591,13 @@ def obter_vendas_ultimos_dias(dias=7):
     
     cursor.execute("""
         SELECT 
-            DATE(data) as data,
-            COUNT(*) as quantidade,
-            SUM(total) as total
-        FROM vendas
-        WHERE cancelada = 0
-        AND DATE(data) BETWEEN ? AND ?
-        GROUP BY DATE(data)
-        ORDER BY data ASC
+            dia as data,
+            SUM(quantidade_vendas) as quantidade,
+            SUM(valor_total) as total
+        FROM resumo_vendas_diario
+        WHERE dia BETWEEN ? AND ?
+        GROUP BY dia
+        ORDER BY dia ASC
     """, (data_inicial, data_final))
     
     resultados = cursor.fetchall()
@@ -536,52 +638,44 @@ def obter_estatisticas_gerais():
     """
     from database.conexao import conectar
     from dao.clientes_dao import obter_total_clientes_ativos
-    from dao.produtos_dao import listar_produtos
     
     conexao = conectar()
     cursor = conexao.cursor()
     
-    # Total de vendas (todas)
+    # Totais de vendas, a partir do resumo diário
     cursor.execute("""
-        SELECT COUNT(*) as total
-        FROM vendas
-        WHERE cancelada = 0
+        SELECT
+            COALESCE(SUM(quantidade_vendas), 0) as total_vendas,
+            COALESCE(SUM(unidades), 0) as total_unidades,
+            COALESCE(SUM(valor_total), 0) as valor_total,
+            COALESCE(SUM(vendas_com_valor), 0) as vendas_com_valor
+        FROM resumo_vendas_diario
     """)
-    total_vendas = cursor.fetchone()["total"]
+    resumo = cursor.fetchone()
+    total_vendas = resumo["total_vendas"]
+    total_produtos_vendidos = resumo["total_unidades"]
     
-    # Total de produtos vendidos (quantidade)
-    cursor.execute("""
-        SELECT SUM(iv.quantidade) as total
-        FROM itens_venda iv
-        JOIN vendas v ON v.id = iv.venda_id
-        WHERE v.cancelada = 0
-    """)
-    total_produtos_vendidos = cursor.fetchone()["total"] or 0
+    # Ticket médio das vendas com valor (vendas de total zero não entram)
+    vendas_com_valor = resumo["vendas_com_valor"]
+    ticket_medio = resumo["valor_total"] / vendas_com_valor if vendas_com_valor else 0.0
     
-    # Ticket médio
+    # Produtos cadastrados e valor em estoque, somados no próprio banco
     cursor.execute("""
-        SELECT AVG(total) as media
-        FROM vendas
-        WHERE cancelada = 0
-        AND total > 0
+        SELECT
+            COUNT(*) as total_produtos,
+            COALESCE(SUM(COALESCE(preco_venda, 0) * estoque), 0) as valor_estoque
+        FROM produtos
+        WHERE ativo = 1
     """)
-    ticket_medio = cursor.fetchone()["media"] or 0.0
+    produtos = cursor.fetchone()
+    total_produtos = produtos["total_produtos"]
+    valor_estoque = produtos["valor_estoque"]
     
     conexao.close()
     
     # Total de clientes ativos
     total_clientes = obter_total_clientes_ativos()
     
-    # Total de produtos cadastrados
-    produtos = listar_produtos(ativos_apenas=True)
-    total_produtos = len(produtos)
-    
-    # Total em estoque (valor)
-    valor_estoque = sum(
-        (p.preco_venda or 0) * p.estoque 
-        for p in produtos
-    )
-    
     return {
         "total_vendas": total_vendas,
         "total_clientes": total_clientes,
@@ -589,4 +683,92 @@ def obter_estatisticas_gerais():
         "total_produtos_vendidos": total_produtos_vendidos,
         "ticket_medio": ticket_medio,
         "valor_estoque": valor_estoque
-    }
\ No newline at end of file
+    }
+
+
+def reconstruir_resumo_vendas():
+    """
+    Refaz o resumo diário de vendas a partir das tabelas vendas e itens_venda.
+
+    O resumo é mantido automaticamente por registrar_venda e
+    cancelar_venda. Use esta função se as vendas forem alteradas por
+    fora do sistema (ex.: edição manual do banco).
+
+    Returns:
+        int: Quantidade de linhas (dia e forma de pagamento) no resumo
+    """
+    conexao = conectar()
+    cursor = conexao.cursor()
+    
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute("DELETE FROM resumo_vendas_diario")
+        cursor.execute("""
+            INSERT INTO resumo_vendas_diario (
+                dia, forma_pagamento, quantidade_vendas, valor_total, valor_desconto, unidades,
+                vendas_com_valor
+            )
+            SELECT
+                date(v.data),
+                v.forma_pagamento,
+                COUNT(*),
+                SUM(v.total),
+                SUM(COALESCE(v.desconto, 0)),
+                SUM(COALESCE(u.unidades, 0)),
+                SUM(CASE WHEN v.total > 0 THEN 1 ELSE 0 END)
+            FROM vendas v
+            LEFT JOIN (
+                SELECT venda_id, SUM(quantidade) AS unidades
+                FROM itens_venda
+                GROUP BY venda_id
+            ) u ON u.venda_id = v.id
+            WHERE v.cancelada = 0
+            GROUP BY date(v.data), v.forma_pagamento
+        """)
+        linhas = cursor.rowcount
+        conexao.commit()
+        
+        return linhas
+        
+    except Exception as e:
+        conexao.rollback()
+        raise e
+        
+    finally:
+        conexao.close()
+
+
+# =========================
+# Funções auxiliares internas
+# =========================
+
+def _dia_seguinte(data):
+    """
+    Retorna o dia seguinte a uma data "YYYY-MM-DD" (também no formato "YYYY-MM-DD").
+
+    Usado nos filtros de período: "data < dia seguinte" inclui o dia
+    inteiro e ainda permite usar o índice da coluna data.
+    """
+    from datetime import date, timedelta
+    
+    return (date.fromisoformat(data[:10]) + timedelta(days=1)).strftime("%Y-%m-%d")
+
+
+def _somar_ao_resumo(cursor, data, forma_pagamento, vendas, total, desconto, unidades, vendas_com_valor):
+    """
+    Soma (ou subtrai, com valores negativos) uma venda no resumo diário.
+
+    Deve ser chamada dentro da transação que grava ou cancela a venda.
+    """
+    cursor.execute("""
+        INSERT INTO resumo_vendas_diario (
+            dia, forma_pagamento, quantidade_vendas, valor_total, valor_desconto, unidades,
+            vendas_com_valor
+        ) VALUES (date(?), ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (dia, forma_pagamento) DO UPDATE SET
+            quantidade_vendas = quantidade_vendas + excluded.quantidade_vendas,
+            valor_total = valor_total + excluded.valor_total,
+            valor_desconto = valor_desconto + excluded.valor_desconto,
+            unidades = unidades + excluded.unidades,
+            vendas_com_valor = vendas_com_valor + excluded.vendas_com_valor
+    """, (data, forma_pagamento, vendas, total, desconto, unidades, vendas_com_valor))
@@ -3,6 +3,6 @@ Módulo de banco de dados do Sistema PDV
 Gerencia conexões e configurações do SQLite
 """
 
-from .conexao import conectar, inicializar_banco
+from .conexao import conectar, inicializar_banco, configurar_banco, fechar_conexoes
 
-__all__ = ['conectar', 'inicializar_banco']
\ No newline at end of file
+__all__ = ['conectar', 'inicializar_banco', 'configurar_banco', 'fechar_conexoes']
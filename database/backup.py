@@ -0,0 +1,250 @@
+"""
+Backup e restauração do banco de dados.
+
+Usa a API de backup do SQLite (sqlite3.Connection.backup), que copia o
+banco página por página com o sistema em uso. Entre cada bloco de
+páginas o backup faz uma pausa, liberando o banco para o caixa:
+uma venda nunca espera o backup inteiro terminar.
+"""
+
+import os
+import glob
+import gzip
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from database.conexao import PASTA_DADOS, obter_pool, configurar_banco
+
+
+PASTA_BACKUPS = os.path.join(PASTA_DADOS, "backups")
+
+# Quantas páginas copiar por passo e quanto esperar entre os passos.
+# Com páginas de 4 KB, 256 páginas = 1 MB por passo.
+PAGINAS_POR_PASSO = 256
+PAUSA_ENTRE_PASSOS = 0.05  # segundos
+
+# Backup automático
+INTERVALO_BACKUP_HORAS = 12
+MANTER_BACKUPS = 14
+
+PREFIXO_BACKUP = "estoque_"
+
+
+def fazer_backup(
+    destino=None,
+    paginas_por_passo=PAGINAS_POR_PASSO,
+    pausa=PAUSA_ENTRE_PASSOS,
+    compactar=False,
+    ao_progresso=None
+):
+    """
+    Faz um backup online do banco de dados.
+
+    Args:
+        destino: Caminho do arquivo de backup. Se None, cria um arquivo
+                 com data e hora em PASTA_BACKUPS
+        paginas_por_passo: Páginas copiadas por passo
+        pausa: Segundos de espera entre os passos
+        compactar: Se True, grava o backup compactado (.gz)
+        ao_progresso: Função opcional chamada como ao_progresso(copiadas, total)
+
+    Returns:
+        str: Caminho do arquivo de backup criado
+
+    Exemplo:
+        arquivo = fazer_backup(compactar=True)
+        print(f"Backup salvo em {arquivo}")
+    """
+    if destino is None:
+        os.makedirs(PASTA_BACKUPS, exist_ok=True)
+        nome = f"{PREFIXO_BACKUP}{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
+        destino = os.path.join(PASTA_BACKUPS, nome)
+
+    if compactar and not destino.endswith(".gz"):
+        destino += ".gz"
+
+    # Copia primeiro para um arquivo temporário: um backup interrompido
+    # nunca fica com o nome de um backup válido.
+    pasta_destino = os.path.dirname(os.path.abspath(destino))
+    os.makedirs(pasta_destino, exist_ok=True)
+    descritor, temporario = tempfile.mkstemp(suffix=".db", dir=pasta_destino)
+    os.close(descritor)
+
+    def progresso(status, restantes, total):
+        if ao_progresso:
+            ao_progresso(total - restantes, total)
+        if restantes > 0 and pausa:
+            time.sleep(pausa)
+
+    origem = sqlite3.connect(obter_pool().caminho)
+    copia = sqlite3.connect(temporario)
+    try:
+        origem.backup(copia, pages=paginas_por_passo, progress=progresso)
+    except Exception:
+        copia.close()
+        os.remove(temporario)
+        raise
+    finally:
+        origem.close()
+
+    # O backup de um banco em WAL herda o journal_mode; a cópia deve
+    # ser um arquivo único, sem -wal/-shm ao lado.
+    copia.execute("PRAGMA journal_mode = DELETE")
+    copia.close()
+
+    if compactar:
+        with open(temporario, "rb") as entrada, gzip.open(destino, "wb") as saida:
+            shutil.copyfileobj(entrada, saida)
+        os.remove(temporario)
+    else:
+        os.replace(temporario, destino)
+
+    return destino
+
+
+def listar_backups(pasta=PASTA_BACKUPS):
+    """
+    Lista os backups da pasta, do mais novo para o mais antigo.
+
+    Returns:
+        list[str]: Caminhos dos arquivos de backup
+    """
+    arquivos = glob.glob(os.path.join(pasta, f"{PREFIXO_BACKUP}*.db"))
+    arquivos += glob.glob(os.path.join(pasta, f"{PREFIXO_BACKUP}*.db.gz"))
+    return sorted(arquivos, key=os.path.getmtime, reverse=True)
+
+
+def rotacionar_backups(pasta=PASTA_BACKUPS, manter=MANTER_BACKUPS):
+    """
+    Apaga os backups mais antigos, mantendo apenas os N mais recentes.
+
+    Returns:
+        list[str]: Arquivos apagados
+    """
+    apagados = []
+    for arquivo in listar_backups(pasta)[manter:]:
+        try:
+            os.remove(arquivo)
+            apagados.append(arquivo)
+        except OSError as e:
+            print(f"Aviso: não foi possível apagar o backup {arquivo}: {e}")
+    return apagados
+
+
+def restaurar_backup(arquivo, paginas_por_passo=PAGINAS_POR_PASSO):
+    """
+    Restaura um backup sobre o banco atual.
+
+    O backup é verificado (PRAGMA integrity_check) antes de qualquer
+    alteração. Feche o sistema nos outros caixas antes de restaurar.
+
+    Args:
+        arquivo: Caminho do backup (.db ou .db.gz)
+        paginas_por_passo: Páginas copiadas por passo
+
+    Raises:
+        FileNotFoundError: Se o arquivo não existir
+        ValueError: Se o backup estiver corrompido
+    """
+    if not os.path.exists(arquivo):
+        raise FileNotFoundError(f"Backup não encontrado: {arquivo}")
+
+    temporario = None
+    if arquivo.endswith(".gz"):
+        descritor, temporario = tempfile.mkstemp(suffix=".db")
+        os.close(descritor)
+        with gzip.open(arquivo, "rb") as entrada, open(temporario, "wb") as saida:
+            shutil.copyfileobj(entrada, saida)
+        origem_caminho = temporario
+    else:
+        origem_caminho = arquivo
+
+    pool = obter_pool()
+    caminho_banco = pool.caminho
+    origem = None
+    try:
+        origem = sqlite3.connect(origem_caminho)
+        resultado = origem.execute("PRAGMA integrity_check").fetchone()[0]
+        if resultado != "ok":
+            raise ValueError(f"O backup está corrompido: {resultado}")
+
+        # Fecha as conexões do pool para que ninguém leia o banco pela metade
+        pool.fechar()
+
+        banco = sqlite3.connect(caminho_banco)
+        try:
+            origem.backup(banco, pages=paginas_por_passo)
+        finally:
+            banco.close()
+
+    finally:
+        if origem:
+            origem.close()
+        if temporario:
+            os.remove(temporario)
+        # Novo pool: as próximas conexões já enxergam o banco restaurado
+        configurar_banco(caminho_banco, pool.tamanho, pool.perfil)
+
+
+class BackupAgendado(threading.Thread):
+    """
+    Thread que faz backups automáticos durante o expediente.
+
+    A cada verificação, se o backup mais recente for mais antigo que o
+    intervalo, faz um novo backup (com pausas entre os passos) e apaga
+    os mais antigos.
+
+    Exemplo:
+        agendador = BackupAgendado()
+        agendador.start()
+        ...
+        agendador.parar()
+    """
+
+    def __init__(
+        self,
+        intervalo_horas=INTERVALO_BACKUP_HORAS,
+        manter=MANTER_BACKUPS,
+        compactar=True,
+        pasta=PASTA_BACKUPS
+    ):
+        super().__init__(name="BackupAgendado", daemon=True)
+        self.intervalo = intervalo_horas * 3600
+        self.manter = manter
+        self.compactar = compactar
+        self.pasta = pasta
+        self._parar = threading.Event()
+
+    def run(self):
+        # Espera um pouco para não competir com a abertura do sistema
+        if self._parar.wait(60):
+            return
+
+        while not self._parar.is_set():
+            try:
+                if self._backup_vencido():
+                    nome = f"{PREFIXO_BACKUP}{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
+                    fazer_backup(
+                        destino=os.path.join(self.pasta, nome),
+                        compactar=self.compactar
+                    )
+                    rotacionar_backups(self.pasta, self.manter)
+            except Exception as e:
+                print(f"Erro no backup automático: {e}")
+
+            # Verifica de novo em 10 minutos (ou sai se for parado)
+            self._parar.wait(600)
+
+    def parar(self):
+        """Interrompe o agendamento (um backup em andamento termina antes)."""
+        self._parar.set()
+
+    def _backup_vencido(self):
+        backups = listar_backups(self.pasta)
+        if not backups:
+            return True
+        return time.time() - os.path.getmtime(backups[0]) >= self.intervalo
@@ -1,6 +1,9 @@
 import sqlite3
 import os
 import sys
+import json
+import queue
+import threading
 
 def caminho_base():
     if getattr(sys, 'frozen', False):
@@ -8,10 +11,10 @@ def caminho_base():
     return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 def pasta_dados_usuario():
-    if os.name == "nt": 
+    if os.name == "nt":
         base = os.getenv("LOCALAPPDATA")
         return os.path.join(base, "EstoqueLoja")
-    else: 
+    else:
         base = os.path.expanduser("~/.local/share")
         return os.path.join(base, "estoque_loja")
 
@@ -21,40 +24,330 @@ os.makedirs(PASTA_DADOS, exist_ok=True)
 
 CAMINHO_BANCO = os.path.join(PASTA_DADOS, "estoque.db")
 CAMINHO_SCRIPT = os.path.join(BASE_DIR, "database", "init_db.sql")
+CAMINHO_CONFIGURACAO = os.path.join(PASTA_DADOS, "configuracao.json")
+
+# =========================
+# PERFIS DE DESEMPENHO DO SQLITE
+# =========================
+# Cada perfil é um conjunto de PRAGMAs aplicado a toda conexão aberta.
+# O perfil é escolhido por instalação (ver perfil_configurado()).
+#
+# - rapido:     WAL + synchronous=NORMAL. Leituras do dashboard não
+#               bloqueiam o caixa e o commit não espera o fsync do WAL.
+# - seguro:     WAL + synchronous=FULL. Cada commit vai para o disco
+#               antes de retornar (mais lento, nada se perde em queda de energia).
+# - compativel: Journal tradicional (DELETE). Para bancos em pasta de
+#               rede, onde o WAL não funciona.
+PERFIS_BANCO = {
+    "rapido": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,      # KiB (valor negativo) -> ~64 MB
+        "mmap_size": 268435456,    # 256 MB
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,      # ms
+    },
+    "seguro": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -16000,
+        "mmap_size": 0,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    "compativel": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "cache_size": -2000,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,
+    },
+}
+
+PERFIL_PADRAO = "rapido"
+
+# Quantidade de conexões mantidas abertas no pool.
+# Se mais conexões forem pedidas ao mesmo tempo, são criadas conexões
+# extras que são fechadas ao serem devolvidas (o pool nunca trava).
+TAMANHO_POOL = 4
+
+
+class ConexaoPool:
+    """
+    Conexão emprestada do pool.
+
+    Funciona exatamente como uma sqlite3.Connection (cursor, execute,
+    commit, rollback...), mas o close() devolve a conexão ao pool em
+    vez de fechá-la. Assim os DAOs continuam usando o padrão
+    conectar() / close() sem pagar o custo de abrir o banco a cada chamada.
+    """
+
+    def __init__(self, pool, conexao):
+        self._pool = pool
+        self._conexao = conexao
+
+    def __getattr__(self, nome):
+        conexao = self.__dict__.get("_conexao")
+        if conexao is None:
+            raise sqlite3.ProgrammingError("Conexão já devolvida ao pool.")
+        return getattr(conexao, nome)
+
+    def __enter__(self):
+        self._conexao.__enter__()
+        return self
+
+    def __exit__(self, tipo, valor, traceback):
+        return self._conexao.__exit__(tipo, valor, traceback)
+
+    def close(self):
+        """Devolve a conexão ao pool (pode ser chamado mais de uma vez)."""
+        conexao = self.__dict__.get("_conexao")
+        if conexao is None:
+            return
+        self._conexao = None
+        self._pool.devolver(conexao)
+
+    def __del__(self):
+        # Garante a devolução quando um DAO sai por exceção sem chamar close()
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class PoolConexoes:
+    """
+    Pool de conexões SQLite compartilhado entre as threads do sistema.
+
+    - Cada conexão emprestada é exclusiva de quem pegou até o close()
+    - As conexões são criadas com check_same_thread=False, então podem
+      ser usadas por qualquer thread (uma de cada vez)
+    - A verificação do esquema é feita uma única vez, na primeira conexão
+
+    Exemplo:
+        pool = PoolConexoes("/caminho/estoque.db")
+        conexao = pool.obter()
+        try:
+            conexao.execute("SELECT 1")
+        finally:
+            conexao.close()  # volta para o pool
+    """
+
+    def __init__(self, caminho, tamanho=TAMANHO_POOL, perfil=None):
+        self.caminho = caminho
+        self.tamanho = tamanho
+        self.perfil = perfil or perfil_configurado()
+        self._livres = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._lock_esquema = threading.Lock()
+        self._esquema_verificado = False
+        self._fechado = False
+
+    def obter(self):
+        """
+        Empresta uma conexão do pool.
+
+        Returns:
+            ConexaoPool: Conexão pronta para uso (devolva com close())
+        """
+        try:
+            conexao = self._livres.get_nowait()
+        except queue.Empty:
+            conexao = self._abrir_conexao()
+
+        return ConexaoPool(self, conexao)
+
+    def devolver(self, conexao):
+        """
+        Recebe de volta uma conexão emprestada.
+
+        Transações deixadas abertas são desfeitas para que o próximo
+        usuário da conexão comece de um estado limpo.
+        """
+        try:
+            if conexao.in_transaction:
+                conexao.rollback()
+        except sqlite3.Error:
+            self._descartar(conexao)
+            return
+
+        with self._lock:
+            manter = not self._fechado and self._livres.qsize() < self.tamanho
+
+        if manter:
+            self._livres.put(conexao)
+        else:
+            self._descartar(conexao)
+
+    def fechar(self):
+        """Fecha todas as conexões livres e impede que novas sejam guardadas."""
+        with self._lock:
+            self._fechado = True
+
+        while True:
+            try:
+                conexao = self._livres.get_nowait()
+            except queue.Empty:
+                break
+            self._descartar(conexao)
+
+    def _abrir_conexao(self):
+        conexao = sqlite3.connect(self.caminho, check_same_thread=False)
+        conexao.row_factory = sqlite3.Row
+
+        # Ativa chaves estrangeiras
+        conexao.execute("PRAGMA foreign_keys = ON;")
+
+        try:
+            aplicar_perfil(conexao, self.perfil)
+        except Exception:
+            conexao.close()
+            raise
+
+        if not self._esquema_verificado:
+            # As outras threads esperam aqui até o esquema estar pronto
+            with self._lock_esquema:
+                if not self._esquema_verificado:
+                    try:
+                        _garantir_esquema(conexao)
+                    except Exception:
+                        conexao.close()
+                        raise
+                    self._esquema_verificado = True
+
+        return conexao
+
+    def _descartar(self, conexao):
+        try:
+            conexao.close()
+        except sqlite3.Error:
+            pass
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def obter_pool():
+    """
+    Retorna o pool de conexões do processo, criando-o na primeira chamada.
+    """
+    global _pool
+
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = PoolConexoes(CAMINHO_BANCO)
+
+    return _pool
+
+
+def configurar_banco(caminho, tamanho=TAMANHO_POOL, perfil=None):
+    """
+    Troca o arquivo de banco usado pelo sistema.
+
+    Fecha o pool atual e cria um novo apontando para o caminho
+    informado. Útil para testes e scripts que usam um banco separado.
+
+    Args:
+        caminho: Caminho do arquivo .db
+        tamanho: Quantidade de conexões mantidas no pool
+        perfil: Nome do perfil de desempenho (None = perfil configurado)
+    """
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.fechar()
+        _pool = PoolConexoes(caminho, tamanho, perfil)
+
+
+def fechar_conexoes():
+    """Fecha as conexões guardadas no pool (ex: ao encerrar o sistema)."""
+    if _pool is not None:
+        _pool.fechar()
+
 
 def conectar():
     """
-    Conecta ao banco e garante que as tabelas existam.
+    Retorna uma conexão do pool.
+
+    A conexão já vem com row_factory = sqlite3.Row e chaves estrangeiras
+    ativadas. O close() devolve a conexão ao pool.
+    """
+    return obter_pool().obter()
+
+
+def perfil_configurado():
     """
-    conexao = sqlite3.connect(CAMINHO_BANCO)
-    conexao.row_factory = sqlite3.Row
-    
-    # Ativa chaves estrangeiras
-    conexao.execute("PRAGMA foreign_keys = ON;")
+    Retorna o nome do perfil de desempenho desta instalação.
 
-    # VERIFICAÇÃO REAL: A tabela clientes existe?
-    cursor = conexao.cursor()
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='clientes'")
-    tabela_existe = cursor.fetchone()
+    Ordem de prioridade:
+    1. Variável de ambiente PDV_PERFIL_BANCO
+    2. Chave "perfil_banco" do arquivo configuracao.json na pasta de dados
+    3. PERFIL_PADRAO
+
+    Exemplo de configuracao.json:
+        {"perfil_banco": "seguro"}
+    """
+    perfil = os.getenv("PDV_PERFIL_BANCO")
+
+    if not perfil and os.path.exists(CAMINHO_CONFIGURACAO):
+        try:
+            with open(CAMINHO_CONFIGURACAO, "r", encoding="utf-8") as arquivo:
+                perfil = json.load(arquivo).get("perfil_banco")
+        except (OSError, ValueError) as e:
+            print(f"Aviso: não foi possível ler {CAMINHO_CONFIGURACAO}: {e}")
+
+    if perfil not in PERFIS_BANCO:
+        if perfil:
+            print(f"Aviso: perfil de banco '{perfil}' desconhecido. Usando '{PERFIL_PADRAO}'.")
+        perfil = PERFIL_PADRAO
+
+    return perfil
+
+
+def aplicar_perfil(conexao, perfil):
+    """
+    Aplica os PRAGMAs de um perfil de desempenho na conexão.
+
+    Args:
+        conexao: Conexão SQLite
+        perfil: Nome do perfil (chave de PERFIS_BANCO)
+
+    Raises:
+        ValueError: Se o perfil não existir
+    """
+    if perfil not in PERFIS_BANCO:
+        raise ValueError(f"Perfil de banco desconhecido: {perfil}")
+
+    config = PERFIS_BANCO[perfil]
+
+    # busy_timeout primeiro: trocar o journal_mode pode precisar esperar outro processo
+    conexao.execute(f"PRAGMA busy_timeout = {int(config['busy_timeout'])}")
+    conexao.execute(f"PRAGMA journal_mode = {config['journal_mode']}")
+    conexao.execute(f"PRAGMA synchronous = {config['synchronous']}")
+    conexao.execute(f"PRAGMA cache_size = {int(config['cache_size'])}")
+    conexao.execute(f"PRAGMA mmap_size = {int(config['mmap_size'])}")
+    conexao.execute(f"PRAGMA temp_store = {config['temp_store']}")
+
+
+def _garantir_esquema(conexao):
+    """
+    Garante que o esquema do banco esteja na versão atual.
+    Executada uma única vez por processo, na primeira conexão do pool.
+    """
+    inicializar_banco(conexao)
 
-    if not tabela_existe:
-        print("Tabela 'clientes' não encontrada. Inicializando banco...")
-        inicializar_banco(conexao)
-    
-    return conexao
 
 def inicializar_banco(conexao):
-    if not os.path.exists(CAMINHO_SCRIPT):
-        raise FileNotFoundError(f"Arquivo init_db.sql não encontrado em: {CAMINHO_SCRIPT}")
-
-    with open(CAMINHO_SCRIPT, "r", encoding="utf-8") as arquivo:
-        script_sql = arquivo.read()
-
-    try:
-        # O executescript pode rodar várias instruções de uma vez
-        conexao.executescript(script_sql)
-        conexao.commit()
-        print("Tabelas criadas e banco inicializado com sucesso!")
-    except sqlite3.Error as e:
-        print(f"Erro ao executar o script SQL: {e}")
-        raise e
\ No newline at end of file
+    """
+    Cria as tabelas ou aplica as migrações pendentes.
+
+    Em um banco já atualizado custa apenas a leitura do PRAGMA user_version.
+    """
+    # Import local: migracoes.py importa este módulo
+    from database.migracoes import aplicar_migracoes
+
+    aplicar_migracoes(conexao)
@@ -111,9 +111,6 @@ CREATE TABLE IF NOT EXISTS movimentacoes_estoque(
 -- ÍNDICES DA TABELA movimentacoes_estoque
 -- =========================
 
-CREATE INDEX IF NOT EXISTS idx_mov_estoque_produto
-ON movimentacoes_estoque(produto_id);
-
 CREATE INDEX IF NOT EXISTS idx_mov_estoque_data
 ON movimentacoes_estoque(data);
 
@@ -0,0 +1,55 @@
+-- ============================================
+-- MIGRAÇÃO 2: ÍNDICE DE BUSCA DE PRODUTOS (FTS5)
+-- ============================================
+-- Índice de texto completo sobre as colunas pesquisadas na tela de
+-- produtos. Substitui o LIKE '%termo%', que lia a tabela inteira.
+--
+-- - unicode61 remove_diacritics 2: ignora acentos e maiúsculas
+--   ("calcao" encontra "Calção")
+-- - prefix: acelera buscas pelo início das palavras ("cami*")
+-- - content='produtos': o índice não duplica os dados da tabela
+
+CREATE VIRTUAL TABLE IF NOT EXISTS produtos_busca USING fts5(
+    nome,
+    categoria,
+    codigo_barras,
+    tamanho,
+    cor,
+    content='produtos',
+    content_rowid='id',
+    tokenize="unicode61 remove_diacritics 2",
+    prefix='1 2 3'
+);
+
+-- =========================
+-- GATILHOS DE SINCRONIZAÇÃO
+-- Mantêm o índice igual à tabela produtos
+-- =========================
+
+CREATE TRIGGER IF NOT EXISTS produtos_busca_inserir
+AFTER INSERT ON produtos
+BEGIN
+    INSERT INTO produtos_busca (rowid, nome, categoria, codigo_barras, tamanho, cor)
+    VALUES (new.id, new.nome, new.categoria, new.codigo_barras, new.tamanho, new.cor);
+END;
+
+CREATE TRIGGER IF NOT EXISTS produtos_busca_excluir
+AFTER DELETE ON produtos
+BEGIN
+    INSERT INTO produtos_busca (produtos_busca, rowid, nome, categoria, codigo_barras, tamanho, cor)
+    VALUES ('delete', old.id, old.nome, old.categoria, old.codigo_barras, old.tamanho, old.cor);
+END;
+
+-- Só dispara quando uma coluna pesquisável muda
+-- (baixas de estoque não mexem no índice)
+CREATE TRIGGER IF NOT EXISTS produtos_busca_atualizar
+AFTER UPDATE OF nome, categoria, codigo_barras, tamanho, cor ON produtos
+BEGIN
+    INSERT INTO produtos_busca (produtos_busca, rowid, nome, categoria, codigo_barras, tamanho, cor)
+    VALUES ('delete', old.id, old.nome, old.categoria, old.codigo_barras, old.tamanho, old.cor);
+    INSERT INTO produtos_busca (rowid, nome, categoria, codigo_barras, tamanho, cor)
+    VALUES (new.id, new.nome, new.categoria, new.codigo_barras, new.tamanho, new.cor);
+END;
+
+-- Indexa os produtos já cadastrados
+INSERT INTO produtos_busca (produtos_busca) VALUES ('rebuild');
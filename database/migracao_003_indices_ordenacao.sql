@@ -0,0 +1,28 @@
+-- ============================================
+-- MIGRAÇÃO 3: ÍNDICES DE ORDENAÇÃO DE PRODUTOS
+-- ============================================
+-- Usados pela paginação por cursor (listar_produtos_pagina).
+-- Cada página começa com uma busca no índice a partir da última
+-- linha da página anterior, em vez de ler e descartar as anteriores.
+--
+-- Colunas que aceitam NULL são indexadas com COALESCE, a mesma
+-- expressão usada no ORDER BY da paginação.
+-- A coluna nome já tem o índice idx_produtos_nome.
+
+CREATE INDEX IF NOT EXISTS idx_produtos_ordem_categoria
+ON produtos(COALESCE(categoria, ''));
+
+CREATE INDEX IF NOT EXISTS idx_produtos_ordem_tamanho
+ON produtos(COALESCE(tamanho, ''));
+
+CREATE INDEX IF NOT EXISTS idx_produtos_ordem_cor
+ON produtos(COALESCE(cor, ''));
+
+CREATE INDEX IF NOT EXISTS idx_produtos_ordem_preco_custo
+ON produtos(COALESCE(preco_custo, 0));
+
+CREATE INDEX IF NOT EXISTS idx_produtos_ordem_preco_venda
+ON produtos(preco_venda);
+
+CREATE INDEX IF NOT EXISTS idx_produtos_ordem_estoque
+ON produtos(estoque);
@@ -0,0 +1,47 @@
+-- ============================================
+-- MIGRAÇÃO 4: RESUMO DIÁRIO DE VENDAS
+-- ============================================
+-- Uma linha por dia e forma de pagamento, com os totais das vendas
+-- não canceladas. O painel lê este resumo em vez de somar todo o
+-- histórico de vendas a cada abertura.
+--
+-- Mantido por registrar_venda e cancelar_venda, na mesma transação
+-- da venda. Pode ser refeito com reconstruir_resumo_vendas().
+--
+-- - valor_total: soma de vendas.total (já com desconto)
+-- - valor_desconto: soma dos descontos (valor bruto = total + desconto)
+-- - unidades: soma das quantidades dos itens
+-- - vendas_com_valor: vendas com total > 0 (divisor do ticket médio)
+
+CREATE TABLE IF NOT EXISTS resumo_vendas_diario (
+    dia TEXT NOT NULL,                           -- Data no formato YYYY-MM-DD
+    forma_pagamento TEXT NOT NULL,
+    quantidade_vendas INTEGER NOT NULL DEFAULT 0,
+    valor_total REAL NOT NULL DEFAULT 0,
+    valor_desconto REAL NOT NULL DEFAULT 0,
+    unidades INTEGER NOT NULL DEFAULT 0,
+    vendas_com_valor INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (dia, forma_pagamento)
+) WITHOUT ROWID;
+
+-- Resume as vendas já registradas
+INSERT INTO resumo_vendas_diario (
+    dia, forma_pagamento, quantidade_vendas, valor_total, valor_desconto, unidades,
+    vendas_com_valor
+)
+SELECT
+    date(v.data),
+    v.forma_pagamento,
+    COUNT(*),
+    SUM(v.total),
+    SUM(COALESCE(v.desconto, 0)),
+    SUM(COALESCE(u.unidades, 0)),
+    SUM(CASE WHEN v.total > 0 THEN 1 ELSE 0 END)
+FROM vendas v
+LEFT JOIN (
+    SELECT venda_id, SUM(quantidade) AS unidades
+    FROM itens_venda
+    GROUP BY venda_id
+) u ON u.venda_id = v.id
+WHERE v.cancelada = 0
+GROUP BY date(v.data), v.forma_pagamento;
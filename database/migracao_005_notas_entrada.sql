@@ -0,0 +1,31 @@
+-- ============================================
+-- MIGRAÇÃO 5: NOTAS DE ENTRADA
+-- ============================================
+-- Recebimento de mercadoria com várias linhas (uma entrega do
+-- fornecedor). O cabeçalho fica em notas_entrada; cada linha é uma
+-- movimentação de ENTRADA ligada à nota por nota_entrada_id.
+--
+-- Gravada por registrar_nota_entrada, em uma única transação: ou
+-- todas as linhas entram no estoque, ou nenhuma.
+
+CREATE TABLE IF NOT EXISTS notas_entrada (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    data TEXT NOT NULL,                          -- Data e hora do recebimento
+    numero TEXT,                                 -- Número da nota do fornecedor (opcional)
+    fornecedor TEXT,                             -- Nome do fornecedor (opcional)
+    observacao TEXT,
+    usuario_id INTEGER,                          -- Usuário que recebeu a mercadoria
+    total_itens INTEGER NOT NULL DEFAULT 0,      -- Quantidade de produtos diferentes
+    total_unidades INTEGER NOT NULL DEFAULT 0,   -- Soma das quantidades
+    FOREIGN KEY (usuario_id) REFERENCES usuarios(id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_notas_entrada_data
+ON notas_entrada(data);
+
+-- Movimentações avulsas continuam com nota_entrada_id NULL
+ALTER TABLE movimentacoes_estoque
+ADD COLUMN nota_entrada_id INTEGER REFERENCES notas_entrada(id);
+
+CREATE INDEX IF NOT EXISTS idx_mov_estoque_nota
+ON movimentacoes_estoque(nota_entrada_id);
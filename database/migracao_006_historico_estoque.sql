@@ -0,0 +1,116 @@
+-- ============================================
+-- MIGRAÇÃO 6: HISTÓRICO ÚNICO DE ESTOQUE
+-- ============================================
+-- Toda alteração de produtos.estoque passa a gerar uma linha em
+-- movimentacoes_estoque, na mesma transação da alteração, com a
+-- origem dela:
+--
+-- - MANUAL: entrada/saída pela tela de movimentação
+-- - NOTA_ENTRADA: linha de nota de entrada (origem_id = notas_entrada.id)
+-- - VENDA: baixa de uma venda (origem_id = vendas.id)
+-- - CANCELAMENTO_VENDA: devolução ao cancelar (origem_id = vendas.id)
+-- - CADASTRO: estoque informado ao cadastrar o produto
+-- - AJUSTE: estoque alterado na edição do produto
+-- - IMPORTACAO: estoque de produto novo na importação de CSV
+-- - SALDO_INICIAL: diferença encontrada por esta migração (abaixo)
+--
+-- Com isso, o estoque de um produto em qualquer data é a soma das
+-- linhas dele até a data: uma busca no índice (produto_id, data).
+-- As linhas nunca são alteradas nem apagadas (correções são novas
+-- linhas).
+
+ALTER TABLE movimentacoes_estoque
+ADD COLUMN origem_tipo TEXT NOT NULL DEFAULT 'MANUAL';
+
+ALTER TABLE movimentacoes_estoque
+ADD COLUMN origem_id INTEGER;
+
+UPDATE movimentacoes_estoque
+SET origem_tipo = 'NOTA_ENTRADA',
+    origem_id = nota_entrada_id
+WHERE nota_entrada_id IS NOT NULL;
+
+-- =========================
+-- Vendas e cancelamentos anteriores
+-- =========================
+
+INSERT INTO movimentacoes_estoque (
+    produto_id, tipo, quantidade, data, observacao, usuario_id, origem_tipo, origem_id
+)
+SELECT
+    i.produto_id, 'SAIDA', SUM(i.quantidade), v.data,
+    'Venda #' || v.id, v.usuario_id, 'VENDA', v.id
+FROM vendas v
+JOIN itens_venda i ON i.venda_id = v.id
+GROUP BY v.id, i.produto_id;
+
+-- A data do cancelamento não era guardada: usa a da venda
+INSERT INTO movimentacoes_estoque (
+    produto_id, tipo, quantidade, data, observacao, usuario_id, origem_tipo, origem_id
+)
+SELECT
+    i.produto_id, 'ENTRADA', SUM(i.quantidade), v.data,
+    'Cancelamento da venda #' || v.id, v.usuario_id, 'CANCELAMENTO_VENDA', v.id
+FROM vendas v
+JOIN itens_venda i ON i.venda_id = v.id
+WHERE v.cancelada = 1
+GROUP BY v.id, i.produto_id;
+
+-- =========================
+-- Saldo inicial
+-- =========================
+-- O estoque de cadastro e as edições manuais não geravam movimentação.
+-- A diferença entre o estoque atual e a soma do histórico entra como
+-- uma linha na data da primeira movimentação do produto (ou agora, se
+-- ele não tiver nenhuma), para que a soma do histórico bata com
+-- produtos.estoque.
+
+INSERT INTO movimentacoes_estoque (
+    produto_id, tipo, quantidade, data, observacao, origem_tipo
+)
+SELECT
+    id,
+    CASE WHEN diferenca > 0 THEN 'ENTRADA' ELSE 'SAIDA' END,
+    ABS(diferenca),
+    primeira_data,
+    'Saldo anterior ao histórico',
+    'SALDO_INICIAL'
+FROM (
+    SELECT
+        p.id,
+        p.estoque - COALESCE(SUM(
+            CASE m.tipo WHEN 'ENTRADA' THEN m.quantidade ELSE -m.quantidade END
+        ), 0) AS diferenca,
+        COALESCE(MIN(m.data), strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime')) AS primeira_data
+    FROM produtos p
+    LEFT JOIN movimentacoes_estoque m ON m.produto_id = p.id
+    GROUP BY p.id
+)
+WHERE diferenca <> 0;
+
+-- =========================
+-- Índices
+-- =========================
+
+-- Histórico de um produto e estoque em uma data: uma faixa do índice.
+-- Substitui o índice só por produto_id (prefixo deste).
+CREATE INDEX IF NOT EXISTS idx_mov_estoque_produto_data
+ON movimentacoes_estoque(produto_id, data);
+
+DROP INDEX IF EXISTS idx_mov_estoque_produto;
+
+-- =========================
+-- Somente inclusão
+-- =========================
+
+CREATE TRIGGER IF NOT EXISTS movimentacoes_estoque_sem_alteracao
+BEFORE UPDATE ON movimentacoes_estoque
+BEGIN
+    SELECT RAISE(ABORT, 'O histórico de estoque não pode ser alterado.');
+END;
+
+CREATE TRIGGER IF NOT EXISTS movimentacoes_estoque_sem_exclusao
+BEFORE DELETE ON movimentacoes_estoque
+BEGIN
+    SELECT RAISE(ABORT, 'O histórico de estoque não pode ser apagado.');
+END;
@@ -0,0 +1,210 @@
+"""
+Migrações incrementais do banco de dados.
+
+A versão do esquema fica gravada no próprio arquivo do banco
+(PRAGMA user_version). Cada migração tem um número de versão e só é
+executada se o banco estiver abaixo dela. Em um banco já atualizado,
+o custo é apenas a leitura de um PRAGMA.
+
+Para criar uma nova migração:
+1. Escreva uma função _migracao_NNN_descricao(conexao)
+2. Adicione (NNN, "descrição", funcao) no final de MIGRACOES
+3. Nunca altere uma migração que já foi distribuída
+"""
+
+import os
+import sqlite3
+
+from database.conexao import BASE_DIR, CAMINHO_SCRIPT
+
+
+# =========================
+# Funções auxiliares
+# =========================
+
+def executar_script(conexao, caminho):
+    """
+    Executa um arquivo .sql instrução por instrução.
+
+    Diferente do executescript(), não faz COMMIT automático, então o
+    script roda dentro da transação da migração.
+
+    Args:
+        conexao: Conexão SQLite (com transação aberta)
+        caminho: Caminho do arquivo .sql
+    """
+    if not os.path.exists(caminho):
+        raise FileNotFoundError(f"Arquivo SQL não encontrado em: {caminho}")
+
+    with open(caminho, "r", encoding="utf-8") as arquivo:
+        script_sql = arquivo.read()
+
+    instrucao = ""
+    for linha in script_sql.splitlines(keepends=True):
+        instrucao += linha
+        if sqlite3.complete_statement(instrucao):
+            # PRAGMA foreign_keys não tem efeito dentro de transação;
+            # as conexões do pool já o ativam ao conectar.
+            if not instrucao.strip().upper().startswith("PRAGMA FOREIGN_KEYS"):
+                conexao.execute(instrucao)
+            instrucao = ""
+
+    if instrucao.strip() and not instrucao.strip().startswith("--"):
+        raise sqlite3.OperationalError(f"Instrução SQL incompleta no fim de {caminho}")
+
+
+def tabela_existe(conexao, nome_tabela):
+    """Verifica se uma tabela existe no banco."""
+    cursor = conexao.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?",
+        (nome_tabela,)
+    )
+    return cursor.fetchone() is not None
+
+
+def coluna_existe(conexao, nome_tabela, nome_coluna):
+    """Verifica se uma coluna existe em uma tabela."""
+    colunas = conexao.execute(f"PRAGMA table_info({nome_tabela})").fetchall()
+    return any(coluna[1] == nome_coluna for coluna in colunas)
+
+
+def _caminho_sql(nome_arquivo):
+    """Caminho de um script de migração na pasta database."""
+    return os.path.join(BASE_DIR, "database", nome_arquivo)
+
+
+# =========================
+# Migrações
+# =========================
+
+def _migracao_001_esquema_inicial(conexao):
+    """
+    Cria o esquema do init_db.sql.
+
+    Também atualiza, no próprio arquivo, bancos criados antes das
+    versões 1.6 (clientes) e 2.0 (login), que não tinham as colunas
+    cliente_id e usuario_id.
+    """
+    colunas_legadas = [
+        ("vendas", "cliente_id", "INTEGER DEFAULT NULL REFERENCES clientes(id)"),
+        ("vendas", "usuario_id", "INTEGER DEFAULT NULL REFERENCES usuarios(id)"),
+        ("movimentacoes_estoque", "usuario_id", "INTEGER REFERENCES usuarios(id)"),
+    ]
+
+    for tabela, coluna, definicao in colunas_legadas:
+        if tabela_existe(conexao, tabela) and not coluna_existe(conexao, tabela, coluna):
+            conexao.execute(f"ALTER TABLE {tabela} ADD COLUMN {coluna} {definicao}")
+            print(f"✓ Coluna '{coluna}' adicionada à tabela '{tabela}'")
+
+    executar_script(conexao, CAMINHO_SCRIPT)
+
+
+def _migracao_002_busca_produtos(conexao):
+    """
+    Cria o índice FTS5 de busca de produtos.
+
+    Se o SQLite do computador não tiver FTS5, a migração é registrada
+    sem o índice e listar_produtos continua usando LIKE.
+    """
+    try:
+        conexao.execute("SAVEPOINT busca_produtos")
+        executar_script(conexao, _caminho_sql("migracao_002_busca_produtos.sql"))
+        conexao.execute("RELEASE busca_produtos")
+    except sqlite3.OperationalError as e:
+        if "fts5" not in str(e):
+            raise
+        conexao.execute("ROLLBACK TO busca_produtos")
+        conexao.execute("RELEASE busca_produtos")
+        print(f"⚠ FTS5 indisponível ({e}). A busca de produtos usará LIKE.")
+
+
+def _migracao_003_indices_ordenacao(conexao):
+    """Cria os índices usados na paginação por cursor de produtos."""
+    executar_script(conexao, _caminho_sql("migracao_003_indices_ordenacao.sql"))
+
+
+def _migracao_004_resumo_vendas(conexao):
+    """Cria e preenche o resumo diário de vendas usado pelo painel."""
+    executar_script(conexao, _caminho_sql("migracao_004_resumo_vendas.sql"))
+
+
+def _migracao_005_notas_entrada(conexao):
+    """Cria as notas de entrada e liga as movimentações a elas."""
+    executar_script(conexao, _caminho_sql("migracao_005_notas_entrada.sql"))
+
+
+def _migracao_006_historico_estoque(conexao):
+    """Registra a origem das movimentações e completa o histórico de estoque."""
+    executar_script(conexao, _caminho_sql("migracao_006_historico_estoque.sql"))
+
+
+# Lista ordenada de migrações: (versão, descrição, função)
+MIGRACOES = [
+    (1, "Esquema inicial", _migracao_001_esquema_inicial),
+    (2, "Índice de busca de produtos (FTS5)", _migracao_002_busca_produtos),
+    (3, "Índices de ordenação de produtos", _migracao_003_indices_ordenacao),
+    (4, "Resumo diário de vendas", _migracao_004_resumo_vendas),
+    (5, "Notas de entrada", _migracao_005_notas_entrada),
+    (6, "Histórico único de estoque", _migracao_006_historico_estoque),
+]
+
+VERSAO_ESQUEMA = MIGRACOES[-1][0]
+
+
+# =========================
+# Execução
+# =========================
+
+def versao_banco(conexao):
+    """Retorna a versão do esquema gravada no banco (PRAGMA user_version)."""
+    return conexao.execute("PRAGMA user_version").fetchone()[0]
+
+
+def aplicar_migracoes(conexao):
+    """
+    Aplica as migrações pendentes, cada uma em sua própria transação.
+
+    Se uma migração falhar, ela é desfeita por completo e o banco
+    permanece na última versão aplicada com sucesso.
+
+    Args:
+        conexao: Conexão SQLite
+
+    Returns:
+        int: Versão do esquema após as migrações
+
+    Raises:
+        sqlite3.Error: Se alguma migração falhar
+    """
+    versao_atual = versao_banco(conexao)
+
+    # Caminho rápido: banco já atualizado
+    if versao_atual >= VERSAO_ESQUEMA:
+        return versao_atual
+
+    for versao, descricao, migracao in MIGRACOES:
+        if versao <= versao_atual:
+            continue
+
+        # BEGIN IMMEDIATE impede que dois processos migrem ao mesmo tempo
+        conexao.execute("BEGIN IMMEDIATE")
+        try:
+            # Outro processo pode ter aplicado esta versão enquanto esperávamos
+            if versao_banco(conexao) >= versao:
+                conexao.rollback()
+                versao_atual = versao_banco(conexao)
+                continue
+
+            migracao(conexao)
+            conexao.execute(f"PRAGMA user_version = {int(versao)}")
+            conexao.commit()
+
+        except Exception as e:
+            conexao.rollback()
+            print(f"Erro na migração {versao} ({descricao}): {e}")
+            raise e
+
+        versao_atual = versao
+        print(f"✓ Banco atualizado para a versão {versao}: {descricao}")
+
+    return versao_atual
@@ -0,0 +1,80 @@
+"""
+Script para exportar dados do sistema (ex.: para a contabilidade).
+
+Como usar:
+    python exportar_dados.py vendas --inicio 2025-01-01 --fim 2025-12-31
+    python exportar_dados.py movimentacoes --inicio 2025-01-01 --formato jsonl
+    python exportar_dados.py produtos --destino produtos.csv
+    python exportar_dados.py todas --inicio 2025-01-01 --fim 2025-12-31 --gzip --pasta exportacao
+
+Exportações: produtos, clientes, vendas (uma linha por item vendido)
+e movimentacoes. O período vale para vendas e movimentações; produtos
+e clientes saem completos. Os CSVs usam ponto e vírgula como separador.
+"""
+
+import argparse
+import os
+import sys
+
+from dao.exportacao_dao import exportar_dados, CONSULTAS_EXPORTACAO, FORMATOS
+
+
+def _mostrar_progresso(linhas):
+    print(f"\r   Linhas exportadas: {linhas}", end="", flush=True)
+
+
+def _nome_arquivo(tabela, args):
+    partes = [tabela]
+    if CONSULTAS_EXPORTACAO[tabela]["coluna_data"]:
+        partes += [data for data in (args.inicio, args.fim) if data]
+
+    nome = "_".join(partes) + "." + (args.formato or "csv")
+    return nome + ".gz" if args.gzip else nome
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta dados para CSV ou JSONL.")
+    parser.add_argument("tabela", choices=list(CONSULTAS_EXPORTACAO) + ["todas"])
+    parser.add_argument("--inicio", help="Data inicial (YYYY-MM-DD)")
+    parser.add_argument("--fim", help="Data final, inclusive (YYYY-MM-DD)")
+    parser.add_argument("--formato", choices=FORMATOS, help="Padrão: extensão do --destino, ou csv")
+    parser.add_argument("--gzip", action="store_true", help="Compacta os arquivos (.gz)")
+    parser.add_argument("--destino", help="Arquivo de saída (apenas para uma tabela)")
+    parser.add_argument("--pasta", default=".", help="Pasta dos arquivos gerados")
+    args = parser.parse_args()
+
+    tabelas = list(CONSULTAS_EXPORTACAO) if args.tabela == "todas" else [args.tabela]
+
+    if args.destino and len(tabelas) > 1:
+        print("❌ --destino só pode ser usado com uma tabela; use --pasta.")
+        return False
+
+    os.makedirs(args.pasta, exist_ok=True)
+
+    for tabela in tabelas:
+        destino = args.destino or os.path.join(args.pasta, _nome_arquivo(tabela, args))
+        print(f"📤 Exportando {tabela} para {destino}...")
+
+        try:
+            linhas = exportar_dados(
+                tabela,
+                destino,
+                formato=args.formato,
+                data_inicial=args.inicio,
+                data_final=args.fim,
+                compactar=args.gzip or None,
+                ao_progresso=_mostrar_progresso
+            )
+        except Exception as e:
+            print()
+            print(f"❌ Erro ao exportar {tabela}: {e}")
+            return False
+
+        print()
+        print(f"✓ {linhas} linha(s) exportada(s)")
+
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,77 @@
+"""
+Script para importar produtos de um CSV (catálogo de fornecedor).
+
+Produtos com código de barras já cadastrado são atualizados (nome,
+categoria, tamanho, cor e preços); os demais são cadastrados. Linhas
+com erro vão para <arquivo>.erros.csv e não interrompem a importação.
+
+Como usar:
+    python importar_produtos.py catalogo.csv
+    python importar_produtos.py catalogo.csv --mapa codigo_barras=EAN --mapa nome=Descricao
+    python importar_produtos.py catalogo.csv --delimitador "," --lote 1000
+
+Campos: codigo_barras, nome e preco_venda (obrigatórios), categoria,
+tamanho, cor, preco_custo e estoque (só para produtos novos).
+Os números podem estar no formato brasileiro (1.250,99).
+"""
+
+import argparse
+import sys
+
+from dao.importacao_produtos import importar_produtos_csv, TAMANHO_LOTE
+
+
+def _mostrar_progresso(lidas, importadas, rejeitadas):
+    print(f"\r   Linhas lidas: {lidas}  importadas: {importadas}  rejeitadas: {rejeitadas}", end="", flush=True)
+
+
+def _ler_mapeamento(pares):
+    mapeamento = {}
+    for par in pares:
+        campo, separador, coluna = par.partition("=")
+        if not separador or not campo.strip() or not coluna.strip():
+            raise ValueError(f"Mapeamento inválido: '{par}' (use campo=coluna)")
+        mapeamento[campo.strip()] = coluna.strip()
+    return mapeamento
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importa produtos de um arquivo CSV.")
+    parser.add_argument("arquivo", help="Arquivo CSV com cabeçalho")
+    parser.add_argument("--mapa", action="append", default=[], metavar="CAMPO=COLUNA",
+                        help="Coluna do CSV para um campo do produto (pode repetir)")
+    parser.add_argument("--delimitador", help="Separador das colunas (padrão: detecta)")
+    parser.add_argument("--codificacao", default="utf-8-sig", help="Codificação do arquivo (ex.: latin-1)")
+    parser.add_argument("--lote", type=int, default=TAMANHO_LOTE, help="Linhas gravadas por commit")
+    parser.add_argument("--erros", help="Arquivo para as linhas rejeitadas")
+    args = parser.parse_args()
+
+    print(f"📥 Importando produtos de {args.arquivo}...")
+
+    try:
+        resultado = importar_produtos_csv(
+            args.arquivo,
+            mapeamento=_ler_mapeamento(args.mapa),
+            delimitador=args.delimitador,
+            codificacao=args.codificacao,
+            tamanho_lote=args.lote,
+            arquivo_erros=args.erros,
+            ao_progresso=_mostrar_progresso
+        )
+    except Exception as e:
+        print()
+        print(f"❌ Erro na importação: {e}")
+        return False
+
+    print()
+    print(f"✓ {resultado['inseridas']} produto(s) cadastrado(s), {resultado['atualizadas']} atualizado(s)")
+    print(f"✓ {resultado['linhas_por_segundo']:.0f} linhas/s ({resultado['segundos']:.2f} s)")
+
+    if resultado["rejeitadas"]:
+        print(f"⚠ {resultado['rejeitadas']} linha(s) rejeitada(s): veja {resultado['arquivo_erros']}")
+
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -1,14 +1,33 @@
-from telas.tela_login import TelaLogin
-from telas.tela_principal import TelaPrincipal
+# Primeiro import: marca o início da medição de abertura (PDV_PERFIL_INICIO)
+from utils import perfil_inicializacao as perfil
+
+with perfil.medir("import tkinter"):
+    import tkinter
+
+with perfil.medir("import banco de dados"):
+    from database.conexao import conectar
+
+with perfil.medir("import views.tela_login"):
+    from views.tela_login import TelaLogin
 
 if __name__ == "__main__":
+    # Abre o banco (e aplica migrações pendentes) antes da tela de login
+    with perfil.medir("inicialização do banco"):
+        conectar().close()
+
     # Abre a tela de login
-    tela_login = TelaLogin()
+    with perfil.medir("criação da TelaLogin"):
+        tela_login = TelaLogin()
+
+    # Primeira pintura: o Tk só fica ocioso depois de desenhar a janela
+    tela_login.after_idle(lambda: (perfil.marcar("primeira pintura da TelaLogin"), perfil.finalizar()))
     tela_login.mainloop()
     
     # Se o login foi bem-sucedido, abre a tela principal
     usuario_autenticado = tela_login.get_usuario_autenticado()
     
     if usuario_autenticado:
+        from views.tela_principal import TelaPrincipal
+
         app = TelaPrincipal(usuario_logado=usuario_autenticado)
         app.mainloop()
@@ -7,11 +7,16 @@ from .produto import Produto
 from .cliente import Cliente
 from .venda import Venda, ItemVenda
 from .usuario import Usuario
+from .carrinho import Carrinho
+from .nota_entrada import NotaEntrada, ItemNotaEntrada
 
 __all__ = [
     'Produto',
     'Cliente',
     'Venda',
     'ItemVenda',
-    'Usuario'
+    'Usuario',
+    'Carrinho',
+    'NotaEntrada',
+    'ItemNotaEntrada'
 ]
\ No newline at end of file
@@ -0,0 +1,211 @@
+from .venda import Venda, ItemVenda
+
+
+class Carrinho:
+    """
+    Carrinho de compras do PDV.
+
+    Os itens ficam em um dicionário pelo id do produto, e subtotal e
+    quantidade de unidades são atualizados a cada mudança: adicionar o
+    200º produto custa o mesmo que adicionar o primeiro, sem percorrer
+    o carrinho nem o catálogo.
+
+    A tela se inscreve com ao_mudar() e recebe cada mudança:
+        ("adicionado", item), ("alterado", item), ("removido", item),
+        ("limpo", None) e ("desconto", None)
+
+    Atributos:
+        subtotal: Soma dos subtotais dos itens
+        unidades: Soma das quantidades dos itens
+        desconto: Desconto informado (nunca negativo)
+    """
+
+    def __init__(self):
+        self._itens = {}      # produto_id -> ItemVenda (na ordem de inclusão)
+        self._estoques = {}   # produto_id -> estoque disponível (ver atualizar_estoques)
+        self._ouvintes = []
+
+        self.subtotal = 0.0
+        self.unidades = 0
+        self.desconto = 0.0
+
+    # =========================
+    # Consulta
+    # =========================
+    @property
+    def total(self):
+        """Subtotal menos o desconto (negativo se o desconto for maior)."""
+        return round(self.subtotal - self.desconto, 2)
+
+    def item(self, produto_id):
+        """ItemVenda do produto, ou None se ele não estiver no carrinho."""
+        return self._itens.get(produto_id)
+
+    def itens(self):
+        """Lista dos itens, na ordem em que entraram no carrinho."""
+        return list(self._itens.values())
+
+    def __len__(self):
+        return len(self._itens)
+
+    def __iter__(self):
+        return iter(self._itens.values())
+
+    def __contains__(self, produto_id):
+        return produto_id in self._itens
+
+    # =========================
+    # Alteração
+    # =========================
+    def adicionar(self, produto, quantidade=1):
+        """
+        Adiciona um produto (ou soma à quantidade, se já estiver no carrinho).
+
+        Args:
+            produto: Produto (usa id, nome, tamanho, cor, preco_venda e estoque)
+            quantidade: Unidades a adicionar
+
+        Returns:
+            ItemVenda: O item do produto no carrinho
+
+        Raises:
+            ValueError: Se não houver estoque para a nova quantidade
+        """
+        item = self._itens.get(produto.id)
+        nova_quantidade = (item.quantidade if item else 0) + quantidade
+
+        if nova_quantidade > produto.estoque:
+            raise ValueError(f"Não há estoque suficiente. Disponível: {produto.estoque}")
+
+        self._estoques[produto.id] = produto.estoque
+
+        if item:
+            self._mudar_quantidade(item, nova_quantidade)
+            return item
+
+        item = ItemVenda(
+            produto_id=produto.id,
+            quantidade=quantidade,
+            preco_unitario=produto.preco_venda,
+            produto_nome=f"{produto.nome} ({produto.tamanho or ''} {produto.cor or ''})"
+        )
+        item.calcular_subtotal()
+
+        self._itens[produto.id] = item
+        self.subtotal = round(self.subtotal + item.subtotal, 2)
+        self.unidades += item.quantidade
+        self._avisar("adicionado", item)
+        return item
+
+    def alterar_quantidade(self, produto_id, quantidade):
+        """
+        Define a quantidade de um item.
+
+        Raises:
+            ValueError: Se o item não estiver no carrinho, se a quantidade
+                        for menor que 1 ou maior que o estoque disponível
+        """
+        item = self._itens.get(produto_id)
+        if item is None:
+            raise ValueError("Produto não está no carrinho.")
+
+        if quantidade < 1:
+            raise ValueError("A quantidade deve ser maior que zero.")
+
+        estoque = self._estoques[produto_id]
+        if quantidade > estoque:
+            raise ValueError(f"Não há mais estoque. Disponível: {estoque}")
+
+        self._mudar_quantidade(item, quantidade)
+        return item
+
+    def atualizar_estoques(self, estoques):
+        """
+        Atualiza o estoque disponível dos itens do carrinho.
+
+        Chamada quando o estoque muda por fora (nota de entrada, venda em
+        outro caixa...), para que alterar_quantidade use o mesmo limite
+        que adicionar. Produtos fora do carrinho são ignorados.
+
+        Args:
+            estoques: dict {produto_id: estoque atual}
+        """
+        for produto_id, estoque in estoques.items():
+            if produto_id in self._estoques:
+                self._estoques[produto_id] = estoque
+
+    def remover(self, produto_id):
+        """Remove um item do carrinho (se estiver nele)."""
+        item = self._itens.pop(produto_id, None)
+        if item is None:
+            return
+
+        self._estoques.pop(produto_id, None)
+        self.subtotal = round(self.subtotal - item.subtotal, 2)
+        self.unidades -= item.quantidade
+        self._avisar("removido", item)
+
+    def definir_desconto(self, valor):
+        """Define o desconto; valores negativos contam como zero."""
+        self.desconto = max(float(valor or 0), 0.0)
+        self._avisar("desconto", None)
+
+    def limpar(self):
+        """Esvazia o carrinho e zera o desconto."""
+        self._itens = {}
+        self._estoques = {}
+        self.subtotal = 0.0
+        self.unidades = 0
+        self.desconto = 0.0
+        self._avisar("limpo", None)
+
+    def criar_venda(self, forma_pagamento, cliente_id=None):
+        """
+        Monta a Venda com os itens, o desconto e o total do carrinho.
+
+        Os itens da venda são cópias: mudar o carrinho depois (ex.: com a
+        venda ainda sendo gravada) não altera a venda já montada.
+        """
+        return Venda(
+            total=self.total,
+            desconto=self.desconto,
+            forma_pagamento=forma_pagamento,
+            cliente_id=cliente_id,
+            itens=[
+                ItemVenda(
+                    produto_id=item.produto_id,
+                    quantidade=item.quantidade,
+                    preco_unitario=item.preco_unitario,
+                    subtotal=item.subtotal,
+                    produto_nome=item.produto_nome
+                )
+                for item in self.itens()
+            ]
+        )
+
+    # =========================
+    # Avisos para a tela
+    # =========================
+    def ao_mudar(self, funcao):
+        """Inscreve funcao(evento, item), chamada a cada mudança no carrinho."""
+        self._ouvintes.append(funcao)
+
+    def _mudar_quantidade(self, item, quantidade):
+        subtotal_anterior = item.subtotal
+        self.unidades += quantidade - item.quantidade
+
+        item.quantidade = quantidade
+        item.calcular_subtotal()
+
+        self.subtotal = round(self.subtotal + item.subtotal - subtotal_anterior, 2)
+        self._avisar("alterado", item)
+
+    def _avisar(self, evento, item):
+        for funcao in self._ouvintes:
+            funcao(evento, item)
+
+    def __repr__(self):
+        return (
+            f"Carrinho(itens={len(self._itens)}, unidades={self.unidades}, "
+            f"total=R$ {self.total:.2f})"
+        )
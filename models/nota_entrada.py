@@ -0,0 +1,59 @@
+class NotaEntrada:
+    """
+    Representa um recebimento de mercadoria (nota de entrada).
+
+    Atributos:
+        id: Identificador único da nota
+        data: Data e hora do recebimento (formato: "YYYY-MM-DD HH:MM:SS")
+        numero: Número da nota do fornecedor (opcional)
+        fornecedor: Nome do fornecedor (opcional)
+        observacao: Observações opcionais
+        usuario_id: ID do usuário que recebeu a mercadoria
+        itens: Lista de ItemNotaEntrada
+    """
+    def __init__(
+        self,
+        id=None,
+        data=None,
+        numero=None,
+        fornecedor=None,
+        observacao=None,
+        usuario_id=None,
+        itens=None
+    ):
+        self.id = id
+        self.data = data
+        self.numero = numero
+        self.fornecedor = fornecedor
+        self.observacao = observacao
+        self.usuario_id = usuario_id
+        self.itens = itens or []  # Lista de ItemNotaEntrada
+
+    @property
+    def total_unidades(self):
+        """Soma das quantidades de todos os itens."""
+        return sum(item.quantidade for item in self.itens)
+
+    def __repr__(self):
+        return (
+            f"NotaEntrada(id={self.id}, numero='{self.numero}', "
+            f"fornecedor='{self.fornecedor}', itens={len(self.itens)})"
+        )
+
+
+class ItemNotaEntrada:
+    """
+    Representa uma linha de uma nota de entrada.
+
+    Atributos:
+        produto_id: ID do produto recebido
+        quantidade: Quantidade recebida
+        produto_nome: Nome do produto (para exibição, não salvo no banco)
+    """
+    def __init__(self, produto_id=None, quantidade=1, produto_nome=None):
+        self.produto_id = produto_id
+        self.quantidade = quantidade
+        self.produto_nome = produto_nome
+
+    def __repr__(self):
+        return f"ItemNotaEntrada(produto_id={self.produto_id}, quantidade={self.quantidade})"
@@ -0,0 +1,31 @@
+"""
+Script para refazer o resumo diário de vendas (tabela resumo_vendas_diario).
+
+O resumo é criado pela migração 4 e mantido pelo sistema a cada venda
+e cancelamento. Use este script se as vendas tiverem sido alteradas
+por fora do sistema e os totais do painel não baterem.
+
+Como usar:
+    python reconstruir_resumo_vendas.py
+"""
+
+import sys
+
+from dao.vendas_dao import reconstruir_resumo_vendas
+
+
+def main():
+    print("📊 Reconstruindo o resumo diário de vendas...")
+
+    try:
+        linhas = reconstruir_resumo_vendas()
+    except Exception as e:
+        print(f"❌ Erro ao reconstruir o resumo: {e}")
+        return False
+
+    print(f"✓ Resumo reconstruído: {linhas} linha(s) (dia e forma de pagamento)")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
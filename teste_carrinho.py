@@ -0,0 +1,147 @@
+"""
+Script de teste para o carrinho do PDV (models/carrinho.py).
+Não usa o banco de dados.
+
+Como usar:
+1. Execute: python teste_carrinho.py
+2. Acompanhe os testes no terminal
+"""
+
+import sys
+import time
+
+from models import Produto, Carrinho
+
+
+def criar_produto(produto_id, preco=10.0, estoque=5):
+    return Produto(id=produto_id, nome=f"Produto {produto_id}", preco_venda=preco, estoque=estoque)
+
+
+def testar_carrinho():
+    print("=" * 60)
+    print("🧪 TESTANDO CARRINHO DO PDV")
+    print("=" * 60)
+
+    carrinho = Carrinho()
+    eventos = []
+    carrinho.ao_mudar(lambda evento, item: eventos.append((evento, item.produto_id if item else None)))
+
+    # ==========================================
+    # TESTE 1: Adicionar e somar quantidade
+    # ==========================================
+    print("\n🛒 TESTE 1: Adicionando produtos...")
+    camiseta = criar_produto(1, preco=39.90, estoque=2)
+    calca = criar_produto(2, preco=89.90)
+
+    carrinho.adicionar(camiseta)
+    carrinho.adicionar(calca)
+    carrinho.adicionar(camiseta)
+
+    assert len(carrinho) == 2
+    assert carrinho.item(1).quantidade == 2
+    assert carrinho.subtotal == 169.70, carrinho.subtotal
+    assert carrinho.unidades == 3
+    assert eventos == [("adicionado", 1), ("adicionado", 2), ("alterado", 1)], eventos
+    print(f"✅ {carrinho}")
+
+    # ==========================================
+    # TESTE 2: Estoque
+    # ==========================================
+    print("\n📦 TESTE 2: Respeitando o estoque...")
+    try:
+        carrinho.adicionar(camiseta)
+        print("❌ Deveria recusar: só há 2 camisetas")
+        return False
+    except ValueError as e:
+        print(f"✅ Recusado: {e}")
+
+    try:
+        carrinho.alterar_quantidade(2, 6)
+        print("❌ Deveria recusar: só há 5 calças")
+        return False
+    except ValueError as e:
+        print(f"✅ Recusado: {e}")
+
+    carrinho.alterar_quantidade(2, 5)
+    assert carrinho.subtotal == 529.30, carrinho.subtotal
+    assert carrinho.unidades == 7
+
+    # Estoque alterado por fora: entrada de mercadoria e venda em outro caixa
+    carrinho.atualizar_estoques({2: 8, 99: 1})
+    carrinho.alterar_quantidade(2, 8)
+    carrinho.atualizar_estoques({2: 5})
+    try:
+        carrinho.alterar_quantidade(2, 6)
+        print("❌ Deveria recusar: o estoque baixou para 5 calças")
+        return False
+    except ValueError as e:
+        print(f"✅ Novo estoque respeitado: {e}")
+    carrinho.alterar_quantidade(2, 5)
+    assert 99 not in carrinho
+    assert carrinho.subtotal == 529.30, carrinho.subtotal
+
+    # ==========================================
+    # TESTE 3: Desconto, remoção e venda
+    # ==========================================
+    print("\n💰 TESTE 3: Desconto, remoção e venda...")
+    carrinho.definir_desconto(29.30)
+    assert carrinho.total == 500.00, carrinho.total
+
+    carrinho.definir_desconto(-5)
+    assert carrinho.desconto == 0
+
+    carrinho.remover(1)
+    assert 1 not in carrinho
+    assert carrinho.subtotal == 449.50, carrinho.subtotal
+    assert carrinho.unidades == 5
+
+    venda = carrinho.criar_venda("PIX", cliente_id=7)
+    assert venda.total == 449.50 and venda.forma_pagamento == "PIX" and venda.cliente_id == 7
+    assert [item.produto_id for item in venda.itens] == [2]
+
+    # Mudanças no carrinho depois de montar a venda não a alteram
+    carrinho.alterar_quantidade(2, 4)
+    assert venda.itens[0].quantidade == 5 and venda.itens[0].subtotal == 449.50
+
+    carrinho.limpar()
+    assert not carrinho and carrinho.subtotal == 0 and carrinho.unidades == 0
+    assert venda.itens[0].quantidade == 5  # a venda não é afetada pela limpeza
+    print("✅ Totais corretos em todas as etapas")
+
+    # ==========================================
+    # TESTE 4: Custo de um item a mais
+    # ==========================================
+    print("\n⏱️  TESTE 4: Carrinho cheio custa o mesmo que carrinho vazio...")
+    produtos = [criar_produto(i, estoque=10_000) for i in range(1, 2001)]
+
+    def medir(quantidade_inicial, repeticoes=2000):
+        carrinho = Carrinho()
+        carrinho.ao_mudar(lambda evento, item: None)
+        for produto in produtos[:quantidade_inicial]:
+            carrinho.adicionar(produto)
+
+        alvo = produtos[quantidade_inicial]
+        carrinho.adicionar(alvo)
+        inicio = time.perf_counter()
+        for _ in range(repeticoes):
+            carrinho.adicionar(alvo)
+        return (time.perf_counter() - inicio) / repeticoes * 1e6
+
+    tempo_vazio = medir(0)
+    tempo_cheio = medir(1999)
+    print(f"   Carrinho com 1 item:     {tempo_vazio:.2f} µs por leitura")
+    print(f"   Carrinho com 2000 itens: {tempo_cheio:.2f} µs por leitura")
+
+    if tempo_cheio > tempo_vazio * 5:
+        print("❌ O custo cresce com o tamanho do carrinho")
+        return False
+    print("✅ Custo constante")
+
+    print("\n" + "=" * 60)
+    print("✅ TODOS OS TESTES DO CARRINHO PASSARAM!")
+    print("=" * 60)
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if testar_carrinho() else 1)
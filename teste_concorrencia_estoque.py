@@ -0,0 +1,222 @@
+"""
+Teste de concorrência da saída de estoque (registrar_saida).
+
+Vários processos, como vários caixas abertos no mesmo banco, retiram
+o mesmo produto ao mesmo tempo até o estoque acabar. O teste confere
+que o estoque nunca fica negativo e que cada unidade retirada tem a
+sua movimentação de SAIDA. Depois, todos cancelam a mesma venda ao
+mesmo tempo: só um cancelamento pode devolver o estoque.
+
+Como usar:
+    python teste_concorrencia_estoque.py
+
+O teste usa um banco temporário: o banco da loja não é alterado.
+"""
+
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from database.conexao import configurar_banco, conectar, fechar_conexoes
+from dao.estoque_dao import registrar_saida
+from dao.vendas_dao import registrar_venda, cancelar_venda
+from models.venda import Venda, ItemVenda
+
+
+PROCESSOS = 6
+TENTATIVAS_POR_PROCESSO = 60
+ESTOQUE_INICIAL = 150
+# Pedidos de 1 e 2 unidades: o último pedido pode não caber no que sobrou
+QUANTIDADES = (1, 2)
+
+
+def _caixa(caminho, largada, resultados):
+    """Processo filho: tenta retirar até acabarem as tentativas."""
+    configurar_banco(caminho)
+    largada.wait()
+
+    retiradas = 0
+    recusadas = 0
+    erros = []
+    for i in range(TENTATIVAS_POR_PROCESSO):
+        quantidade = QUANTIDADES[i % len(QUANTIDADES)]
+        try:
+            registrar_saida(1, quantidade, "Teste de concorrência")
+            retiradas += quantidade
+        except ValueError:
+            recusadas += 1
+        except Exception as e:  # ex.: database is locked
+            erros.append(str(e))
+
+    fechar_conexoes()
+    resultados.put((retiradas, recusadas, erros))
+
+
+def _cancelador(caminho, venda_id, largada, resultados):
+    """Processo filho: tenta cancelar a venda uma vez."""
+    configurar_banco(caminho)
+    largada.wait()
+
+    try:
+        cancelar_venda(venda_id)
+        resultado = "cancelou"
+    except ValueError:
+        resultado = "recusado"
+    except Exception as e:
+        resultado = str(e)
+
+    fechar_conexoes()
+    resultados.put(resultado)
+
+
+def _disparar(contexto, alvo, argumentos):
+    """Inicia um processo por caixa e solta todos ao mesmo tempo."""
+    largada = contexto.Event()
+    resultados = contexto.Queue()
+    processos = [
+        contexto.Process(target=alvo, args=argumentos + (largada, resultados))
+        for _ in range(PROCESSOS)
+    ]
+    for processo in processos:
+        processo.start()
+
+    # Espera todos importarem o sistema antes de soltar a largada
+    time.sleep(1)
+    inicio = time.perf_counter()
+    largada.set()
+
+    respostas = [resultados.get(timeout=120) for _ in processos]
+    for processo in processos:
+        processo.join()
+    return respostas, time.perf_counter() - inicio
+
+
+def testar_concorrencia_estoque():
+    print("=" * 60)
+    print("🧪 TESTANDO SAÍDAS DE ESTOQUE CONCORRENTES")
+    print("=" * 60)
+
+    pasta = tempfile.mkdtemp(prefix="pdv_concorrencia_")
+    caminho = os.path.join(pasta, "concorrencia.db")
+    try:
+        configurar_banco(caminho, tamanho=1)
+        conexao = conectar()
+        conexao.execute(
+            "INSERT INTO produtos (id, codigo_barras, nome, preco_venda, estoque) VALUES (1, '7890001', 'Camiseta', 50, ?)",
+            (ESTOQUE_INICIAL,)
+        )
+        conexao.commit()
+        conexao.close()
+        # Os filhos abrem as próprias conexões
+        fechar_conexoes()
+
+        # ==========================================
+        # TESTE 1: Caixas disputando o mesmo produto
+        # ==========================================
+        pedidas = PROCESSOS * TENTATIVAS_POR_PROCESSO * sum(QUANTIDADES) // len(QUANTIDADES)
+        print(f"\n🏁 TESTE 1: {PROCESSOS} processos pedindo {pedidas} unidades de um estoque de {ESTOQUE_INICIAL}...")
+
+        contexto = multiprocessing.get_context("spawn")
+        respostas, segundos = _disparar(contexto, _caixa, (caminho,))
+
+        retiradas = sum(r[0] for r in respostas)
+        recusadas = sum(r[1] for r in respostas)
+        erros = [erro for r in respostas for erro in r[2]]
+        print(f"   {retiradas} unidades retiradas, {recusadas} pedidos recusados em {segundos:.2f} s")
+
+        if erros:
+            print(f"❌ {len(erros)} erro(s) inesperado(s), ex.: {erros[0]}")
+            return False
+
+        # ==========================================
+        # TESTE 2: Estoque e movimentações
+        # ==========================================
+        print("\n📊 TESTE 2: Conferindo o banco...")
+        configurar_banco(caminho, tamanho=1)
+        conexao = conectar()
+        estoque = conexao.execute("SELECT estoque FROM produtos WHERE id = 1").fetchone()[0]
+        saidas = conexao.execute(
+            "SELECT COALESCE(SUM(quantidade), 0) FROM movimentacoes_estoque WHERE produto_id = 1 AND tipo = 'SAIDA'"
+        ).fetchone()[0]
+        conexao.close()
+
+        if estoque < 0:
+            print(f"❌ Estoque negativo: {estoque}")
+            return False
+        print(f"✅ Estoque final: {estoque} (nunca negativo)")
+
+        if retiradas != ESTOQUE_INICIAL - estoque or saidas != retiradas:
+            print(f"❌ Retiradas: {retiradas}, movimentações: {saidas}, baixa no estoque: {ESTOQUE_INICIAL - estoque}")
+            return False
+        print(f"✅ {saidas} unidades em movimentações de SAIDA = baixa no estoque")
+
+        # O estoque só sobra se o último pedido foi maior que o restante
+        if estoque >= min(QUANTIDADES):
+            print(f"❌ Pedidos recusados com {estoque} unidade(s) disponível(is)")
+            return False
+        print("✅ Nenhum pedido que cabia no estoque foi recusado")
+
+        # ==========================================
+        # TESTE 3: Cancelamentos simultâneos da mesma venda
+        # ==========================================
+        print(f"\n🔁 TESTE 3: {PROCESSOS} processos cancelando a mesma venda...")
+        conexao = conectar()
+        conexao.execute(
+            "INSERT INTO produtos (id, codigo_barras, nome, preco_venda, estoque) VALUES (2, '7890002', 'Calça', 100, 10)"
+        )
+        conexao.commit()
+        conexao.close()
+        venda_id, _ = registrar_venda(Venda(
+            total=300,
+            forma_pagamento="PIX",
+            itens=[ItemVenda(produto_id=2, quantidade=3, preco_unitario=100, subtotal=300)]
+        ))
+        fechar_conexoes()
+
+        respostas, _ = _disparar(contexto, _cancelador, (caminho, venda_id))
+        erros = [r for r in respostas if r not in ("cancelou", "recusado")]
+        if erros:
+            print(f"❌ Erro inesperado: {erros[0]}")
+            return False
+
+        configurar_banco(caminho, tamanho=1)
+        conexao = conectar()
+        estoque = conexao.execute("SELECT estoque FROM produtos WHERE id = 2").fetchone()[0]
+        devolucoes = conexao.execute(
+            "SELECT COUNT(*) FROM movimentacoes_estoque WHERE origem_tipo = 'CANCELAMENTO_VENDA' AND origem_id = ?",
+            (venda_id,)
+        ).fetchone()[0]
+        resumo = conexao.execute(
+            "SELECT COALESCE(SUM(quantidade_vendas), 0), COALESCE(SUM(valor_total), 0), "
+            "COALESCE(SUM(unidades), 0), COALESCE(SUM(vendas_com_valor), 0) FROM resumo_vendas_diario"
+        ).fetchone()
+        conexao.close()
+
+        # A venda saiu do resumo diário uma única vez
+        if tuple(resumo) != (0, 0, 0, 0):
+            print(f"❌ Resumo diário depois do cancelamento (vendas, total, unidades, vendas com valor): {tuple(resumo)}")
+            return False
+
+        if respostas.count("cancelou") != 1 or estoque != 10 or devolucoes != 1:
+            print(
+                f"❌ Cancelamentos: {respostas.count('cancelou')}, estoque: {estoque} (esperado 10), "
+                f"devoluções no histórico: {devolucoes}"
+            )
+            return False
+        print(f"✅ 1 cancelamento, {respostas.count('recusado')} recusados; estoque e resumo diário corrigidos uma vez")
+
+    finally:
+        fechar_conexoes()
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    print("\n" + "=" * 60)
+    print("✅ TODOS OS TESTES DE CONCORRÊNCIA PASSARAM!")
+    print("=" * 60)
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if testar_concorrencia_estoque() else 1)
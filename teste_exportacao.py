@@ -0,0 +1,143 @@
+"""
+Teste da exportação de dados (dao/exportacao_dao.py).
+
+Gera vendas e movimentações em um banco temporário, exporta para CSV,
+JSONL e .gz e confere a quantidade de linhas, o filtro de período e
+o plano das consultas (nenhuma ordenação em memória).
+
+Como usar:
+    python teste_exportacao.py
+
+O teste usa um banco temporário: o banco da loja não é alterado.
+"""
+
+import csv
+import gzip
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from database.conexao import configurar_banco, conectar, fechar_conexoes
+from dao.exportacao_dao import exportar_dados, CONSULTAS_EXPORTACAO
+
+
+VENDAS = 20000
+
+
+def preparar_dados():
+    """Vendas com 2 itens cada, uma por dia em 2024 e 2025 (em ciclo)."""
+    conexao = conectar()
+    conexao.executemany(
+        "INSERT INTO produtos (codigo_barras, nome, preco_venda, estoque) VALUES (?, ?, 10, 0)",
+        [(f"789{i:05d}", f"Produto {i}") for i in range(100)]
+    )
+    conexao.executemany(
+        "INSERT INTO vendas (id, data, total, desconto, forma_pagamento) VALUES (?, ?, 20, 0, 'PIX')",
+        [(i, f"{2024 + i % 2}-{1 + i % 12:02d}-{1 + i % 28:02d} 10:00:00") for i in range(1, VENDAS + 1)]
+    )
+    conexao.executemany(
+        "INSERT INTO itens_venda (venda_id, produto_id, quantidade, preco_unitario, subtotal) VALUES (?, ?, 1, 10, 10)",
+        [(i // 2 + 1, 1 + i % 100) for i in range(VENDAS * 2)]
+    )
+    conexao.executemany(
+        "INSERT INTO movimentacoes_estoque (produto_id, tipo, quantidade, data) VALUES (?, 'ENTRADA', 1, ?)",
+        [(1 + i % 100, f"2025-03-{1 + i % 28:02d} 09:00:00") for i in range(1000)]
+    )
+    conexao.commit()
+    conexao.close()
+
+
+def testar_exportacao():
+    print("=" * 60)
+    print("🧪 TESTANDO EXPORTAÇÃO DE DADOS")
+    print("=" * 60)
+
+    pasta = tempfile.mkdtemp(prefix="pdv_exportacao_")
+    try:
+        configurar_banco(os.path.join(pasta, "exportacao.db"), tamanho=1)
+        preparar_dados()
+
+        # ==========================================
+        # TESTE 1: Vendas completas em CSV
+        # ==========================================
+        print(f"\n📤 TESTE 1: Exportando {VENDAS} vendas ({VENDAS * 2} itens) para CSV...")
+        destino = os.path.join(pasta, "vendas.csv")
+        inicio = time.perf_counter()
+        linhas = exportar_dados("vendas", destino)
+        segundos = time.perf_counter() - inicio
+
+        with open(destino, encoding="utf-8") as arquivo:
+            conteudo = list(csv.reader(arquivo, delimiter=";"))
+        if linhas != VENDAS * 2 or len(conteudo) != VENDAS * 2 + 1 or conteudo[0][0] != "venda_id":
+            print(f"❌ Linhas inesperadas: {linhas} exportadas, {len(conteudo)} no arquivo")
+            return False
+        print(f"✅ {linhas} linhas em {segundos:.2f} s ({linhas / segundos:.0f} linhas/s)")
+
+        # ==========================================
+        # TESTE 2: Período, JSONL e gzip
+        # ==========================================
+        print("\n📅 TESTE 2: Só 2025, em JSONL compactado...")
+        destino = os.path.join(pasta, "vendas_2025.jsonl.gz")
+        linhas = exportar_dados("vendas", destino, data_inicial="2025-01-01", data_final="2025-12-31")
+
+        with gzip.open(destino, "rt", encoding="utf-8") as arquivo:
+            registros = [json.loads(linha) for linha in arquivo]
+        if linhas != len(registros) or any(not r["data"].startswith("2025") for r in registros):
+            print("❌ O período não foi respeitado")
+            return False
+        if not registros or linhas >= VENDAS * 2:
+            print(f"❌ Quantidade inesperada para 2025: {linhas}")
+            return False
+        print(f"✅ {linhas} itens de 2025, último dia incluído")
+
+        linhas = exportar_dados("movimentacoes", os.path.join(pasta, "mov.csv"), data_final="2025-03-01")
+        if linhas != 1000 // 28 + 1:
+            print(f"❌ Movimentações até 01/03: {linhas}")
+            return False
+        print(f"✅ {linhas} movimentações até 01/03 (dia final inteiro)")
+
+        # ==========================================
+        # TESTE 3: Sem ordenação em memória
+        # ==========================================
+        print("\n🔍 TESTE 3: Conferindo os planos das consultas...")
+        conexao = conectar()
+        for tabela, consulta in CONSULTAS_EXPORTACAO.items():
+            sql = consulta["sql"].format(filtro=" AND 1=1") if consulta["coluna_data"] else consulta["sql"]
+            plano = " | ".join(linha[3] for linha in conexao.execute("EXPLAIN QUERY PLAN " + sql))
+            if "TEMP B-TREE" in plano:
+                conexao.close()
+                print(f"❌ {tabela} ordena em memória: {plano}")
+                return False
+            print(f"✅ {tabela}: {plano}")
+        conexao.close()
+
+        # ==========================================
+        # TESTE 4: Erros
+        # ==========================================
+        print("\n🚫 TESTE 4: Tabela inválida...")
+        try:
+            exportar_dados("senhas", os.path.join(pasta, "senhas.csv"))
+            print("❌ Deveria recusar")
+            return False
+        except ValueError as e:
+            print(f"✅ Recusado: {e}")
+
+        if any(nome.endswith(".parcial") for nome in os.listdir(pasta)):
+            print("❌ Sobrou arquivo parcial")
+            return False
+
+    finally:
+        fechar_conexoes()
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    print("\n" + "=" * 60)
+    print("✅ TODOS OS TESTES DE EXPORTAÇÃO PASSARAM!")
+    print("=" * 60)
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if testar_exportacao() else 1)
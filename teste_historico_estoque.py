@@ -0,0 +1,196 @@
+"""
+Teste do histórico único de estoque (movimentacoes_estoque).
+
+Passa por todas as operações que alteram o estoque (cadastro, edição,
+entrada e saída manuais, nota de entrada, venda, cancelamento e
+importação de CSV) e confere, depois de cada uma, que a soma do
+histórico de cada produto é igual a produtos.estoque.
+
+Como usar:
+    python teste_historico_estoque.py
+
+O teste usa um banco temporário: o banco da loja não é alterado.
+"""
+
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+
+from database.conexao import configurar_banco, conectar, fechar_conexoes
+from dao.produtos_dao import inserir_produto, atualizar_produto, buscar_produto_por_id
+from dao.estoque_dao import (
+    registrar_entrada,
+    registrar_saida,
+    registrar_nota_entrada,
+    obter_estoque_na_data
+)
+from dao.vendas_dao import registrar_venda, cancelar_venda
+from dao.importacao_produtos import importar_produtos_csv
+from models.produto import Produto
+from models.venda import Venda, ItemVenda
+from models.nota_entrada import NotaEntrada, ItemNotaEntrada
+
+
+def diferencas_historico():
+    """Produtos cujo estoque não bate com a soma do histórico."""
+    conexao = conectar()
+    linhas = conexao.execute("""
+        SELECT p.id, p.estoque, COALESCE(SUM(
+            CASE m.tipo WHEN 'ENTRADA' THEN m.quantidade ELSE -m.quantidade END
+        ), 0) AS historico
+        FROM produtos p
+        LEFT JOIN movimentacoes_estoque m ON m.produto_id = p.id
+        GROUP BY p.id
+        HAVING p.estoque <> historico
+    """).fetchall()
+    conexao.close()
+    return [tuple(linha) for linha in linhas]
+
+
+def origens(produto_id):
+    conexao = conectar()
+    linhas = conexao.execute(
+        "SELECT origem_tipo FROM movimentacoes_estoque WHERE produto_id = ? ORDER BY id",
+        (produto_id,)
+    ).fetchall()
+    conexao.close()
+    return [linha[0] for linha in linhas]
+
+
+def testar_historico_estoque():
+    print("=" * 60)
+    print("🧪 TESTANDO O HISTÓRICO ÚNICO DE ESTOQUE")
+    print("=" * 60)
+
+    pasta = tempfile.mkdtemp(prefix="pdv_historico_")
+    try:
+        configurar_banco(os.path.join(pasta, "historico.db"), tamanho=1)
+
+        # ==========================================
+        # TESTE 1: Cada operação gera a sua linha
+        # ==========================================
+        print("\n📒 TESTE 1: Operações que alteram o estoque...")
+        camiseta = inserir_produto(Produto(codigo_barras="7890001", nome="Camiseta", preco_venda=50, estoque=10))
+        calca = inserir_produto(Produto(codigo_barras="7890002", nome="Calça", preco_venda=120, estoque=0))
+
+        produto = buscar_produto_por_id(camiseta.id)
+        produto.estoque = 8
+        atualizar_produto(produto)
+        produto.nome = "Camiseta Básica"
+        atualizar_produto(produto)  # Sem mudar o estoque: sem linha nova
+
+        registrar_entrada(camiseta.id, 5, "Reposição")
+        registrar_saida(camiseta.id, 1, "Avaria")
+        registrar_nota_entrada(NotaEntrada(itens=[
+            ItemNotaEntrada(produto_id=camiseta.id, quantidade=4),
+            ItemNotaEntrada(produto_id=calca.id, quantidade=6),
+        ]))
+
+        venda_id, _ = registrar_venda(Venda(
+            total=220,
+            forma_pagamento="PIX",
+            itens=[
+                ItemVenda(produto_id=camiseta.id, quantidade=1, preco_unitario=50, subtotal=50),
+                ItemVenda(produto_id=camiseta.id, quantidade=1, preco_unitario=50, subtotal=50),
+                ItemVenda(produto_id=calca.id, quantidade=1, preco_unitario=120, subtotal=120),
+            ]
+        ))
+        cancelar_venda(venda_id)
+        registrar_venda(Venda(
+            total=50,
+            forma_pagamento="DINHEIRO",
+            itens=[ItemVenda(produto_id=camiseta.id, quantidade=1, preco_unitario=50, subtotal=50)]
+        ))
+
+        esperadas = [
+            "CADASTRO", "AJUSTE", "MANUAL", "MANUAL", "NOTA_ENTRADA",
+            "VENDA", "CANCELAMENTO_VENDA", "VENDA"
+        ]
+        if origens(camiseta.id) != esperadas:
+            print(f"❌ Origens inesperadas: {origens(camiseta.id)}")
+            return False
+        print(f"✅ Camiseta: {' → '.join(esperadas)}")
+
+        if origens(calca.id) != ["NOTA_ENTRADA", "VENDA", "CANCELAMENTO_VENDA"]:
+            print(f"❌ Origens da calça: {origens(calca.id)}")
+            return False
+        print("✅ Calça: estoque zero no cadastro não gera linha")
+
+        # Importação: só o produto novo gera linha
+        arquivo = os.path.join(pasta, "catalogo.csv")
+        with open(arquivo, "w", encoding="utf-8") as csv:
+            csv.write("codigo_barras;nome;preco_venda;estoque\n")
+            csv.write("7890001;Camiseta Nova;55;99\n")
+            csv.write("7890003;Bermuda;80;7\n")
+        importar_produtos_csv(arquivo)
+
+        if origens(camiseta.id) != esperadas:
+            print("❌ A importação lançou estoque de produto já cadastrado")
+            return False
+        conexao = conectar()
+        bermuda = conexao.execute("SELECT id FROM produtos WHERE codigo_barras = '7890003'").fetchone()[0]
+        conexao.close()
+        if origens(bermuda) != ["IMPORTACAO"]:
+            print(f"❌ Origens da bermuda: {origens(bermuda)}")
+            return False
+        print("✅ Importação: estoque inicial só do produto novo")
+
+        # ==========================================
+        # TESTE 2: Histórico = estoque
+        # ==========================================
+        print("\n⚖️  TESTE 2: Soma do histórico de cada produto...")
+        diferencas = diferencas_historico()
+        if diferencas:
+            print(f"❌ Estoque diferente do histórico (id, estoque, histórico): {diferencas}")
+            return False
+        print("✅ O histórico bate com o estoque de todos os produtos")
+
+        if obter_estoque_na_data(camiseta.id, "2999-12-31") != buscar_produto_por_id(camiseta.id).estoque:
+            print("❌ obter_estoque_na_data diferente do estoque atual")
+            return False
+        if obter_estoque_na_data(camiseta.id, "2000-01-01") != 0:
+            print("❌ Estoque antes do cadastro deveria ser zero")
+            return False
+        print("✅ Estoque na data confere")
+
+        # ==========================================
+        # TESTE 3: Índice e somente inclusão
+        # ==========================================
+        print("\n🔍 TESTE 3: Plano da consulta e proteção do histórico...")
+        conexao = conectar()
+        plano = " | ".join(linha[3] for linha in conexao.execute(
+            "EXPLAIN QUERY PLAN SELECT SUM(quantidade) FROM movimentacoes_estoque "
+            "WHERE produto_id = 1 AND data <= '2025-12-31 23:59:59'"
+        ))
+        if "idx_mov_estoque_produto_data" not in plano:
+            conexao.close()
+            print(f"❌ Não usa o índice (produto_id, data): {plano}")
+            return False
+        print(f"✅ {plano}")
+
+        for sql in ("DELETE FROM movimentacoes_estoque", "UPDATE movimentacoes_estoque SET quantidade = 1"):
+            try:
+                conexao.execute(sql)
+                conexao.rollback()
+                conexao.close()
+                print(f"❌ Deveria recusar: {sql}")
+                return False
+            except sqlite3.DatabaseError as e:
+                conexao.rollback()
+                print(f"✅ Recusado: {e}")
+        conexao.close()
+
+    finally:
+        fechar_conexoes()
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    print("\n" + "=" * 60)
+    print("✅ TODOS OS TESTES DO HISTÓRICO DE ESTOQUE PASSARAM!")
+    print("=" * 60)
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if testar_historico_estoque() else 1)
@@ -0,0 +1,146 @@
+"""
+Teste da importação em massa de produtos (dao/importacao_produtos.py).
+
+Gera um catálogo CSV com alguns milhares de produtos e algumas linhas
+com erro, importa duas vezes (cadastro e depois atualização de preços)
+e mostra a vazão em linhas por segundo.
+
+Como usar:
+    python teste_importacao_produtos.py
+
+O teste usa um banco temporário: o banco da loja não é alterado.
+"""
+
+import csv
+import os
+import shutil
+import sys
+import tempfile
+
+from database.conexao import configurar_banco, conectar, fechar_conexoes
+from dao.importacao_produtos import importar_produtos_csv
+from dao.produtos_dao import buscar_produto_por_codigo_barras
+
+
+QUANTIDADE = 5000
+
+
+def gerar_catalogo(caminho, quantidade, preco):
+    """Catálogo no formato do fornecedor: ponto e vírgula, preços com vírgula."""
+    with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+        escritor = csv.writer(arquivo, delimiter=";")
+        escritor.writerow(["EAN", "Descrição", "Grupo", "Tam", "Preço", "Custo", "Qtd"])
+        for i in range(quantidade):
+            escritor.writerow([
+                f"789{i:010d}",
+                f"Camiseta modelo {i}",
+                "Camisetas",
+                "M",
+                f"1.{preco:03d},90",
+                "10,50",
+                "5"
+            ])
+
+        # Linhas com erro
+        escritor.writerow(["", "Sem código", "X", "P", "10,00", "", ""])
+        escritor.writerow(["7890000099999", "", "X", "P", "10,00", "", ""])
+        escritor.writerow(["7890000099998", "Preço ruim", "X", "P", "dez reais", "", ""])
+        escritor.writerow(["7890000099997", "Estoque ruim", "X", "P", "10,00", "", "1,5"])
+        escritor.writerow(["7890000099996", "Estoque infinito", "X", "P", "10,00", "", "inf"])
+        escritor.writerow(["7890000099995", "Preço NaN", "X", "P", "nan", "", ""])
+
+
+def testar_importacao():
+    print("=" * 60)
+    print("🧪 TESTANDO IMPORTAÇÃO DE PRODUTOS")
+    print("=" * 60)
+
+    mapeamento = {
+        "codigo_barras": "EAN",
+        "nome": "Descrição",
+        "categoria": "Grupo",
+        "tamanho": "Tam",
+        "preco_venda": "Preço",
+        "preco_custo": "Custo",
+        "estoque": "Qtd",
+    }
+
+    pasta = tempfile.mkdtemp(prefix="pdv_importacao_")
+    catalogo = os.path.join(pasta, "catalogo.csv")
+    try:
+        configurar_banco(os.path.join(pasta, "importacao.db"), tamanho=1)
+
+        # ==========================================
+        # TESTE 1: Cadastro
+        # ==========================================
+        print(f"\n📥 TESTE 1: Importando {QUANTIDADE} produtos novos...")
+        gerar_catalogo(catalogo, QUANTIDADE, preco=100)
+        resultado = importar_produtos_csv(catalogo, mapeamento=mapeamento)
+
+        print(f"   {resultado['linhas_por_segundo']:.0f} linhas/s ({resultado['segundos']:.2f} s)")
+        if resultado["inseridas"] != QUANTIDADE or resultado["rejeitadas"] != 6:
+            print(f"❌ Resultado inesperado: {resultado}")
+            return False
+
+        with open(resultado["arquivo_erros"], encoding="utf-8-sig") as arquivo:
+            erros = list(csv.reader(arquivo, delimiter=";"))
+        if len(erros) != 7 or erros[0][:2] != ["linha", "erro"]:
+            print(f"❌ Arquivo de erros inesperado: {erros}")
+            return False
+        print(f"✅ {resultado['inseridas']} cadastrados, 6 linhas no arquivo de erros")
+
+        produto = buscar_produto_por_codigo_barras("7890000000042")
+        if produto.preco_venda != 1100.90 or produto.preco_custo != 10.50 or produto.estoque != 5:
+            print(f"❌ Números mal convertidos: {produto}")
+            return False
+        print("✅ Números no formato brasileiro convertidos")
+
+        # ==========================================
+        # TESTE 2: Atualização (upsert)
+        # ==========================================
+        print("\n🔁 TESTE 2: Importando o mesmo catálogo com preços novos...")
+        conexao = conectar()
+        conexao.execute("UPDATE produtos SET estoque = 42 WHERE codigo_barras = '7890000000042'")
+        conexao.commit()
+        conexao.close()
+
+        gerar_catalogo(catalogo, QUANTIDADE, preco=200)
+        resultado = importar_produtos_csv(catalogo, mapeamento=mapeamento, tamanho_lote=1000)
+
+        conexao = conectar()
+        total = conexao.execute("SELECT COUNT(*) FROM produtos").fetchone()[0]
+        conexao.close()
+
+        produto = buscar_produto_por_codigo_barras("7890000000042")
+        if total != QUANTIDADE or resultado["atualizadas"] != QUANTIDADE:
+            print(f"❌ Produtos duplicados: {total} no banco, {resultado}")
+            return False
+        if produto.preco_venda != 1200.90 or produto.estoque != 42:
+            print(f"❌ Atualização incorreta: {produto}")
+            return False
+        print(f"✅ {resultado['atualizadas']} atualizados, estoque preservado")
+        print(f"   {resultado['linhas_por_segundo']:.0f} linhas/s")
+
+        # ==========================================
+        # TESTE 3: Coluna obrigatória ausente
+        # ==========================================
+        print("\n🚫 TESTE 3: Mapeamento sem a coluna de preço...")
+        try:
+            importar_produtos_csv(catalogo, mapeamento={"codigo_barras": "EAN", "nome": "Descrição"})
+            print("❌ Deveria recusar o arquivo")
+            return False
+        except ValueError as e:
+            print(f"✅ Recusado: {e}")
+
+    finally:
+        fechar_conexoes()
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    print("\n" + "=" * 60)
+    print("✅ TODOS OS TESTES DE IMPORTAÇÃO PASSARAM!")
+    print("=" * 60)
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if testar_importacao() else 1)
@@ -0,0 +1,131 @@
+"""
+Teste das notas de entrada (registrar_nota_entrada).
+
+Grava uma nota com centenas de linhas em um banco temporário e confere
+o estoque, as movimentações ligadas à nota e que uma nota com produto
+inexistente não grava nada.
+
+Como usar:
+    python teste_notas_entrada.py
+
+O teste usa um banco temporário: o banco da loja não é alterado.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from database.conexao import configurar_banco, conectar, fechar_conexoes
+from dao.estoque_dao import registrar_nota_entrada, registrar_entrada, buscar_nota_entrada
+from models.nota_entrada import NotaEntrada, ItemNotaEntrada
+
+
+PRODUTOS = 300
+
+
+def preparar_produtos():
+    conexao = conectar()
+    conexao.executemany(
+        "INSERT INTO produtos (codigo_barras, nome, preco_venda, estoque) VALUES (?, ?, 10, 5)",
+        [(f"789{i:05d}", f"Produto {i}") for i in range(PRODUTOS)]
+    )
+    conexao.commit()
+    conexao.close()
+
+
+def estoques():
+    conexao = conectar()
+    resultado = {linha["id"]: linha["estoque"] for linha in conexao.execute("SELECT id, estoque FROM produtos")}
+    conexao.close()
+    return resultado
+
+
+def testar_notas_entrada():
+    print("=" * 60)
+    print("🧪 TESTANDO NOTAS DE ENTRADA")
+    print("=" * 60)
+
+    pasta = tempfile.mkdtemp(prefix="pdv_notas_")
+    try:
+        configurar_banco(os.path.join(pasta, "notas.db"), tamanho=1)
+        preparar_produtos()
+
+        # ==========================================
+        # TESTE 1: Nota com todas as linhas
+        # ==========================================
+        print(f"\n📦 TESTE 1: Nota com {PRODUTOS} linhas (+1 produto repetido)...")
+        itens = [ItemNotaEntrada(produto_id=i, quantidade=2) for i in range(1, PRODUTOS + 1)]
+        itens.append(ItemNotaEntrada(produto_id=1, quantidade=3))
+
+        inicio = time.perf_counter()
+        nota_id, novos = registrar_nota_entrada(
+            NotaEntrada(numero="4512", fornecedor="Confecções Teste", itens=itens)
+        )
+        segundos_nota = time.perf_counter() - inicio
+
+        atuais = estoques()
+        if atuais[1] != 10 or any(atuais[i] != 7 for i in range(2, PRODUTOS + 1)) or novos != atuais:
+            print("❌ Estoque incorreto depois da nota")
+            return False
+
+        nota = buscar_nota_entrada(nota_id)
+        if len(nota.itens) != PRODUTOS or nota.total_unidades != PRODUTOS * 2 + 3:
+            print(f"❌ Itens da nota: {len(nota.itens)}, unidades: {nota.total_unidades}")
+            return False
+        print(f"✅ Nota #{nota_id}: {len(nota.itens)} movimentações ligadas à nota em {segundos_nota:.3f} s")
+
+        # Comparação: uma gravação por linha
+        inicio = time.perf_counter()
+        for i in range(1, PRODUTOS + 1):
+            registrar_entrada(i, 1)
+        segundos_linhas = time.perf_counter() - inicio
+        print(f"   (uma entrada por vez: {segundos_linhas:.3f} s)")
+
+        # ==========================================
+        # TESTE 2: Produto inexistente não grava nada
+        # ==========================================
+        print("\n🚫 TESTE 2: Nota com produto inexistente...")
+        antes = estoques()
+        try:
+            registrar_nota_entrada(NotaEntrada(itens=[
+                ItemNotaEntrada(produto_id=1, quantidade=5),
+                ItemNotaEntrada(produto_id=99999, quantidade=1),
+            ]))
+            print("❌ Deveria recusar")
+            return False
+        except ValueError as e:
+            print(f"✅ Recusada: {e}")
+
+        conexao = conectar()
+        notas = conexao.execute("SELECT COUNT(*) FROM notas_entrada").fetchone()[0]
+        conexao.close()
+        if estoques() != antes or notas != 1:
+            print("❌ A nota recusada gravou parte das linhas")
+            return False
+        print("✅ Nada foi gravado")
+
+        # ==========================================
+        # TESTE 3: Quantidade inválida
+        # ==========================================
+        print("\n🚫 TESTE 3: Quantidade zero...")
+        try:
+            registrar_nota_entrada(NotaEntrada(itens=[ItemNotaEntrada(produto_id=1, quantidade=0)]))
+            print("❌ Deveria recusar")
+            return False
+        except ValueError as e:
+            print(f"✅ Recusada: {e}")
+
+    finally:
+        fechar_conexoes()
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    print("\n" + "=" * 60)
+    print("✅ TODOS OS TESTES DE NOTAS DE ENTRADA PASSARAM!")
+    print("=" * 60)
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if testar_notas_entrada() else 1)
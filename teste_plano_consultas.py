@@ -0,0 +1,195 @@
+"""
+Teste dos planos de consulta dos relatórios de vendas.
+
+Executa os relatórios de vendas por período, captura o SQL que cada
+um envia ao banco e confere o EXPLAIN QUERY PLAN: nenhum relatório
+pode ler a tabela de vendas inteira (SCAN). Um filtro como
+date(data) >= ? impede o uso do índice idx_vendas_data e faz este
+teste falhar. Também confere que o ticket médio lido do resumo diário
+é a média das vendas com valor.
+
+Como usar:
+    python teste_plano_consultas.py
+
+O teste usa um banco temporário: o banco da loja não é alterado.
+"""
+
+import os
+import re
+import sys
+import shutil
+import sqlite3
+import tempfile
+from datetime import date, datetime, timedelta
+
+from database.conexao import configurar_banco, conectar, fechar_conexoes
+from dao.produtos_dao import inserir_produto
+from dao.vendas_dao import (
+    registrar_venda,
+    listar_vendas,
+    obter_total_vendas_periodo,
+    obter_vendas_hoje,
+    obter_vendas_mes_atual,
+    obter_vendas_ultimos_dias,
+    obter_estatisticas_gerais
+)
+from models.produto import Produto
+from models.venda import Venda, ItemVenda
+
+
+# Tabelas que não podem ser lidas por inteiro em um relatório por período
+TABELAS_VIGIADAS = ("vendas", "itens_venda", "resumo_vendas_diario")
+
+PALAVRAS_SQL = {"where", "join", "left", "inner", "on", "group", "order", "limit", "set", "values"}
+
+
+def preparar_vendas(quantidade=500):
+    """Registra vendas espalhadas pelos últimos 120 dias (a primeira com desconto total)."""
+    produto = inserir_produto(Produto(nome="Produto Teste", preco_venda=10.0, estoque=1_000_000))
+
+    hoje = datetime.now()
+    for i in range(quantidade):
+        item = ItemVenda(produto_id=produto.id, quantidade=1, preco_unitario=10.0)
+        item.calcular_subtotal()
+        desconto = item.subtotal if i == 0 else 0
+        venda = Venda(
+            data=(hoje - timedelta(days=i % 120, minutes=i)).strftime("%Y-%m-%d %H:%M:%S"),
+            total=item.subtotal - desconto,
+            desconto=desconto,
+            forma_pagamento="DINHEIRO" if i % 2 else "PIX",
+            itens=[item]
+        )
+        registrar_venda(venda)
+
+
+def tabelas_da_consulta(sql):
+    """Nomes (e apelidos) das tabelas vigiadas que aparecem no SQL."""
+    nomes = set()
+    for tabela, apelido in re.findall(
+        r"\b(" + "|".join(TABELAS_VIGIADAS) + r")\b(?:\s+(?:AS\s+)?(\w+))?",
+        sql,
+        re.IGNORECASE
+    ):
+        nomes.add(tabela.lower())
+        if apelido and apelido.lower() not in PALAVRAS_SQL:
+            nomes.add(apelido.lower())
+    return nomes
+
+
+def verificar_relatorio(nome, funcao, caminho_banco):
+    """
+    Executa um relatório e confere o plano de cada SELECT que ele fez.
+
+    Returns:
+        list[str]: Problemas encontrados (vazia se estiver tudo certo)
+    """
+    consultas = []
+
+    # O pool tem uma única conexão: o relatório usa a mesma conexão
+    # em que o rastreamento foi ligado.
+    conexao = conectar()
+    conexao.set_trace_callback(consultas.append)
+    conexao.close()
+
+    try:
+        funcao()
+    finally:
+        conexao = conectar()
+        conexao.set_trace_callback(None)
+        conexao.close()
+
+    problemas = []
+    banco = sqlite3.connect(caminho_banco)
+    try:
+        for sql in consultas:
+            if not sql.lstrip().upper().startswith("SELECT"):
+                continue
+
+            tabelas = tabelas_da_consulta(sql)
+            if not tabelas:
+                continue
+
+            for linha in banco.execute("EXPLAIN QUERY PLAN " + sql):
+                detalhe = linha[3]
+                partes = detalhe.split()
+                if partes[0] == "SCAN" and partes[1].lower() in tabelas:
+                    problemas.append(f"{nome}: {detalhe}\n      {' '.join(sql.split())}")
+    finally:
+        banco.close()
+
+    if not consultas:
+        problemas.append(f"{nome}: nenhuma consulta capturada")
+
+    return problemas
+
+
+def testar_planos_consultas():
+    print("=" * 60)
+    print("🧪 TESTANDO PLANOS DE CONSULTA DOS RELATÓRIOS DE VENDAS")
+    print("=" * 60)
+
+    hoje = date.today()
+    inicio_mes = hoje.replace(day=1).strftime("%Y-%m-%d")
+    hoje_texto = hoje.strftime("%Y-%m-%d")
+
+    relatorios = [
+        ("listar_vendas (período)", lambda: listar_vendas(inicio_mes, hoje_texto)),
+        ("listar_vendas (só data inicial)", lambda: listar_vendas(data_inicial=hoje_texto)),
+        ("listar_vendas (com canceladas)", lambda: listar_vendas(inicio_mes, hoje_texto, incluir_canceladas=True)),
+        ("obter_total_vendas_periodo", lambda: obter_total_vendas_periodo(inicio_mes, hoje_texto)),
+        ("obter_vendas_hoje", obter_vendas_hoje),
+        ("obter_vendas_mes_atual", obter_vendas_mes_atual),
+        ("obter_vendas_ultimos_dias", lambda: obter_vendas_ultimos_dias(30)),
+    ]
+
+    pasta = tempfile.mkdtemp(prefix="pdv_plano_")
+    caminho_banco = os.path.join(pasta, "plano.db")
+    problemas = []
+    try:
+        configurar_banco(caminho_banco, tamanho=1)
+        preparar_vendas()
+
+        # Estatísticas do planejador, como em um banco em uso
+        conexao = conectar()
+        conexao.execute("ANALYZE")
+        conexao.commit()
+        conexao.close()
+
+        for nome, funcao in relatorios:
+            encontrados = verificar_relatorio(nome, funcao, caminho_banco)
+            if encontrados:
+                print(f"❌ {nome}")
+            else:
+                print(f"✅ {nome}")
+            problemas += encontrados
+
+        # O ticket médio do resumo diário é o mesmo das vendas:
+        # média das vendas com valor (a de total zero não entra)
+        conexao = conectar()
+        media = conexao.execute(
+            "SELECT AVG(total) FROM vendas WHERE cancelada = 0 AND total > 0"
+        ).fetchone()[0]
+        conexao.close()
+        ticket_medio = obter_estatisticas_gerais()["ticket_medio"]
+        if abs(ticket_medio - media) > 0.005:
+            print(f"❌ Ticket médio {ticket_medio:.4f}, nas vendas {media:.4f}")
+            problemas.append("obter_estatisticas_gerais: ticket médio diferente das vendas")
+        else:
+            print(f"✅ Ticket médio igual ao das vendas: {ticket_medio:.2f}")
+    finally:
+        fechar_conexoes()
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    print()
+    if problemas:
+        print("❌ Problemas encontrados:")
+        for problema in problemas:
+            print(f"   {problema}")
+        return False
+
+    print("✅ Todos os relatórios usam índices!")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if testar_planos_consultas() else 1)
@@ -107,8 +107,10 @@ def testar_sistema_vendas():
     
     # Registra a venda
     try:
-        venda_id = registrar_venda(venda)
+        venda_id, estoques = registrar_venda(venda)
         print(f"\n✅ Venda registrada com sucesso! ID: {venda_id}")
+        for produto_id, estoque in estoques.items():
+            print(f"   Estoque do produto {produto_id} após a venda: {estoque}")
     except Exception as e:
         print(f"\n❌ ERRO ao registrar venda: {e}")
         return
@@ -1,11 +1,35 @@
-import requests
+"""
+Verificação de novas versões do sistema no GitHub.
+
+A consulta roda em uma thread separada: sem internet (ou com internet
+lenta) a tela principal abre e responde normalmente. O resultado só
+chega à tela pela thread do Tkinter (acompanhar_future).
+
+Para não consultar o GitHub a cada abertura, a última resposta fica
+em <pasta de dados>/atualizacao.json, com o ETag enviado pelo GitHub:
+- dentro do intervalo mínimo, a resposta guardada é usada direto;
+- depois dele, a consulta envia If-None-Match e, se nada mudou, o
+  GitHub responde 304 sem corpo.
+"""
+
+import json
+import os
+import threading
+import time
 import webbrowser
+from concurrent.futures import Future
 from tkinter import messagebox
 
+from database.conexao import PASTA_DADOS
+from utils.executor_banco import acompanhar_future
 from versao import VERSAO_APP
 
 URL_RELEASE = "https://api.github.com/repos/FrankSCarvalho/sistema_pdv/releases/latest"
 
+CAMINHO_CACHE_ATUALIZACAO = os.path.join(PASTA_DADOS, "atualizacao.json")
+INTERVALO_MINIMO_HORAS = 6
+TEMPO_LIMITE = 5  # segundos
+
 
 def comparar_versoes(v1, v2):
     def normalizar(v):
@@ -21,28 +45,130 @@ def comparar_versoes(v1, v2):
     return normalizar(v1) > normalizar(v2)
 
 
-def verificar_atualizacao(janela=None):
+def _ler_cache():
     try:
-        resposta = requests.get(URL_RELEASE, timeout=5)
+        with open(CAMINHO_CACHE_ATUALIZACAO, "r", encoding="utf-8") as arquivo:
+            return json.load(arquivo)
+    except (OSError, ValueError):
+        return {}
 
-        if resposta.status_code != 200:
-            return
 
-        dados = resposta.json()
-        versao_remota = dados.get("tag_name", "").replace("v", "")
+def _salvar_cache(cache):
+    try:
+        with open(CAMINHO_CACHE_ATUALIZACAO, "w", encoding="utf-8") as arquivo:
+            json.dump(cache, arquivo)
+    except OSError as e:
+        print(f"Aviso: não foi possível salvar o cache de atualização: {e}")
+
+
+def consultar_versao_remota(intervalo_horas=INTERVALO_MINIMO_HORAS):
+    """
+    Consulta a última versão publicada (chamada fora da thread da interface).
+
+    Args:
+        intervalo_horas: Tempo mínimo entre duas consultas ao GitHub
+
+    Returns:
+        dict | None: {"versao": "1.7.0", "url": "..."} ou None se não houver
+        informação (sem internet e sem cache, por exemplo)
+    """
+    cache = _ler_cache()
+    agora = time.time()
+
+    if agora - cache.get("verificado_em", 0) < intervalo_horas * 3600:
+        return _resultado_do_cache(cache)
+
+    # Importado só aqui: não pesa na abertura do sistema
+    import requests
+
+    cabecalhos = {}
+    if cache.get("etag"):
+        cabecalhos["If-None-Match"] = cache["etag"]
+
+    try:
+        resposta = requests.get(URL_RELEASE, headers=cabecalhos, timeout=TEMPO_LIMITE)
+    except requests.RequestException:
+        return _resultado_do_cache(cache)
+
+    if resposta.status_code == 304:
+        # Nada mudou desde a última consulta
+        cache["verificado_em"] = agora
+        _salvar_cache(cache)
+        return _resultado_do_cache(cache)
+
+    if resposta.status_code != 200:
+        return _resultado_do_cache(cache)
 
-        if not versao_remota:
+    dados = resposta.json()
+    cache = {
+        "etag": resposta.headers.get("ETag"),
+        "verificado_em": agora,
+        "versao": dados.get("tag_name", "").replace("v", ""),
+        "url": dados.get("html_url")
+    }
+    _salvar_cache(cache)
+
+    return _resultado_do_cache(cache)
+
+
+def _resultado_do_cache(cache):
+    if not cache.get("versao"):
+        return None
+    return {"versao": cache["versao"], "url": cache.get("url")}
+
+
+def verificar_atualizacao(janela=None):
+    """
+    Verifica se há nova versão sem travar a interface.
+
+    A consulta roda em uma thread separada; se houver versão nova, a
+    pergunta ao usuário é feita na thread do Tkinter.
+
+    Args:
+        janela: Janela principal (usada para entregar o resultado e
+                como pai da mensagem)
+    """
+    if janela is None:
+        # Sem janela para acompanhar a thread: consulta direto
+        try:
+            _avisar_atualizacao(None, consultar_versao_remota())
+        except Exception:
+            pass  # silencioso
+        return
+
+    future = Future()
+
+    def consultar():
+        try:
+            future.set_result(consultar_versao_remota())
+        except Exception as e:
+            future.set_exception(e)
+
+    threading.Thread(target=consultar, name="VerificarAtualizacao", daemon=True).start()
+
+    acompanhar_future(
+        janela,
+        future,
+        ao_concluir=lambda resultado: _avisar_atualizacao(janela, resultado),
+        ao_falhar=lambda e: None,  # silencioso
+        intervalo=200
+    )
+
+
+def _avisar_atualizacao(janela, resultado):
+    if not resultado:
+        return
+
+    try:
+        if not comparar_versoes(resultado["versao"], VERSAO_APP):
             return
+    except ValueError:
+        return  # tag em formato inesperado
 
-        
-        if comparar_versoes(versao_remota, VERSAO_APP):
-            if messagebox.askyesno(
-                "Atualização disponível",
-                f"Uma nova versão ({versao_remota}) está disponível.\n\n"
-                "Deseja baixar agora?",
-                parent=janela
-            ):
-                webbrowser.open(dados["html_url"])
-
-    except Exception:
-        pass  # silencioso
+    if messagebox.askyesno(
+        "Atualização disponível",
+        f"Uma nova versão ({resultado['versao']}) está disponível.\n\n"
+        "Deseja baixar agora?",
+        parent=janela
+    ):
+        webbrowser.open(resultado["url"])
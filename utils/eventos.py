@@ -0,0 +1,213 @@
+"""
+Avisos de alteração entre os DAOs e as telas abertas (publicar/assinar).
+
+Quando um DAO grava algo (produto editado, entrada de estoque, venda),
+ele publica um evento com os ids afetados. Cada tela aberta assina só
+os eventos que lhe interessam e atualiza apenas o que mudou, em vez de
+recarregar tudo ou mostrar dados velhos até ser reaberta. Sem
+gravações, nenhuma tela é atualizada.
+
+Dois tipos de assinatura:
+- assinar(): a função é chamada na hora, na thread que publicou
+  (ex.: o cache de códigos de barras, que tem seu próprio lock);
+- assinar_na_tela(): a função é chamada na thread do Tkinter, pouco
+  depois da publicação, enquanto o widget existir. Os eventos
+  publicados por outra thread (a thread do banco) ficam numa fila,
+  esvaziada por um after() da thread do Tkinter: nenhuma outra thread
+  chama o Tk.
+
+Exemplo:
+    # No DAO, depois do commit
+    publicar(ProdutosAlterados([produto.id]))
+
+    # Na tela
+    assinar_na_tela(self, ProdutosAlterados, self._produtos_alterados)
+"""
+
+import queue
+import threading
+
+
+# Intervalo (ms) entre as verificações da fila, enquanto houver telas inscritas
+INTERVALO_ENTREGA = 100
+
+
+# =========================
+# Eventos
+# =========================
+
+class Evento:
+    """Base de todos os eventos. Assinar Evento recebe todos eles."""
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.__dict__})"
+
+
+class ProdutosAlterados(Evento):
+    """
+    Produtos cadastrados, editados, desativados ou reativados.
+
+    Atributos:
+        produto_ids: IDs dos produtos afetados
+    """
+
+    def __init__(self, produto_ids):
+        self.produto_ids = list(produto_ids)
+
+
+class EstoqueAlterado(Evento):
+    """
+    O estoque de alguns produtos mudou.
+
+    Atributos:
+        estoques: dict {produto_id: estoque atual}
+    """
+
+    def __init__(self, estoques):
+        self.estoques = dict(estoques)
+
+    @property
+    def produto_ids(self):
+        return list(self.estoques)
+
+
+class MovimentacaoRegistrada(EstoqueAlterado):
+    """Entrada ou saída registrada na movimentação de estoque."""
+
+    def __init__(self, estoques, tipo):
+        super().__init__(estoques)
+        self.tipo = tipo
+
+
+class VendaRegistrada(EstoqueAlterado):
+    """Venda gravada (o estoque dos produtos vendidos baixou)."""
+
+    def __init__(self, venda_id, estoques):
+        super().__init__(estoques)
+        self.venda_id = venda_id
+
+
+class VendaCancelada(EstoqueAlterado):
+    """Venda cancelada (os itens voltaram ao estoque)."""
+
+    def __init__(self, venda_id, estoques):
+        super().__init__(estoques)
+        self.venda_id = venda_id
+
+
+# =========================
+# Assinaturas
+# =========================
+
+_lock = threading.Lock()
+_assinaturas = []           # (tipo, funcao)
+_assinaturas_tela = []      # (widget, tipo, funcao)
+_pendentes = queue.SimpleQueue()
+_entrega_agendada = False
+
+
+def assinar(tipo, funcao):
+    """
+    Chama funcao(evento) a cada evento do tipo (ou subtipo), na hora.
+
+    A função roda na thread que publicou: não pode mexer na interface.
+    """
+    with _lock:
+        _assinaturas.append((tipo, funcao))
+
+
+def assinar_na_tela(widget, tipo, funcao):
+    """
+    Chama funcao(evento) na thread do Tkinter a cada evento do tipo.
+
+    Chamar na thread do Tkinter. A assinatura termina sozinha quando o
+    widget é destruído.
+
+    Args:
+        widget: Tela (ou widget) que recebe os eventos
+        tipo: Classe do evento (ex.: ProdutosAlterados)
+        funcao: Função chamada com o evento
+    """
+    global _entrega_agendada
+
+    with _lock:
+        _assinaturas_tela.append((widget, tipo, funcao))
+        iniciar = not _entrega_agendada
+        _entrega_agendada = True
+
+    if iniciar:
+        widget.after(INTERVALO_ENTREGA, _laco_entrega)
+
+
+def cancelar_assinaturas(widget):
+    """Remove as assinaturas de um widget (opcional: ao fechar, isso é automático)."""
+    with _lock:
+        _assinaturas_tela[:] = [a for a in _assinaturas_tela if a[0] is not widget]
+
+
+def publicar(evento):
+    """
+    Avisa os assinantes de que algo mudou no banco.
+
+    Chamar depois do commit. Pode ser chamado de qualquer thread.
+    """
+    with _lock:
+        imediatas = [funcao for tipo, funcao in _assinaturas if isinstance(evento, tipo)]
+        telas = [a for a in _assinaturas_tela if isinstance(evento, a[1])]
+
+    for funcao in imediatas:
+        try:
+            funcao(evento)
+        except Exception as e:
+            print(f"Erro ao tratar {evento!r}: {e}")
+
+    if not telas:
+        return
+
+    for widget, _, funcao in telas:
+        _pendentes.put((widget, funcao, evento))
+
+    # Na thread do Tkinter, entrega na hora; nas outras, o laço entrega
+    if threading.current_thread() is threading.main_thread():
+        _entregar()
+
+
+def _laco_entrega():
+    """Entrega os pendentes e continua enquanto houver telas inscritas."""
+    global _entrega_agendada
+
+    _entregar()
+
+    with _lock:
+        vivas = [a for a in _assinaturas_tela if _existe(a[0])]
+        _assinaturas_tela[:] = vivas
+        if not vivas:
+            _entrega_agendada = False
+            return
+        widget = vivas[0][0]
+
+    widget.after(INTERVALO_ENTREGA, _laco_entrega)
+
+
+def _entregar():
+    """Chama as funções das telas para os eventos pendentes (thread do Tkinter)."""
+    while True:
+        try:
+            widget, funcao, evento = _pendentes.get_nowait()
+        except queue.Empty:
+            return
+
+        if not _existe(widget):
+            continue
+
+        try:
+            funcao(evento)
+        except Exception as e:
+            print(f"Erro ao tratar {evento!r} na tela: {e}")
+
+
+def _existe(widget):
+    try:
+        return bool(widget.winfo_exists())
+    except Exception:
+        return False
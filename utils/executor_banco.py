@@ -0,0 +1,172 @@
+"""
+Execução de consultas ao banco fora da thread da interface.
+
+O Tkinter só pode ser usado pela thread principal, e uma consulta
+demorada (ou um banco travado por outro caixa) chamada direto de um
+botão congela a tela inteira. Aqui as funções dos DAOs rodam em uma
+thread separada, e o resultado volta para a tela por meio de after().
+
+Uso típico em uma tela:
+
+    executar_em_segundo_plano(
+        self,
+        listar_produtos,
+        ativos_apenas=True,
+        ao_concluir=self._mostrar_produtos
+    )
+
+Todas as tarefas rodam em uma única thread, na ordem em que foram
+enviadas: uma gravação nunca ultrapassa a consulta feita antes dela.
+"""
+
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import TclError
+
+
+# Intervalo (ms) entre as verificações de uma tarefa pendente
+INTERVALO_VERIFICACAO = 20
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def obter_executor():
+    """Retorna o executor do banco, criando-o na primeira chamada."""
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ExecutorBanco")
+        return _executor
+
+
+def executar_no_banco(funcao, *args, **kwargs):
+    """
+    Envia uma função para a thread do banco.
+
+    Args:
+        funcao: Função a executar (normalmente uma função de DAO)
+        *args, **kwargs: Argumentos da função
+
+    Returns:
+        concurrent.futures.Future: Resultado (ou exceção) da função
+    """
+    return obter_executor().submit(funcao, *args, **kwargs)
+
+
+def encerrar_executor():
+    """Encerra a thread do banco depois das tarefas já enviadas."""
+    global _executor
+
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
+
+
+def acompanhar_future(widget, future, ao_concluir=None, ao_falhar=None, intervalo=INTERVALO_VERIFICACAO):
+    """
+    Entrega o resultado de um Future à thread da interface.
+
+    Verifica o Future com widget.after() e, quando ele termina, chama
+    ao_concluir(resultado) ou ao_falhar(excecao) na thread principal.
+    Se a janela já tiver sido fechada, o resultado é descartado.
+
+    Args:
+        widget: Widget Tkinter usado para agendar as verificações
+        future: Future devolvido por executar_no_banco
+        ao_concluir: Função chamada com o resultado
+        ao_falhar: Função chamada com a exceção. Se None, o erro é impresso
+        intervalo: Milissegundos entre as verificações
+    """
+    def verificar():
+        try:
+            if not widget.winfo_exists():
+                return
+        except TclError:
+            return
+
+        if not future.done():
+            widget.after(intervalo, verificar)
+            return
+
+        erro = future.exception()
+        if erro is not None:
+            if ao_falhar:
+                ao_falhar(erro)
+            else:
+                print("Erro em tarefa do banco:")
+                traceback.print_exception(type(erro), erro, erro.__traceback__)
+            return
+
+        if ao_concluir:
+            ao_concluir(future.result())
+
+    widget.after(0 if future.done() else intervalo, verificar)
+
+
+def executar_em_segundo_plano(widget, funcao, *args, ao_concluir=None, ao_falhar=None, **kwargs):
+    """
+    Executa uma função na thread do banco e entrega o resultado à tela.
+
+    Junta executar_no_banco e acompanhar_future em uma chamada.
+
+    Returns:
+        concurrent.futures.Future: O Future da tarefa
+    """
+    future = executar_no_banco(funcao, *args, **kwargs)
+    acompanhar_future(widget, future, ao_concluir, ao_falhar)
+    return future
+
+
+class ConsultaMaisRecente:
+    """
+    Entrega à tela apenas o resultado da última consulta pedida.
+
+    Útil em buscas enquanto o usuário digita ou troca de página: se
+    uma consulta nova for pedida antes da anterior terminar, o
+    resultado da anterior é descartado.
+
+    Exemplo:
+        self.consulta_produtos = ConsultaMaisRecente(self)
+        self.consulta_produtos.executar(
+            listar_produtos,
+            filtro_nome=texto,
+            ao_concluir=self._mostrar_produtos
+        )
+    """
+
+    def __init__(self, widget):
+        self.widget = widget
+        self._numero = 0
+
+    def executar(self, funcao, *args, ao_concluir=None, ao_falhar=None, **kwargs):
+        """Executa a consulta; resultados de consultas anteriores são ignorados."""
+        self._numero += 1
+        numero = self._numero
+
+        def concluir(resultado):
+            if numero == self._numero and ao_concluir:
+                ao_concluir(resultado)
+
+        def falhar(erro):
+            if numero == self._numero:
+                if ao_falhar:
+                    ao_falhar(erro)
+                else:
+                    print(f"Erro em consulta do banco: {erro}")
+
+        return executar_em_segundo_plano(
+            self.widget,
+            funcao,
+            *args,
+            ao_concluir=concluir,
+            ao_falhar=falhar,
+            **kwargs
+        )
+
+    def cancelar(self):
+        """Descarta o resultado da consulta pendente, se houver."""
+        self._numero += 1
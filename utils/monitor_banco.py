@@ -0,0 +1,132 @@
+"""
+Detecção barata de alterações no banco (PRAGMA data_version).
+
+O SQLite incrementa o data_version de uma conexão sempre que OUTRA
+conexão grava no arquivo: outra conexão deste programa ou outro caixa
+usando o mesmo banco. Consultar o valor não lê nenhuma tabela, então
+uma tela pode perguntar a cada segundo "mudou alguma coisa?" e só
+refazer as consultas pesadas quando a resposta for sim.
+
+Uso típico em uma tela:
+
+    self.atualizacao = AtualizacaoAutomatica(self, self._carregar_dados)
+    self.atualizacao.iniciar()
+"""
+
+import sqlite3
+
+from database.conexao import obter_pool
+from utils.executor_banco import executar_em_segundo_plano, executar_no_banco
+
+
+# Intervalo (ms) entre as verificações de alteração
+INTERVALO_VERIFICACAO = 1000
+
+
+class MonitorAlteracoes:
+    """
+    Conexão própria, só de leitura, que acompanha o PRAGMA data_version.
+
+    A conexão é separada do pool: as gravações feitas pelas conexões do
+    pool também contam como "outra conexão" e são percebidas.
+    """
+
+    def __init__(self, caminho=None):
+        self.caminho = caminho or obter_pool().caminho
+        self._conexao = None
+        self._versao = None
+
+    def houve_alteracao(self):
+        """
+        Retorna True se o banco mudou desde a última chamada.
+
+        A primeira chamada só guarda a versão atual e retorna False.
+        """
+        if self._conexao is None:
+            self._conexao = sqlite3.connect(self.caminho, check_same_thread=False)
+            self._conexao.execute("PRAGMA busy_timeout = 5000")
+
+        versao = self._conexao.execute("PRAGMA data_version").fetchone()[0]
+        alterado = self._versao is not None and versao != self._versao
+        self._versao = versao
+        return alterado
+
+    def fechar(self):
+        """Fecha a conexão do monitor."""
+        if self._conexao is not None:
+            self._conexao.close()
+            self._conexao = None
+            self._versao = None
+
+
+class AtualizacaoAutomatica:
+    """
+    Chama uma função da tela sempre que o banco muda.
+
+    A verificação roda na thread do banco a cada INTERVALO_VERIFICACAO
+    ms; a próxima só é agendada quando a anterior termina, então um
+    banco ocupado nunca acumula verificações na fila. Sem gravações,
+    cada ciclo custa um PRAGMA e nenhuma consulta da tela é refeita.
+
+    Args:
+        widget: Tela dona da atualização (o ciclo termina quando ela fecha)
+        ao_alterar: Função sem argumentos chamada na thread do Tkinter
+        intervalo: Intervalo entre verificações, em ms
+    """
+
+    def __init__(self, widget, ao_alterar, intervalo=INTERVALO_VERIFICACAO):
+        self.widget = widget
+        self.ao_alterar = ao_alterar
+        self.intervalo = intervalo
+        self.monitor = MonitorAlteracoes()
+        self._agendamento = None
+        self._ativo = False
+
+    def iniciar(self):
+        """Começa a verificar (a primeira verificação só marca a versão atual)."""
+        if self._ativo:
+            return
+        self._ativo = True
+        self._verificar()
+
+    def parar(self):
+        """Para de verificar e fecha a conexão do monitor."""
+        self._ativo = False
+        if self._agendamento is not None:
+            try:
+                self.widget.after_cancel(self._agendamento)
+            except Exception:
+                pass
+            self._agendamento = None
+
+        # Pela thread do banco: uma verificação em andamento termina antes
+        executar_no_banco(self.monitor.fechar)
+
+    def _verificar(self):
+        self._agendamento = None
+        if not self._ativo:
+            return
+
+        executar_em_segundo_plano(
+            self.widget,
+            self.monitor.houve_alteracao,
+            ao_concluir=self._verificado,
+            ao_falhar=self._falhou
+        )
+
+    def _verificado(self, alterado):
+        if not self._ativo:
+            return
+
+        if alterado:
+            self.ao_alterar()
+        self._agendar()
+
+    def _falhou(self, erro):
+        # Banco travado por outro caixa, por exemplo: tenta de novo depois
+        print(f"Erro ao verificar alterações no banco: {erro}")
+        if self._ativo:
+            self._agendar()
+
+    def _agendar(self):
+        self._agendamento = self.widget.after(self.intervalo, self._verificar)
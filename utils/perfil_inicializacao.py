@@ -0,0 +1,156 @@
+"""
+Medição do tempo de abertura do sistema.
+
+Ativada pela variável de ambiente PDV_PERFIL_INICIO:
+
+    set PDV_PERFIL_INICIO=1        (Windows)
+    PDV_PERFIL_INICIO=1 python main.py
+
+Com a variável ativa, main.py mede cada etapa da abertura (imports,
+banco de dados, primeira pintura da tela de login), mostra um
+relatório no terminal e acrescenta uma linha em
+<pasta de dados>/perfil_inicializacao.jsonl, com a versão do sistema.
+
+Para comparar as versões:
+
+    python -m utils.perfil_inicializacao
+
+Sem a variável, as funções deste módulo não fazem nada.
+"""
+
+import json
+import os
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+
+ATIVO = bool(os.environ.get("PDV_PERFIL_INICIO"))
+
+# Marco zero: o momento em que este módulo foi importado (início de main.py)
+_inicio = time.perf_counter()
+_etapas = []
+_finalizado = False
+
+
+def _caminho_relatorio():
+    # Importado aqui para não medir (nem antecipar) o import do banco
+    from database.conexao import PASTA_DADOS
+    return os.path.join(PASTA_DADOS, "perfil_inicializacao.jsonl")
+
+
+@contextmanager
+def medir(etapa):
+    """
+    Mede o tempo de um bloco de código.
+
+    Exemplo:
+        with medir("import views.tela_login"):
+            from views.tela_login import TelaLogin
+    """
+    if not ATIVO:
+        yield
+        return
+
+    comeco = time.perf_counter()
+    try:
+        yield
+    finally:
+        fim = time.perf_counter()
+        _etapas.append({
+            "etapa": etapa,
+            "duracao_ms": round((fim - comeco) * 1000, 2),
+            "decorrido_ms": round((fim - _inicio) * 1000, 2)
+        })
+
+
+def marcar(etapa):
+    """Registra um instante (ex.: primeira pintura), sem duração própria."""
+    if not ATIVO:
+        return
+
+    agora = time.perf_counter()
+    _etapas.append({
+        "etapa": etapa,
+        "duracao_ms": None,
+        "decorrido_ms": round((agora - _inicio) * 1000, 2)
+    })
+
+
+def finalizar():
+    """
+    Mostra o relatório e o grava no arquivo de histórico.
+
+    Só age uma vez, e só com o perfil ativo.
+    """
+    global _finalizado
+
+    if not ATIVO or _finalizado:
+        return
+    _finalizado = True
+
+    from versao import VERSAO_APP
+
+    registro = {
+        "versao": VERSAO_APP,
+        "data": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "empacotado": bool(getattr(sys, "frozen", False)),
+        "etapas": _etapas,
+        "total_ms": _etapas[-1]["decorrido_ms"] if _etapas else 0
+    }
+
+    print()
+    print(f"⏱️  Abertura do sistema (versão {VERSAO_APP})")
+    print(f"{'Etapa':<40} {'duração':>10} {'decorrido':>10}   (ms)")
+    print("-" * 66)
+    for etapa in _etapas:
+        duracao = f"{etapa['duracao_ms']:.1f}" if etapa["duracao_ms"] is not None else "—"
+        print(f"{etapa['etapa']:<40} {duracao:>10} {etapa['decorrido_ms']:>10.1f}")
+    print()
+
+    try:
+        with open(_caminho_relatorio(), "a", encoding="utf-8") as arquivo:
+            arquivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+    except OSError as e:
+        print(f"Aviso: não foi possível gravar o perfil de abertura: {e}")
+
+
+def comparar_versoes(caminho=None):
+    """
+    Mostra a mediana de cada etapa por versão, a partir do histórico.
+
+    Args:
+        caminho: Arquivo .jsonl (padrão: o histórico na pasta de dados)
+    """
+    caminho = caminho or _caminho_relatorio()
+    if not os.path.exists(caminho):
+        print(f"Nenhum perfil de abertura encontrado em {caminho}")
+        print("Abra o sistema com PDV_PERFIL_INICIO=1 para gerar um.")
+        return
+
+    # versao -> etapa -> lista de tempos
+    tempos = {}
+    with open(caminho, "r", encoding="utf-8") as arquivo:
+        for linha in arquivo:
+            if not linha.strip():
+                continue
+            registro = json.loads(linha)
+            por_etapa = tempos.setdefault(registro["versao"], {})
+            for etapa in registro["etapas"]:
+                valor = etapa["duracao_ms"] if etapa["duracao_ms"] is not None else etapa["decorrido_ms"]
+                por_etapa.setdefault(etapa["etapa"], []).append(valor)
+            por_etapa.setdefault("TOTAL", []).append(registro["total_ms"])
+
+    print("Mediana por etapa (ms). Marcos (primeira pintura, TOTAL) mostram o tempo desde o início.")
+    for versao, por_etapa in tempos.items():
+        execucoes = len(por_etapa["TOTAL"])
+        print()
+        print(f"Versão {versao} ({execucoes} execução(ões))")
+        for etapa, valores in por_etapa.items():
+            print(f"   {etapa:<40} {statistics.median(valores):>10.1f}")
+
+
+if __name__ == "__main__":
+    comparar_versoes(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,87 @@
+"""
+Atualização de Treeviews por diferença.
+
+Apagar todas as linhas e inserir de novo faz a tabela piscar, perde a
+seleção e custa uma chamada ao Tk por linha, mesmo quando só uma
+quantidade mudou. reconciliar_treeview compara as linhas novas com as
+exibidas pelo iid e só insere, move, atualiza ou apaga o que mudou.
+
+Exemplo:
+    reconciliar_treeview(self.tree, [
+        (usuario.id, (usuario.id, usuario.nome), ())
+        for usuario in usuarios
+    ])
+"""
+
+
+def reconciliar_treeview(tree, linhas, pai=""):
+    """
+    Deixa os filhos de `pai` iguais a `linhas`, com o mínimo de chamadas ao Tk.
+
+    Os valores exibidos ficam guardados no próprio Treeview, então uma
+    linha que não mudou não custa nenhuma chamada.
+
+    Args:
+        tree: ttk.Treeview
+        linhas: Lista de (iid, values, tags), na ordem de exibição.
+                O iid identifica a linha (ex.: id do produto)
+        pai: Item pai (padrão: raiz)
+
+    Returns:
+        dict: Quantidade de linhas inseridas, movidas, atualizadas e removidas
+
+    Raises:
+        ValueError: Se dois itens tiverem o mesmo iid
+    """
+    exibidas = _linhas_exibidas(tree)
+    novas = [(str(iid), tuple(valores), tuple(tags)) for iid, valores, tags in linhas]
+
+    iids_novos = {iid for iid, _, _ in novas}
+    if len(iids_novos) != len(novas):
+        raise ValueError("Linhas com iid repetido na tabela.")
+
+    contagem = {"inseridas": 0, "movidas": 0, "atualizadas": 0, "removidas": 0}
+
+    atuais = list(tree.get_children(pai))
+
+    # Remove, de uma vez, as linhas que saíram
+    removidas = [iid for iid in atuais if iid not in iids_novos]
+    if removidas:
+        tree.delete(*removidas)
+        for iid in removidas:
+            exibidas.pop(iid, None)
+        atuais = [iid for iid in atuais if iid in iids_novos]
+        contagem["removidas"] = len(removidas)
+
+    posicao_atual = set(atuais)
+
+    for indice, (iid, valores, tags) in enumerate(novas):
+        if iid not in posicao_atual:
+            tree.insert(pai, indice, iid=iid, values=valores, tags=tags)
+            atuais.insert(indice, iid)
+            posicao_atual.add(iid)
+            exibidas[iid] = (valores, tags)
+            contagem["inseridas"] += 1
+            continue
+
+        if indice >= len(atuais) or atuais[indice] != iid:
+            tree.move(iid, pai, indice)
+            atuais.remove(iid)
+            atuais.insert(indice, iid)
+            contagem["movidas"] += 1
+
+        if exibidas.get(iid) != (valores, tags):
+            tree.item(iid, values=valores, tags=tags)
+            exibidas[iid] = (valores, tags)
+            contagem["atualizadas"] += 1
+
+    return contagem
+
+
+def _linhas_exibidas(tree):
+    """Valores e tags de cada linha, como foram enviados ao Treeview."""
+    exibidas = getattr(tree, "_linhas_exibidas", None)
+    if exibidas is None:
+        exibidas = {}
+        tree._linhas_exibidas = exibidas
+    return exibidas
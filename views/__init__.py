@@ -1,22 +1,31 @@
 """
 Views (Telas) do Sistema PDV
 Interface gráfica com o usuário
+
+As telas são importadas só quando usadas pela primeira vez
+(from views import TelaVendas importa apenas views.tela_vendas).
+Assim a tela de login abre sem carregar as demais telas.
 """
 
-from .tela_principal import TelaPrincipal
-from .tela_login import TelaLogin
-from .tela_produtos import TelaProdutos
-from .tela_vendas import TelaVendas
-from .tela_movimentacao import TelaMovimentacao
-from .tela_usuarios import TelaUsuarios
-from .tela_dashboard import TelaDashboard
+import importlib
+
+_MODULOS = {
+    'TelaPrincipal': '.tela_principal',
+    'TelaLogin': '.tela_login',
+    'TelaProdutos': '.tela_produtos',
+    'TelaVendas': '.tela_vendas',
+    'TelaMovimentacao': '.tela_movimentacao',
+    'TelaUsuarios': '.tela_usuarios',
+    'TelaDashboard': '.tela_dashboard'
+}
+
+__all__ = list(_MODULOS)
+
+
+def __getattr__(nome):
+    if nome not in _MODULOS:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
 
-__all__ = [
-    'TelaPrincipal',
-    'TelaLogin',
-    'TelaProdutos',
-    'TelaVendas',
-    'TelaMovimentacao',
-    'TelaUsuarios',
-    'TelaDashboard'
-]
\ No newline at end of file
+    classe = getattr(importlib.import_module(_MODULOS[nome], __name__), nome)
+    globals()[nome] = classe
+    return classe
@@ -0,0 +1,178 @@
+"""
+Gráfico de barras em um tk.Canvas que reaproveita os itens desenhados.
+
+Apagar o canvas e recriar cada retângulo e texto a cada atualização
+custa mais quanto maior o período (90 barras = 270 itens recriados) e
+faz o gráfico piscar. O GraficoBarras cria os itens uma vez e, nas
+atualizações, só move (coords) e troca textos (itemconfig) dos que
+mudaram. Itens novos só são criados quando o período passa do maior
+já mostrado; as barras que sobram ficam escondidas para a próxima vez.
+
+O gráfico acompanha o tamanho do canvas: o <Configure> reposiciona as
+barras, com uma espera curta para que arrastar a borda da janela não
+redesenhe a cada pixel.
+
+Exemplo:
+    grafico = GraficoBarras(canvas, cor="#4CAF50", formatar_valor=formatar_moeda)
+    grafico.atualizar([("01/12", 150.0), ("02/12", 0.0), ("03/12", 89.9)])
+"""
+
+import math
+
+
+# Espera (ms) depois do último <Configure> antes de reposicionar
+ESPERA_REDIMENSIONAR = 100
+
+# Largura mínima (px) de uma barra para mostrar o valor acima dela
+LARGURA_MINIMA_VALOR = 45
+
+# Distância mínima (px) entre os rótulos do eixo; os demais são escondidos
+ESPACO_MINIMO_ROTULO = 40
+
+
+class GraficoBarras:
+    """
+    Gráfico de barras verticais com rótulo embaixo e valor em cima.
+
+    Args:
+        canvas: tk.Canvas onde o gráfico é desenhado
+        cor: Cor das barras e dos valores
+        formatar_valor: Função valor -> texto (ex.: formatar_moeda)
+        texto_vazio: Mensagem mostrada quando não há dados
+    """
+
+    MARGEM_ESQUERDA = 50
+    MARGEM_DIREITA = 20
+    MARGEM_TOPO = 20
+    MARGEM_BASE = 40
+
+    def __init__(self, canvas, cor="#4CAF50", formatar_valor=str, texto_vazio="Sem dados"):
+        self.canvas = canvas
+        self.cor = cor
+        self.formatar_valor = formatar_valor
+
+        self.dados = []          # [(rotulo, valor)]
+        self._barras = []        # [{"barra", "rotulo", "valor": ids, "aparencia", "visivel"}]
+        self._tamanho = None     # (largura, altura) do último posicionamento
+        self._redimensionamento = None
+
+        self._linha_base = canvas.create_line(0, 0, 0, 0, fill="gray", width=2)
+        self._texto_vazio = canvas.create_text(
+            0, 0,
+            text=texto_vazio,
+            font=("Arial", 12),
+            fill="gray",
+            state="hidden"
+        )
+
+        canvas.bind("<Configure>", self._ao_redimensionar, add="+")
+
+    # =========================
+    # Dados
+    # =========================
+    def atualizar(self, dados):
+        """
+        Mostra novos dados, reaproveitando os itens já desenhados.
+
+        Args:
+            dados: Lista de (rotulo, valor), na ordem das barras
+        """
+        self.dados = list(dados)
+        self._ajustar_quantidade(len(self.dados))
+        self._posicionar()
+
+    def _ajustar_quantidade(self, quantidade):
+        """Cria itens só para barras além das já existentes; esconde as que sobram."""
+        while len(self._barras) < quantidade:
+            self._barras.append({
+                "barra": self.canvas.create_rectangle(0, 0, 0, 0, fill=self.cor, outline=self.cor),
+                "rotulo": self.canvas.create_text(0, 0, font=("Arial", 8), fill="black"),
+                "valor": self.canvas.create_text(0, 0, font=("Arial", 8, "bold"), fill=self.cor),
+                "aparencia": None,
+                "visivel": True,
+            })
+
+        for i, itens in enumerate(self._barras):
+            visivel = i < quantidade
+            if itens["visivel"] == visivel:
+                continue
+
+            itens["visivel"] = visivel
+            if visivel:
+                # Textos voltam a aparecer pela "aparencia" no posicionamento
+                self.canvas.itemconfigure(itens["barra"], state="normal")
+            else:
+                for chave in ("barra", "rotulo", "valor"):
+                    self.canvas.itemconfigure(itens[chave], state="hidden")
+                itens["aparencia"] = None
+
+    # =========================
+    # Posicionamento
+    # =========================
+    def _ao_redimensionar(self, event):
+        if self._redimensionamento is not None:
+            self.canvas.after_cancel(self._redimensionamento)
+        self._redimensionamento = self.canvas.after(ESPERA_REDIMENSIONAR, self._redimensionado)
+
+    def _redimensionado(self):
+        self._redimensionamento = None
+        if self._medir() != self._tamanho:
+            self._posicionar()
+
+    def _medir(self):
+        largura = self.canvas.winfo_width()
+        altura = self.canvas.winfo_height()
+
+        # Antes de aparecer na tela, o canvas informa 1x1
+        if largura <= 1:
+            largura = int(self.canvas.cget("width") or 600)
+        if altura <= 1:
+            altura = int(self.canvas.cget("height") or 200)
+        return largura, altura
+
+    def _posicionar(self):
+        """Move as barras e textos para o tamanho atual do canvas."""
+        self._tamanho = largura, altura = self._medir()
+        base = altura - self.MARGEM_BASE
+
+        self.canvas.coords(self._linha_base, self.MARGEM_ESQUERDA, base, largura - self.MARGEM_DIREITA, base)
+
+        if not self.dados:
+            self.canvas.coords(self._texto_vazio, largura / 2, altura / 2)
+            self.canvas.itemconfigure(self._texto_vazio, state="normal")
+            return
+        self.canvas.itemconfigure(self._texto_vazio, state="hidden")
+
+        area_largura = max(largura - self.MARGEM_ESQUERDA - self.MARGEM_DIREITA, 1)
+        area_altura = max(base - self.MARGEM_TOPO, 1)
+
+        valor_max = max(valor for _, valor in self.dados) or 100  # Evita divisão por zero
+
+        passo = area_largura / len(self.dados)
+        largura_barra = passo * 0.7
+        mostrar_valores = largura_barra >= LARGURA_MINIMA_VALOR
+
+        # Com muitas barras, só um rótulo a cada "pulo" (sempre o último)
+        pulo = max(1, math.ceil(ESPACO_MINIMO_ROTULO / passo))
+        ultimo = len(self.dados) - 1
+
+        for i, ((rotulo, valor), itens) in enumerate(zip(self.dados, self._barras)):
+            x = self.MARGEM_ESQUERDA + i * passo
+            y1 = base - (valor / valor_max) * area_altura
+            centro = x + largura_barra / 2
+
+            self.canvas.coords(itens["barra"], x, y1, x + largura_barra, base)
+            self.canvas.coords(itens["rotulo"], centro, base + 15)
+            self.canvas.coords(itens["valor"], centro, y1 - 10)
+
+            # Textos e visibilidade só são trocados quando mudam
+            aparencia = (
+                rotulo,
+                self.formatar_valor(valor) if valor > 0 else "",
+                "normal" if (ultimo - i) % pulo == 0 else "hidden",
+                "normal" if mostrar_valores else "hidden",
+            )
+            if aparencia != itens["aparencia"]:
+                self.canvas.itemconfigure(itens["rotulo"], text=aparencia[0], state=aparencia[2])
+                self.canvas.itemconfigure(itens["valor"], text=aparencia[1], state=aparencia[3])
+                itens["aparencia"] = aparencia
@@ -0,0 +1,392 @@
+"""
+Lista virtual para Treeviews com muitas linhas.
+
+Inserir dezenas de milhares de linhas em um ttk.Treeview custa
+segundos na thread da interface. A ListaVirtual mantém no Treeview
+apenas uma janela de poucos blocos de linhas: quando a rolagem chega
+perto do fim (ou do começo) da janela, o bloco seguinte (ou anterior)
+é buscado na fonte e o bloco da outra ponta é descartado.
+
+As fontes seguem o formato da paginação por cursor dos DAOs:
+
+    fonte.buscar(cursor, direcao, tamanho) -> {
+        "itens": [...],
+        "cursor_inicio": ..., "cursor_fim": ...,
+        "tem_mais": bool
+    }
+
+FontePaginada adapta uma função de DAO (ex.: listar_produtos_pagina)
+e roda na thread do banco; FonteLista adapta uma lista já em memória.
+
+Exemplo:
+    self.lista = ListaVirtual(
+        self.tree,
+        montar_linha=lambda p: (p.id, (p.nome, p.estoque), ()),
+        scrollbar=scrollbar
+    )
+    self.lista.carregar(FontePaginada(listar_produtos_pagina, "produtos", ativos_apenas=True))
+"""
+
+from tkinter import TclError
+
+from utils.executor_banco import ConsultaMaisRecente
+from utils.treeview import reconciliar_treeview
+
+
+# Linhas buscadas de cada vez
+TAMANHO_BLOCO = 100
+
+# Blocos mantidos no Treeview ao mesmo tempo
+MAXIMO_BLOCOS = 3
+
+
+# =========================
+# Fontes de dados
+# =========================
+
+class FontePaginada:
+    """
+    Fonte que lê blocos de uma função de DAO com paginação por cursor.
+
+    Args:
+        funcao: Função que aceita cursor, direcao e tamanho_pagina
+                (ex.: listar_produtos_pagina)
+        chave_itens: Chave da lista de itens no resultado (ex.: "produtos")
+        **parametros: Filtros repassados à função em toda busca
+    """
+
+    no_banco = True
+
+    def __init__(self, funcao, chave_itens, **parametros):
+        self.funcao = funcao
+        self.chave_itens = chave_itens
+        self.parametros = parametros
+
+    def buscar(self, cursor, direcao, tamanho):
+        pagina = self.funcao(
+            **self.parametros,
+            cursor=cursor,
+            direcao=direcao,
+            tamanho_pagina=tamanho
+        )
+        return {
+            "itens": pagina[self.chave_itens],
+            "cursor_inicio": pagina["cursor_inicio"],
+            "cursor_fim": pagina["cursor_fim"],
+            "tem_mais": pagina["tem_mais"]
+        }
+
+
+class FonteLista:
+    """
+    Fonte sobre uma lista já carregada; o cursor é a posição na lista.
+
+    Não consulta o banco, então os blocos são entregues na hora.
+    """
+
+    no_banco = False
+
+    def __init__(self, itens):
+        self.itens = list(itens)
+
+    def buscar(self, cursor, direcao, tamanho):
+        if direcao == "proxima":
+            inicio = 0 if cursor is None else cursor + 1
+            fim = min(inicio + tamanho, len(self.itens))
+            tem_mais = fim < len(self.itens)
+        else:
+            fim = len(self.itens) if cursor is None else cursor
+            inicio = max(fim - tamanho, 0)
+            tem_mais = inicio > 0
+
+        return {
+            "itens": self.itens[inicio:fim],
+            "cursor_inicio": inicio if fim > inicio else None,
+            "cursor_fim": fim - 1 if fim > inicio else None,
+            "tem_mais": tem_mais
+        }
+
+
+# =========================
+# Lista virtual
+# =========================
+
+class ListaVirtual:
+    """
+    Mostra uma fonte de dados em um Treeview, um bloco por vez.
+
+    Args:
+        tree: ttk.Treeview já criado (colunas, cabeçalhos e tags)
+        montar_linha: Função item -> (iid, values, tags)
+        scrollbar: Scrollbar vertical ligada ao Treeview (opcional)
+        tamanho_bloco: Linhas buscadas de cada vez
+        maximo_blocos: Blocos mantidos no Treeview ao mesmo tempo
+        ao_carregar: Função chamada depois de cada bloco exibido
+    """
+
+    def __init__(self, tree, montar_linha, scrollbar=None,
+                 tamanho_bloco=TAMANHO_BLOCO, maximo_blocos=MAXIMO_BLOCOS,
+                 ao_carregar=None):
+        self.tree = tree
+        self.montar_linha = montar_linha
+        self.scrollbar = scrollbar
+        self.tamanho_bloco = tamanho_bloco
+        self.maximo_blocos = max(maximo_blocos, 2)
+        self.ao_carregar = ao_carregar
+
+        self.fonte = None
+        # Cada bloco: {"linhas": [(iid, values, tags)], "cursor_inicio": ..., "cursor_fim": ...}
+        self.blocos = []
+        self.itens_por_iid = {}
+        self.tem_antes = False
+        self.tem_depois = False
+
+        self._carregando = False
+        self._consulta = ConsultaMaisRecente(tree)
+
+        self.tree.configure(yscrollcommand=self._ao_rolar)
+        if self.scrollbar is not None:
+            self.scrollbar.configure(command=self.tree.yview)
+
+        self.tree.bind("<Home>", lambda e: self._ir_para_ponta("proxima"), add="+")
+        self.tree.bind("<End>", lambda e: self._ir_para_ponta("anterior"), add="+")
+
+    # =========================
+    # API pública
+    # =========================
+    def carregar(self, fonte):
+        """Troca a fonte e mostra o primeiro bloco dela."""
+        self.fonte = fonte
+        self._ir_para_ponta("proxima")
+
+    def recarregar(self):
+        """
+        Busca de novo os dados da fonte atual, sem voltar ao início.
+
+        A janela recomeça no bloco que contém a primeira linha visível
+        (a partir do fim do bloco anterior), e a rolagem é mantida.
+        """
+        if self.fonte is None:
+            return
+
+        primeira = self._primeira_linha_visivel()
+        inicio_bloco = 0
+        cursor = None
+
+        for indice, bloco in enumerate(self.blocos):
+            if primeira < inicio_bloco + len(bloco["linhas"]):
+                if indice > 0:
+                    cursor = self.blocos[indice - 1]["cursor_fim"]
+                break
+            inicio_bloco += len(bloco["linhas"])
+
+        if cursor is None:
+            # Sem um bloco anterior na janela: recomeça do início
+            self._ir_para_ponta("proxima")
+            return
+
+        self._buscar(
+            cursor,
+            "proxima",
+            lambda resultado: self._substituir(resultado, tem_antes=True, primeira_linha=primeira - inicio_bloco)
+        )
+
+    def limpar(self):
+        """Esvazia o Treeview e esquece a fonte."""
+        self._consulta.cancelar()
+        self._carregando = False
+        self.fonte = None
+        self._apagar_tudo()
+
+    def item(self, iid):
+        """Item (da fonte) exibido na linha iid, ou None."""
+        return self.itens_por_iid.get(str(iid))
+
+    def quantidade_exibida(self):
+        """Quantidade de linhas no Treeview no momento."""
+        return len(self.itens_por_iid)
+
+    def no_inicio(self):
+        """True se a janela começa no primeiro bloco e está rolada até o topo."""
+        if self.tem_antes:
+            return False
+        try:
+            return float(self.tree.yview()[0]) == 0
+        except TclError:
+            return True
+
+    # =========================
+    # Busca de blocos
+    # =========================
+    def _buscar(self, cursor, direcao, ao_concluir):
+        fonte = self.fonte
+        self._carregando = True
+
+        def concluir(resultado):
+            self._carregando = False
+            if fonte is self.fonte:
+                ao_concluir(resultado)
+
+        def falhar(erro):
+            self._carregando = False
+            print(f"Erro ao carregar a lista: {erro}")
+
+        if fonte.no_banco:
+            self._consulta.executar(
+                fonte.buscar, cursor, direcao, self.tamanho_bloco,
+                ao_concluir=concluir,
+                ao_falhar=falhar
+            )
+        else:
+            self._consulta.cancelar()
+            concluir(fonte.buscar(cursor, direcao, self.tamanho_bloco))
+
+    def _ir_para_ponta(self, direcao):
+        """Mostra o primeiro ("proxima") ou o último ("anterior") bloco."""
+        if self.fonte is None:
+            return "break"
+
+        if direcao == "proxima":
+            self._buscar(None, "proxima", lambda r: self._substituir(r, tem_antes=False, primeira_linha=0))
+        else:
+            self._buscar(None, "anterior", self._substituir_pelo_fim)
+        return "break"
+
+    def _ao_rolar(self, primeiro, ultimo):
+        """yscrollcommand do Treeview: busca mais linhas perto das pontas."""
+        if self.scrollbar is not None:
+            self.scrollbar.set(primeiro, ultimo)
+
+        if self._carregando or self.fonte is None or not self.blocos:
+            return
+
+        total = len(self.itens_por_iid)
+        margem = self.tamanho_bloco // 2
+
+        if self.tem_depois and (1 - float(ultimo)) * total < margem:
+            self._buscar(self.blocos[-1]["cursor_fim"], "proxima", self._acrescentar_no_fim)
+        elif self.tem_antes and float(primeiro) * total < margem:
+            self._buscar(self.blocos[0]["cursor_inicio"], "anterior", self._acrescentar_no_inicio)
+
+    # =========================
+    # Atualização do Treeview
+    # =========================
+    # Os métodos abaixo só mudam self.blocos; _exibir() leva a diferença
+    # ao Treeview. Recarregar o mesmo trecho não mexe nas linhas iguais.
+    def _substituir(self, resultado, tem_antes, primeira_linha):
+        self.blocos = []
+        self.itens_por_iid = {}
+        self.tem_antes = tem_antes
+        self.tem_depois = resultado["tem_mais"]
+        self._adicionar_bloco(resultado, "end")
+        self._exibir()
+        self._rolar_para(primeira_linha)
+        self._notificar()
+
+    def _substituir_pelo_fim(self, resultado):
+        self.blocos = []
+        self.itens_por_iid = {}
+        self.tem_antes = resultado["tem_mais"]
+        self.tem_depois = False
+        self._adicionar_bloco(resultado, "end")
+        self._exibir()
+        self._rolar_para(len(self.itens_por_iid))
+        self._notificar()
+
+    def _acrescentar_no_fim(self, resultado):
+        primeira = self._primeira_linha_visivel()
+        self.tem_depois = resultado["tem_mais"]
+        self._adicionar_bloco(resultado, "end")
+
+        if len(self.blocos) > self.maximo_blocos:
+            primeira -= self._descartar_bloco(0)
+            self.tem_antes = True
+
+        self._exibir()
+        self._rolar_para(primeira)
+        self._notificar()
+
+    def _acrescentar_no_inicio(self, resultado):
+        primeira = self._primeira_linha_visivel()
+        self.tem_antes = resultado["tem_mais"]
+        primeira += self._adicionar_bloco(resultado, 0)
+
+        if len(self.blocos) > self.maximo_blocos:
+            self._descartar_bloco(len(self.blocos) - 1)
+            self.tem_depois = True
+
+        self._exibir()
+        self._rolar_para(primeira)
+        self._notificar()
+
+    def _adicionar_bloco(self, resultado, posicao):
+        """
+        Guarda as linhas de um bloco no fim ("end") ou no início (0) da janela.
+
+        Returns:
+            int: Quantidade de linhas novas
+        """
+        if not resultado["itens"]:
+            return 0
+
+        linhas = []
+        for item in resultado["itens"]:
+            iid, valores, tags = self.montar_linha(item)
+            iid = str(iid)
+            # A fonte pode ter mudado entre dois blocos; não repete linhas
+            if iid in self.itens_por_iid:
+                continue
+
+            self.itens_por_iid[iid] = item
+            linhas.append((iid, valores, tags))
+
+        bloco = {
+            "linhas": linhas,
+            "cursor_inicio": resultado["cursor_inicio"],
+            "cursor_fim": resultado["cursor_fim"]
+        }
+        if posicao == 0:
+            self.blocos.insert(0, bloco)
+        else:
+            self.blocos.append(bloco)
+
+        return len(linhas)
+
+    def _descartar_bloco(self, indice):
+        """Tira um bloco da janela e retorna quantas linhas saíram."""
+        bloco = self.blocos.pop(indice)
+        for iid, _, _ in bloco["linhas"]:
+            self.itens_por_iid.pop(iid, None)
+        return len(bloco["linhas"])
+
+    def _apagar_tudo(self):
+        self.blocos = []
+        self.itens_por_iid = {}
+        self.tem_antes = False
+        self.tem_depois = False
+        self._exibir()
+
+    def _exibir(self):
+        """Leva as linhas dos blocos ao Treeview, só com o que mudou."""
+        reconciliar_treeview(
+            self.tree,
+            [linha for bloco in self.blocos for linha in bloco["linhas"]]
+        )
+
+    def _primeira_linha_visivel(self):
+        total = len(self.itens_por_iid)
+        if not total:
+            return 0
+        try:
+            return int(round(float(self.tree.yview()[0]) * total))
+        except TclError:
+            return 0
+
+    def _rolar_para(self, linha):
+        total = len(self.itens_por_iid)
+        if total:
+            self.tree.yview_moveto(max(0, min(linha, total)) / total)
+
+    def _notificar(self):
+        if self.ao_carregar:
+            self.ao_carregar()
@@ -11,6 +11,13 @@ from dao.vendas_dao import (
     obter_estatisticas_gerais
 )
 from utils.validadores import formatar_moeda
+from utils.executor_banco import executar_em_segundo_plano, ConsultaMaisRecente
+from utils.monitor_banco import AtualizacaoAutomatica
+from views.grafico_barras import GraficoBarras
+
+
+# Períodos (em dias) do histórico de vendas
+PERIODOS_HISTORICO = (7, 30, 90)
 
 
 class TelaDashboard(tk.Toplevel):
@@ -21,7 +28,7 @@ class TelaDashboard(tk.Toplevel):
     - Vendas de hoje e do mês
     - Top 5 produtos mais vendidos
     - Vendas por forma de pagamento
-    - Histórico dos últimos 7 dias
+    - Histórico dos últimos 7, 30 ou 90 dias
     - Estatísticas gerais do sistema
     """
     
@@ -40,6 +47,12 @@ class TelaDashboard(tk.Toplevel):
         self.COR_FUNDO_CARD = "#f5f5f5"
         
         self._criar_widgets()
+        
+        # Recarrega só quando o banco muda (vendas deste ou de outro caixa);
+        # sem gravações, cada segundo custa apenas um PRAGMA data_version.
+        # Iniciada antes da primeira carga: nada gravado entre as duas se perde.
+        self.atualizacao = AtualizacaoAutomatica(self, self._carregar_dados)
+        self.atualizacao.iniciar()
         self._carregar_dados()
     
     def _criar_widgets(self):
@@ -281,67 +294,99 @@ class TelaDashboard(tk.Toplevel):
         self.tree_pagamento.pack(fill="both", expand=True)
     
     def _criar_historico_vendas(self, parent):
-        """Cria o gráfico de histórico de vendas dos últimos 7 dias."""
-        frame = tk.LabelFrame(
+        """Cria o gráfico de histórico de vendas (7, 30 ou 90 dias)."""
+        self.var_periodo = tk.IntVar(value=PERIODOS_HISTORICO[0])
+        self.consulta_historico = ConsultaMaisRecente(self)
+        
+        self.frame_historico = tk.LabelFrame(
             parent,
-            text="📈 Histórico dos Últimos 7 Dias",
+            text=f"📈 Histórico dos Últimos {self.var_periodo.get()} Dias",
             font=("Arial", 12, "bold"),
             bg="white",
             padx=15,
             pady=15
         )
-        frame.pack(fill="both", expand=True)
-        
-        # Canvas para o gráfico
+        self.frame_historico.pack(fill="both", expand=True)
+        
+        # Escolha do período
+        frame_periodo = tk.Frame(self.frame_historico, bg="white")
+        frame_periodo.pack(fill="x")
+        
+        for dias in PERIODOS_HISTORICO:
+            tk.Radiobutton(
+                frame_periodo,
+                text=f"{dias} dias",
+                variable=self.var_periodo,
+                value=dias,
+                command=self._mudar_periodo,
+                indicatoron=0,
+                font=("Arial", 9),
+                padx=10,
+                cursor="hand2"
+            ).pack(side="right", padx=2)
+        
+        # Canvas para o gráfico: os itens são criados uma vez e reaproveitados
         self.canvas_grafico = tk.Canvas(
-            frame,
+            self.frame_historico,
             bg="white",
             height=200
         )
         self.canvas_grafico.pack(fill="both", expand=True, pady=10)
+        
+        self.grafico_historico = GraficoBarras(
+            self.canvas_grafico,
+            cor=self.COR_SUCESSO,
+            formatar_valor=formatar_moeda,
+            texto_vazio="Nenhuma venda no período"
+        )
     
     def _carregar_dados(self):
-        """Carrega todos os dados do dashboard."""
-        try:
-            # Estatísticas gerais
-            stats = obter_estatisticas_gerais()
-            
-            # Atualiza cards
-            vendas_hoje = obter_vendas_hoje()
-            self.card_hoje.label_valor.config(text=formatar_moeda(vendas_hoje))
-            
-            vendas_mes = obter_vendas_mes_atual()
-            self.card_mes.label_valor.config(text=formatar_moeda(vendas_mes))
-            
-            self.card_ticket.label_valor.config(
-                text=formatar_moeda(stats["ticket_medio"])
-            )
-            
-            self.card_total.label_valor.config(
-                text=str(stats["total_vendas"])
-            )
-            
-            # Atualiza produtos mais vendidos
-            self._atualizar_top_produtos()
-            
-            # Atualiza formas de pagamento
-            self._atualizar_formas_pagamento()
-            
-            # Atualiza histórico
-            self._desenhar_grafico_historico()
-            
-        except Exception as e:
-            print(f"Erro ao carregar dados: {e}")
+        """
+        Carrega todos os dados do dashboard.
+
+        As consultas rodam na thread do banco; o relógio e a janela
+        continuam respondendo enquanto elas não terminam.
+        """
+        executar_em_segundo_plano(
+            self,
+            _buscar_dados_dashboard,
+            self.var_periodo.get(),
+            ao_concluir=self._mostrar_dados,
+            ao_falhar=lambda e: print(f"Erro ao carregar dados: {e}")
+        )
+    
+    def _mostrar_dados(self, dados):
+        """Preenche os cards, tabelas e gráfico com os dados carregados."""
+        stats = dados["estatisticas"]
+        
+        # Atualiza cards
+        self.card_hoje.label_valor.config(text=formatar_moeda(dados["vendas_hoje"]))
+        self.card_mes.label_valor.config(text=formatar_moeda(dados["vendas_mes"]))
+        
+        self.card_ticket.label_valor.config(
+            text=formatar_moeda(stats["ticket_medio"])
+        )
+        
+        self.card_total.label_valor.config(
+            text=str(stats["total_vendas"])
+        )
+        
+        # Atualiza produtos mais vendidos
+        self._atualizar_top_produtos(dados["top_produtos"])
+        
+        # Atualiza formas de pagamento
+        self._atualizar_formas_pagamento(dados["formas_pagamento"])
+        
+        # Atualiza histórico (se o período não mudou durante a consulta)
+        if dados["dias_historico"] == self.var_periodo.get():
+            self._desenhar_grafico_historico(dados["ultimos_dias"])
     
-    def _atualizar_top_produtos(self):
+    def _atualizar_top_produtos(self, produtos):
         """Atualiza a lista de produtos mais vendidos."""
         # Limpa tabela
         for item in self.tree_produtos.get_children():
             self.tree_produtos.delete(item)
         
-        # Busca dados
-        produtos = obter_produtos_mais_vendidos(limite=5)
-        
         # Preenche tabela
         for i, produto in enumerate(produtos, 1):
             # Medalhas para os 3 primeiros
@@ -360,15 +405,12 @@ class TelaDashboard(tk.Toplevel):
                 formatar_moeda(produto["valor_total"])
             ))
     
-    def _atualizar_formas_pagamento(self):
+    def _atualizar_formas_pagamento(self, formas):
         """Atualiza a lista de vendas por forma de pagamento."""
         # Limpa tabela
         for item in self.tree_pagamento.get_children():
             self.tree_pagamento.delete(item)
         
-        # Busca dados
-        formas = obter_vendas_por_forma_pagamento()
-        
         if not formas:
             return
         
@@ -386,87 +428,20 @@ class TelaDashboard(tk.Toplevel):
                 f"{percentual:.1f}%"
             ))
     
-    def _desenhar_grafico_historico(self):
-        """Desenha um gráfico de barras simples com o histórico de vendas."""
-        # Limpa canvas
-        self.canvas_grafico.delete("all")
-        
-        # Busca dados
-        vendas = obter_vendas_ultimos_dias(dias=7)
-        
-        if not vendas:
-            self.canvas_grafico.create_text(
-                300, 100,
-                text="Nenhuma venda nos últimos 7 dias",
-                font=("Arial", 12),
-                fill="gray"
-            )
-            return
-        
-        # Dimensões
-        largura = self.canvas_grafico.winfo_width() or 600
-        altura = 180
-        margem_esquerda = 50
-        margem_direita = 20
-        margem_topo = 20
-        margem_base = 40
-        
-        # Área útil
-        area_largura = largura - margem_esquerda - margem_direita
-        area_altura = altura - margem_topo - margem_base
-        
-        # Valor máximo para escala
-        valor_max = max(v["total"] for v in vendas)
-        if valor_max == 0:
-            valor_max = 100  # Evita divisão por zero
-        
-        # Largura de cada barra
-        largura_barra = area_largura / len(vendas) * 0.7
-        espaco = area_largura / len(vendas) * 0.3
-        
-        # Desenha as barras
-        for i, venda in enumerate(vendas):
-            # Calcula posição e altura da barra
-            x = margem_esquerda + (i * (largura_barra + espaco))
-            altura_barra = (venda["total"] / valor_max) * area_altura if valor_max > 0 else 0
-            y1 = margem_topo + area_altura - altura_barra
-            y2 = margem_topo + area_altura
-            
-            # Cor da barra (gradiente de verde)
-            cor = self.COR_SUCESSO
-            
-            # Desenha barra
-            self.canvas_grafico.create_rectangle(
-                x, y1, x + largura_barra, y2,
-                fill=cor,
-                outline=cor
-            )
-            
-            # Label da data
-            self.canvas_grafico.create_text(
-                x + largura_barra/2, y2 + 15,
-                text=venda["data"],
-                font=("Arial", 8),
-                fill="black"
-            )
-            
-            # Valor acima da barra
-            if venda["total"] > 0:
-                self.canvas_grafico.create_text(
-                    x + largura_barra/2, y1 - 10,
-                    text=formatar_moeda(venda["total"]),
-                    font=("Arial", 8, "bold"),
-                    fill=cor
-                )
-        
-        # Linha de base
-        self.canvas_grafico.create_line(
-            margem_esquerda,
-            margem_topo + area_altura,
-            largura - margem_direita,
-            margem_topo + area_altura,
-            fill="gray",
-            width=2
+    def _desenhar_grafico_historico(self, vendas):
+        """Atualiza o gráfico de barras com o histórico de vendas."""
+        self.grafico_historico.atualizar(
+            [(venda["data"], venda["total"]) for venda in vendas]
+        )
+    
+    def _mudar_periodo(self):
+        """Busca só o histórico do período escolhido (7, 30 ou 90 dias)."""
+        dias = self.var_periodo.get()
+        self.frame_historico.config(text=f"📈 Histórico dos Últimos {dias} Dias")
+        self.consulta_historico.executar(
+            obter_vendas_ultimos_dias,
+            dias=dias,
+            ao_concluir=self._desenhar_grafico_historico
         )
     
     def _atualizar_datetime(self):
@@ -477,6 +452,32 @@ class TelaDashboard(tk.Toplevel):
         
         # Atualiza a cada segundo
         self.after(1000, self._atualizar_datetime)
+    
+    def destroy(self):
+        """Fecha a tela e para a verificação de alterações."""
+        self.atualizacao.parar()
+        super().destroy()
+
+
+def _buscar_dados_dashboard(dias_historico=7):
+    """
+    Executa todas as consultas do dashboard (na thread do banco).
+
+    Args:
+        dias_historico: Período do gráfico de histórico, em dias
+
+    Returns:
+        dict: Dados prontos para a tela
+    """
+    return {
+        "estatisticas": obter_estatisticas_gerais(),
+        "vendas_hoje": obter_vendas_hoje(),
+        "vendas_mes": obter_vendas_mes_atual(),
+        "top_produtos": obter_produtos_mais_vendidos(limite=5),
+        "formas_pagamento": obter_vendas_por_forma_pagamento(),
+        "ultimos_dias": obter_vendas_ultimos_dias(dias=dias_historico),
+        "dias_historico": dias_historico
+    }
 
 
 if __name__ == "__main__":
@@ -485,4 +486,4 @@ if __name__ == "__main__":
     root.withdraw()
     
     app = TelaDashboard(root)
-    app.mainloop()
\ No newline at end of file
+    app.mainloop()
@@ -5,8 +5,17 @@ from dao.produtos_dao import listar_produtos
 from dao.estoque_dao import (
     registrar_entrada,
     registrar_saida,
-    listar_movimentacoes
+    listar_movimentacoes_pagina,
+    contar_movimentacoes
 )
+from utils.eventos import (
+    assinar_na_tela,
+    ProdutosAlterados,
+    EstoqueAlterado
+)
+from utils.executor_banco import executar_em_segundo_plano
+from views.lista_virtual import ListaVirtual, FontePaginada
+from views.tela_nota_entrada import TelaNotaEntrada
 
 
 class TelaMovimentacao(tk.Toplevel):
@@ -18,6 +27,7 @@ class TelaMovimentacao(tk.Toplevel):
         # Configura cor de fundo
         self.configure(bg="#f5f5f5")
 
+        self.usuario_logado = usuario_logado
         self.produtos = []
         self.produto_selecionado_id = None
 
@@ -25,6 +35,11 @@ class TelaMovimentacao(tk.Toplevel):
         self._carregar_produtos()
         self._carregar_movimentacoes()
 
+        # Gravações desta e de outras telas (vendas, cadastro de produtos).
+        # Toda alteração de estoque também entra no histórico exibido.
+        assinar_na_tela(self, EstoqueAlterado, self._estoque_alterado)
+        assinar_na_tela(self, ProdutosAlterados, self._produtos_alterados)
+
     # =========================
     # INTERFACE
     # =========================
@@ -172,6 +187,20 @@ class TelaMovimentacao(tk.Toplevel):
             pady=8
         ).pack(side="left")
 
+        # Recebimento com várias linhas (gravado de uma vez)
+        tk.Button(
+            row3,
+            text="📦 Nota de Entrada",
+            command=self._abrir_nota_entrada,
+            bg="#2196F3",
+            fg="white",
+            font=("Arial", 10, "bold"),
+            relief="flat",
+            cursor="hand2",
+            padx=15,
+            pady=8
+        ).pack(side="right")
+
         # ========================================
         # FRAME HISTÓRICO - Lista de Movimentações
         # ========================================
@@ -190,7 +219,7 @@ class TelaMovimentacao(tk.Toplevel):
         tree_container = tk.Frame(frame_lista, bg="white")
         tree_container.pack(fill="both", expand=True)
 
-        # Scrollbar
+        # Scrollbar (ligada à tabela pela lista virtual)
         scrollbar = ttk.Scrollbar(tree_container, orient="vertical")
         scrollbar.pack(side="right", fill="y")
 
@@ -201,11 +230,8 @@ class TelaMovimentacao(tk.Toplevel):
             tree_container,
             columns=colunas,
             show="headings",
-            yscrollcommand=scrollbar.set,
             height=12
         )
-        
-        scrollbar.config(command=self.tree.yview)
 
         # Configuração das colunas
         self.tree.heading("id", text="ID")
@@ -227,6 +253,14 @@ class TelaMovimentacao(tk.Toplevel):
         # Estilo para linhas alternadas
         self.tree.tag_configure("entrada", background="#e8f5e9")
         self.tree.tag_configure("saida", background="#ffebee")
+
+        # O histórico pode ter dezenas de milhares de linhas: a tabela
+        # guarda só os blocos próximos da rolagem
+        self.lista_movimentacoes = ListaVirtual(
+            self.tree,
+            montar_linha=_montar_linha_movimentacao,
+            scrollbar=scrollbar
+        )
         
         # Rodapé com informações
         frame_footer = tk.Frame(self, bg="#f5f5f5")
@@ -240,6 +274,15 @@ class TelaMovimentacao(tk.Toplevel):
             fg="#666"
         ).pack(side="left")
 
+        self.label_total = tk.Label(
+            frame_footer,
+            text="",
+            font=("Arial", 9),
+            bg="#f5f5f5",
+            fg="#666"
+        )
+        self.label_total.pack(side="right")
+
     # =========================
     # AÇÕES
     # =========================
@@ -253,13 +296,62 @@ class TelaMovimentacao(tk.Toplevel):
             self.btn_registrar.config(bg="#f44336")
 
     def _carregar_produtos(self):
-        self.produtos = listar_produtos()
+        """Busca os produtos na thread do banco e preenche o combobox."""
+        executar_em_segundo_plano(self, listar_produtos, ao_concluir=self._preencher_produtos)
+
+    def _preencher_produtos(self, produtos):
+        # O texto do combobox traz o estoque: guarda o produto escolhido
+        # para selecioná-lo de novo com o texto atualizado
+        indice = self.combo_produto.current()
+        selecionado = self.produtos[indice].id if indice >= 0 and self.produtos else None
+
+        self.produtos = produtos
         nomes = [
             f"{p.id} - {p.nome} ({p.tamanho or ''} {p.cor or ''}) - Estoque: {p.estoque}"
             for p in self.produtos
         ]
         self.combo_produto["values"] = nomes
 
+        for i, produto in enumerate(self.produtos):
+            if produto.id == selecionado:
+                self.combo_produto.current(i)
+                break
+
+    def _estoque_alterado(self, evento):
+        self._atualizar_estoques(evento)
+        self._atualizar_movimentacoes()
+
+    def _produtos_alterados(self, evento):
+        # O cadastro e a edição podem ter lançado o estoque no histórico
+        self._carregar_produtos()
+        self._atualizar_movimentacoes()
+
+    def _atualizar_movimentacoes(self):
+        """
+        Mostra as movimentações novas sem tirar o usuário do lugar.
+
+        As novas entram no topo do histórico: só recarrega se a tabela
+        está no início. Rolada mais abaixo, recarregar voltaria ao topo
+        e perderia a seleção; nesse caso só o total é atualizado.
+        """
+        if self.lista_movimentacoes.no_inicio():
+            self._carregar_movimentacoes()
+        else:
+            executar_em_segundo_plano(self, contar_movimentacoes, ao_concluir=self._mostrar_total)
+
+    def _atualizar_estoques(self, evento):
+        """Corrige o estoque dos produtos avisados, sem reler a lista."""
+        if not any(p.id in evento.estoques for p in self.produtos):
+            return
+
+        for produto in self.produtos:
+            if produto.id in evento.estoques:
+                produto.estoque = evento.estoques[produto.id]
+        self._preencher_produtos(self.produtos)
+
+    def _abrir_nota_entrada(self):
+        TelaNotaEntrada(self, produtos=self.produtos, usuario_logado=self.usuario_logado)
+
     def _registrar(self):
         if not self.combo_produto.get():
             messagebox.showwarning(
@@ -290,34 +382,46 @@ class TelaMovimentacao(tk.Toplevel):
         tipo = self.combo_tipo.get()
         observacao = self.entry_observacao.get().strip() or None
 
-        try:
-            if tipo == "ENTRADA":
-                registrar_entrada(produto.id, quantidade, observacao)
-                mensagem = f"✅ Entrada registrada com sucesso!\n\n"
-                mensagem += f"Produto: {produto.nome}\n"
-                mensagem += f"Quantidade: +{quantidade}\n"
-                mensagem += f"Novo estoque: {produto.estoque + quantidade}"
-            else:
-                registrar_saida(produto.id, quantidade, observacao)
-                mensagem = f"✅ Saída registrada com sucesso!\n\n"
-                mensagem += f"Produto: {produto.nome}\n"
-                mensagem += f"Quantidade: -{quantidade}\n"
-                mensagem += f"Novo estoque: {produto.estoque - quantidade}"
+        if tipo == "ENTRADA":
+            funcao = registrar_entrada
+            mensagem = f"✅ Entrada registrada com sucesso!\n\n"
+            mensagem += f"Produto: {produto.nome}\n"
+            mensagem += f"Quantidade: +{quantidade}\n"
+            mensagem += f"Novo estoque: {produto.estoque + quantidade}"
+        else:
+            funcao = registrar_saida
+            mensagem = f"✅ Saída registrada com sucesso!\n\n"
+            mensagem += f"Produto: {produto.nome}\n"
+            mensagem += f"Quantidade: -{quantidade}\n"
+            mensagem += f"Novo estoque: {produto.estoque - quantidade}"
 
+        def concluido(_):
+            self.btn_registrar.config(state="normal")
             messagebox.showinfo("Sucesso", mensagem, parent=self)
             
-            # Atualiza a lista e recarrega produtos
-            self._carregar_movimentacoes()
-            self._carregar_produtos()
+            # A lista e o estoque são atualizados pelo evento EstoqueAlterado
             self._limpar()
 
-        except Exception as e:
+        def falhou(e):
+            self.btn_registrar.config(state="normal")
             messagebox.showerror(
                 "Erro",
                 f"❌ Não foi possível registrar a movimentação:\n\n{str(e)}",
                 parent=self
             )
 
+        # Evita registrar duas vezes enquanto a gravação está em andamento
+        self.btn_registrar.config(state="disabled")
+        executar_em_segundo_plano(
+            self,
+            funcao,
+            produto.id,
+            quantidade,
+            observacao,
+            ao_concluir=concluido,
+            ao_falhar=falhou
+        )
+
     def _limpar(self):
         """Limpa todos os campos do formulário."""
         self.combo_produto.set("")
@@ -328,38 +432,38 @@ class TelaMovimentacao(tk.Toplevel):
         self._atualizar_cor_tipo()
 
     def _carregar_movimentacoes(self):
-        """Carrega o histórico de movimentações na tabela."""
-        # Limpa a tabela
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        movimentacoes = listar_movimentacoes()
-
-        # Adiciona as movimentações com cores alternadas
-        for mov in movimentacoes:
-            produto_info = f"{mov['nome']}"
-            if mov['tamanho'] or mov['cor']:
-                produto_info += f" ({mov['tamanho'] or ''} {mov['cor'] or ''})"
-            
-            # Define a tag baseada no tipo
-            tag = "entrada" if mov["tipo"] == "ENTRADA" else "saida"
-            
-            # Formata a data (remove os segundos para ficar mais limpo)
-            data_formatada = mov["data"][:16] if mov["data"] else ""
-            
-            # Adiciona prefixo visual à quantidade
-            qtd_display = f"+{mov['quantidade']}" if mov["tipo"] == "ENTRADA" else f"-{mov['quantidade']}"
-            
-            self.tree.insert(
-                "",
-                tk.END,
-                values=(
-                    mov["id"],
-                    produto_info,
-                    f"📥 {mov['tipo']}" if mov["tipo"] == "ENTRADA" else f"📤 {mov['tipo']}",
-                    qtd_display,
-                    data_formatada,
-                    mov["observacao"] or "—"
-                ),
-                tags=(tag,)
-            )
\ No newline at end of file
+        """Mostra o histórico de movimentações, um bloco por vez."""
+        self.lista_movimentacoes.carregar(
+            FontePaginada(listar_movimentacoes_pagina, "movimentacoes")
+        )
+        executar_em_segundo_plano(self, contar_movimentacoes, ao_concluir=self._mostrar_total)
+
+    def _mostrar_total(self, total):
+        self.label_total.config(text=f"Total: {total} movimentações")
+
+
+def _montar_linha_movimentacao(mov):
+    """Converte uma movimentação em (iid, valores, tags) para a tabela."""
+    produto_info = f"{mov['nome']}"
+    if mov['tamanho'] or mov['cor']:
+        produto_info += f" ({mov['tamanho'] or ''} {mov['cor'] or ''})"
+
+    # Define a tag baseada no tipo
+    tag = "entrada" if mov["tipo"] == "ENTRADA" else "saida"
+
+    # Formata a data (remove os segundos para ficar mais limpo)
+    data_formatada = mov["data"][:16] if mov["data"] else ""
+
+    # Adiciona prefixo visual à quantidade
+    qtd_display = f"+{mov['quantidade']}" if mov["tipo"] == "ENTRADA" else f"-{mov['quantidade']}"
+
+    valores = (
+        mov["id"],
+        produto_info,
+        f"📥 {mov['tipo']}" if mov["tipo"] == "ENTRADA" else f"📤 {mov['tipo']}",
+        qtd_display,
+        data_formatada,
+        mov["observacao"] or "—"
+    )
+
+    return mov["id"], valores, (tag,)
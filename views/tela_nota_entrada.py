@@ -0,0 +1,332 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from models.nota_entrada import NotaEntrada, ItemNotaEntrada
+from dao.estoque_dao import registrar_nota_entrada
+from dao.produtos_dao import buscar_produto_por_codigo_barras
+from utils.executor_banco import executar_em_segundo_plano
+
+
+class TelaNotaEntrada(tk.Toplevel):
+    """
+    Recebimento de mercadoria com várias linhas (nota de entrada).
+
+    Os códigos de barras são lidos um após o outro no campo de código;
+    ler o mesmo produto de novo soma a quantidade na linha dele. Ao
+    gravar, todas as linhas entram no estoque em uma única transação
+    (registrar_nota_entrada): uma entrega de 300 linhas é uma gravação,
+    não 300.
+
+    Args:
+        master: Tela de movimentação
+        produtos: Produtos ativos já carregados (a leitura do código é
+                  resolvida em memória; códigos fora da lista vão ao banco)
+        usuario_logado: Usuário que recebe a mercadoria (opcional)
+    """
+
+    def __init__(self, master=None, produtos=None, usuario_logado=None):
+        super().__init__(master)
+        self.title("📦 Nota de Entrada")
+        self.geometry("800x600")
+        self.configure(bg="#f5f5f5")
+        self.transient(master)
+
+        self.usuario_logado = usuario_logado
+        self.produtos_por_codigo = {
+            produto.codigo_barras: produto
+            for produto in (produtos or [])
+            if produto.codigo_barras
+        }
+
+        # Linhas da nota por id do produto (na ordem de leitura)
+        self.itens = {}
+        self.codigos = {}  # produto_id -> código de barras (para exibir)
+
+        self._criar_widgets()
+        self._atualizar_totais()
+
+        self.protocol("WM_DELETE_WINDOW", self._fechar)
+        self.entry_codigo.focus()
+
+    # =========================
+    # INTERFACE
+    # =========================
+    def _criar_widgets(self):
+        # Cabeçalho da nota
+        frame_cabecalho = tk.LabelFrame(
+            self,
+            text="  🧾 Dados da Nota  ",
+            font=("Arial", 11, "bold"),
+            padx=15,
+            pady=10,
+            bg="white"
+        )
+        frame_cabecalho.pack(fill="x", padx=15, pady=(15, 10))
+
+        tk.Label(frame_cabecalho, text="Fornecedor:", font=("Arial", 10, "bold"), bg="white").pack(side="left")
+        self.entry_fornecedor = tk.Entry(frame_cabecalho, width=35, font=("Arial", 10), relief="solid", borderwidth=1)
+        self.entry_fornecedor.pack(side="left", padx=(5, 20))
+
+        tk.Label(frame_cabecalho, text="Nº da nota:", font=("Arial", 10, "bold"), bg="white").pack(side="left")
+        self.entry_numero = tk.Entry(frame_cabecalho, width=15, font=("Arial", 10), relief="solid", borderwidth=1)
+        self.entry_numero.pack(side="left", padx=5)
+
+        # Leitura dos códigos
+        frame_leitura = tk.LabelFrame(
+            self,
+            text="  🔍 Ler Produtos  ",
+            font=("Arial", 11, "bold"),
+            padx=15,
+            pady=10,
+            bg="white"
+        )
+        frame_leitura.pack(fill="x", padx=15, pady=(0, 10))
+
+        tk.Label(frame_leitura, text="Código:", font=("Arial", 10, "bold"), bg="white").pack(side="left")
+        self.entry_codigo = tk.Entry(frame_leitura, width=25, font=("Arial", 12), relief="solid", borderwidth=1)
+        self.entry_codigo.pack(side="left", padx=(5, 20))
+        self.entry_codigo.bind("<Return>", lambda e: self._ler_codigo())
+
+        tk.Label(frame_leitura, text="Quantidade:", font=("Arial", 10, "bold"), bg="white").pack(side="left")
+        self.entry_quantidade = tk.Entry(frame_leitura, width=8, font=("Arial", 12), relief="solid", borderwidth=1)
+        self.entry_quantidade.insert(0, "1")
+        self.entry_quantidade.pack(side="left", padx=5)
+        self.entry_quantidade.bind("<Return>", lambda e: self._ler_codigo())
+
+        # Grade de itens
+        frame_itens = tk.Frame(self, bg="white")
+        frame_itens.pack(fill="both", expand=True, padx=15)
+
+        scrollbar = ttk.Scrollbar(frame_itens, orient="vertical")
+        scrollbar.pack(side="right", fill="y")
+
+        self.tree = ttk.Treeview(
+            frame_itens,
+            columns=("codigo", "produto", "quantidade"),
+            show="headings",
+            yscrollcommand=scrollbar.set
+        )
+        scrollbar.config(command=self.tree.yview)
+
+        self.tree.heading("codigo", text="Código")
+        self.tree.heading("produto", text="Produto")
+        self.tree.heading("quantidade", text="Quantidade")
+
+        self.tree.column("codigo", width=150, anchor="center")
+        self.tree.column("produto", width=450, anchor="w")
+        self.tree.column("quantidade", width=100, anchor="center")
+
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.tree.bind("<Delete>", lambda e: self._remover_item())
+
+        # Botões
+        frame_botoes = tk.Frame(self, bg="#f5f5f5")
+        frame_botoes.pack(fill="x", padx=15, pady=10)
+
+        for texto, comando in (
+            ("➕", lambda: self._somar_quantidade(1)),
+            ("➖", lambda: self._somar_quantidade(-1)),
+            ("🗑️ Remover", self._remover_item),
+        ):
+            tk.Button(
+                frame_botoes,
+                text=texto,
+                command=comando,
+                font=("Arial", 10),
+                relief="flat",
+                cursor="hand2",
+                padx=10
+            ).pack(side="left", padx=(0, 5))
+
+        self.label_totais = tk.Label(frame_botoes, text="", font=("Arial", 10, "bold"), bg="#f5f5f5")
+        self.label_totais.pack(side="left", padx=20)
+
+        tk.Button(
+            frame_botoes,
+            text="Cancelar",
+            command=self._fechar,
+            bg="#757575",
+            fg="white",
+            font=("Arial", 10, "bold"),
+            relief="flat",
+            cursor="hand2",
+            padx=15,
+            pady=6
+        ).pack(side="right")
+
+        self.btn_gravar = tk.Button(
+            frame_botoes,
+            text="✅ Gravar Nota",
+            command=self._gravar,
+            bg="#4CAF50",
+            fg="white",
+            font=("Arial", 10, "bold"),
+            relief="flat",
+            cursor="hand2",
+            padx=15,
+            pady=6
+        )
+        self.btn_gravar.pack(side="right", padx=(0, 5))
+
+    # =========================
+    # LEITURA DOS PRODUTOS
+    # =========================
+    def _ler_codigo(self):
+        """Adiciona o produto do código lido (ou soma à linha dele)."""
+        codigo = self.entry_codigo.get().strip()
+        if not codigo:
+            return
+
+        try:
+            quantidade = int(self.entry_quantidade.get())
+            if quantidade <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Erro", "❌ Quantidade inválida.", parent=self)
+            self.entry_quantidade.focus()
+            return
+
+        produto = self.produtos_por_codigo.get(codigo)
+        if produto:
+            self._adicionar(produto, quantidade)
+            return
+
+        # Fora da lista (ex.: produto cadastrado depois de abrir a tela)
+        executar_em_segundo_plano(
+            self,
+            buscar_produto_por_codigo_barras,
+            codigo,
+            ao_concluir=lambda produto: self._resultado_busca(codigo, produto, quantidade)
+        )
+
+    def _resultado_busca(self, codigo, produto, quantidade):
+        if not produto:
+            self.bell()
+            messagebox.showwarning("Atenção", f"Produto com código '{codigo}' não encontrado.", parent=self)
+            self._preparar_proxima_leitura()
+            return
+
+        self.produtos_por_codigo[codigo] = produto
+        self._adicionar(produto, quantidade)
+
+    def _adicionar(self, produto, quantidade):
+        item = self.itens.get(produto.id)
+        if item:
+            item.quantidade += quantidade
+            self.tree.item(str(produto.id), values=self._valores_item(item))
+        else:
+            item = ItemNotaEntrada(
+                produto_id=produto.id,
+                quantidade=quantidade,
+                produto_nome=f"{produto.nome} ({produto.tamanho or ''} {produto.cor or ''})"
+            )
+            self.itens[produto.id] = item
+            self.codigos[produto.id] = produto.codigo_barras or ""
+            self.tree.insert("", tk.END, iid=str(produto.id), values=self._valores_item(item))
+
+        # A última linha lida fica visível e selecionada
+        self.tree.selection_set(str(produto.id))
+        self.tree.see(str(produto.id))
+
+        self._atualizar_totais()
+        self._preparar_proxima_leitura()
+
+    def _preparar_proxima_leitura(self):
+        self.entry_codigo.delete(0, tk.END)
+        self.entry_quantidade.delete(0, tk.END)
+        self.entry_quantidade.insert(0, "1")
+        self.entry_codigo.focus()
+
+    def _valores_item(self, item):
+        return (self.codigos[item.produto_id], item.produto_nome, item.quantidade)
+
+    # =========================
+    # EDIÇÃO DAS LINHAS
+    # =========================
+    def _item_selecionado(self):
+        selecao = self.tree.selection()
+        if not selecao:
+            return None
+        return self.itens.get(int(selecao[0]))
+
+    def _somar_quantidade(self, diferenca):
+        item = self._item_selecionado()
+        if not item:
+            messagebox.showwarning("Atenção", "Selecione um item.", parent=self)
+            return
+
+        if item.quantidade + diferenca < 1:
+            self._remover_item()
+            return
+
+        item.quantidade += diferenca
+        self.tree.item(str(item.produto_id), values=self._valores_item(item))
+        self._atualizar_totais()
+
+    def _remover_item(self):
+        item = self._item_selecionado()
+        if not item:
+            return
+
+        del self.itens[item.produto_id]
+        self.tree.delete(str(item.produto_id))
+        self._atualizar_totais()
+
+    def _atualizar_totais(self):
+        unidades = sum(item.quantidade for item in self.itens.values())
+        self.label_totais.config(text=f"{len(self.itens)} produto(s), {unidades} unidade(s)")
+        self.btn_gravar.config(state="normal" if self.itens else "disabled")
+
+    # =========================
+    # GRAVAÇÃO
+    # =========================
+    def _gravar(self):
+        if not self.itens:
+            return
+
+        nota = NotaEntrada(
+            numero=self.entry_numero.get().strip() or None,
+            fornecedor=self.entry_fornecedor.get().strip() or None,
+            usuario_id=getattr(self.usuario_logado, "id", None),
+            itens=list(self.itens.values())
+        )
+
+        def concluida(resultado):
+            nota_id, _ = resultado
+            messagebox.showinfo(
+                "Sucesso",
+                f"✅ Nota de entrada #{nota_id} registrada!\n\n"
+                f"Produtos: {len(nota.itens)}\n"
+                f"Unidades: {nota.total_unidades}",
+                parent=self.master
+            )
+            # O histórico e o estoque da tela de movimentação são
+            # atualizados pelo evento MovimentacaoRegistrada
+            self.destroy()
+
+        def falhou(e):
+            self.btn_gravar.config(state="normal")
+            messagebox.showerror(
+                "Erro",
+                f"❌ Não foi possível registrar a nota (nada foi gravado):\n\n{str(e)}",
+                parent=self
+            )
+
+        # Evita gravar a nota duas vezes
+        self.btn_gravar.config(state="disabled")
+        executar_em_segundo_plano(
+            self,
+            registrar_nota_entrada,
+            nota,
+            ao_concluir=concluida,
+            ao_falhar=falhou
+        )
+
+    def _fechar(self):
+        if self.itens and not messagebox.askyesno(
+            "Descartar nota",
+            "A nota ainda não foi gravada. Descartar os itens lidos?",
+            parent=self
+        ):
+            return
+        self.destroy()
@@ -1,13 +1,9 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 
-from telas.tela_produtos import TelaProdutos
-from telas.tela_movimentacao import TelaMovimentacao
-from telas.tela_vendas import TelaVendas
-from telas.tela_usuarios import TelaUsuarios
-from telas.tela_dashboard import TelaDashboard
-
 from utils.atualizador import verificar_atualizacao
+from database.backup import BackupAgendado
+from utils.executor_banco import encerrar_executor
 
 
 class TelaPrincipal(tk.Tk):
@@ -29,6 +25,10 @@ class TelaPrincipal(tk.Tk):
 
         self.after(1000, lambda: verificar_atualizacao(self))
 
+        # Backup automático do banco em segundo plano
+        self.backup_agendado = BackupAgendado()
+        self.backup_agendado.start()
+
     def _criar_widgets(self):
         frame = ttk.Frame(self, padding=20)
         frame.pack(expand=True, fill="both")
@@ -123,21 +123,31 @@ class TelaPrincipal(tk.Tk):
             fg="gray"
         ).pack(side="bottom")
 
+    # As telas são importadas na primeira vez que o botão é usado,
+    # para não atrasar a abertura do sistema.
     def _abrir_vendas(self):
+        from views.tela_vendas import TelaVendas
         TelaVendas(self, usuario_logado=self.usuario_logado)
 
     def _abrir_produtos(self):
+        from views.tela_produtos import TelaProdutos
         TelaProdutos(self, usuario_logado=self.usuario_logado)
 
     def _abrir_movimentacao(self):
+        from views.tela_movimentacao import TelaMovimentacao
         TelaMovimentacao(self, usuario_logado=self.usuario_logado)
     
     def _abrir_usuarios(self):
+        from views.tela_usuarios import TelaUsuarios
         TelaUsuarios(self, usuario_logado=self.usuario_logado)
     
     def _sair(self):
         if messagebox.askyesno("Confirmar", "Deseja realmente sair do sistema?", parent=self):
+            self.backup_agendado.parar()
+            # Espera as gravações já enviadas ao banco terminarem
+            encerrar_executor()
             self.destroy()
 
     def _abrir_dashboard(self):
+        from views.tela_dashboard import TelaDashboard
         TelaDashboard(self, usuario_logado=self.usuario_logado)
\ No newline at end of file
@@ -5,12 +5,16 @@ from models import Produto
 from dao.produtos_dao import (
     inserir_produto,
     atualizar_produto,
-    listar_produtos,
+    listar_produtos_pagina,
+    contar_produtos,
     buscar_produto_por_id,
     desativar_produto,
     reativar_produto  
 )
 from utils.validadores import normalizar_numero, formatar_moeda
+from utils.eventos import assinar_na_tela, ProdutosAlterados, EstoqueAlterado
+from utils.executor_banco import executar_em_segundo_plano, ConsultaMaisRecente
+from views.lista_virtual import ListaVirtual, FontePaginada
 
 
 class TelaProdutos(tk.Toplevel):
@@ -22,11 +26,11 @@ class TelaProdutos(tk.Toplevel):
         self.produto_selecionado_id = None
         self.produto_selecionado_ativo = True
         
-        # Variáveis para controlar a paginação
-        self.pagina_atual = 1
-        self.itens_por_pagina = 16
+        # A tabela é uma lista virtual: os produtos chegam em blocos,
+        # por cursor, conforme a rolagem. Guardar os filtros permite
+        # recarregar sem voltar ao início depois de salvar um produto.
         self.total_produtos = 0
-        self.produtos_carregados = []
+        self.filtros_atuais = None
         
         # NOVO: Variáveis para controlar a ordenação
         self.coluna_ordenacao = "nome"  # Coluna atual de ordenação
@@ -35,9 +39,17 @@ class TelaProdutos(tk.Toplevel):
         # NOVO: Variável para controlar o timer da busca em tempo real
         self.timer_busca = None  # Usado para aguardar o usuário parar de digitar
 
+        # Consultas rodam na thread do banco; só o resultado da última
+        # (busca digitada, por exemplo) é mostrado
+        self.consulta = ConsultaMaisRecente(self)
+
         self._criar_widgets()
         self._carregar_produtos()
 
+        # Gravações desta e de outras telas (vendas, movimentação)
+        assinar_na_tela(self, ProdutosAlterados, self._produtos_alterados)
+        assinar_na_tela(self, EstoqueAlterado, self._estoque_alterado)
+
     # =========================
     # INTERFACE
     # =========================
@@ -191,6 +203,7 @@ class TelaProdutos(tk.Toplevel):
         colunas = ("id", "status", "nome", "categoria", "tamanho", "cor", "estoque", "preco_custo", "preco_venda", "total_custo", "total_venda")
 
         self.tree = ttk.Treeview(frame_lista, columns=colunas, show="headings")
+        scrollbar = ttk.Scrollbar(frame_lista, orient="vertical")
 
         titulos = {
             "id": "ID",
@@ -244,54 +257,23 @@ class TelaProdutos(tk.Toplevel):
         for col in colunas_ordenaveis:
             self.tree.heading(col, text=titulos[col], command=lambda c=col: self._ordenar_por_coluna(c))
 
+        scrollbar.pack(side="right", fill="y")
         self.tree.pack(fill="both", expand=True)
         self.tree.bind("<<TreeviewSelect>>", self._selecionar_produto)
-        
-        # Frame para controles de paginação
-        frame_paginacao = tk.Frame(self)
-        frame_paginacao.pack(fill="x", padx=10, pady=5)
-        
-        self.btn_primeira = tk.Button(
-            frame_paginacao, 
-            text="<<", 
-            command=self._ir_primeira_pagina,
-            width=3
-        )
-        self.btn_primeira.pack(side="left", padx=2)
-        
-        self.btn_anterior = tk.Button(
-            frame_paginacao, 
-            text="<", 
-            command=self._pagina_anterior,
-            width=3
-        )
-        self.btn_anterior.pack(side="left", padx=2)
-        
-        self.label_pagina = tk.Label(
-            frame_paginacao, 
-            text="Página 1 de 1",
-            font=("Arial", 10)
-        )
-        self.label_pagina.pack(side="left", padx=10)
-        
-        self.btn_proxima = tk.Button(
-            frame_paginacao, 
-            text=">", 
-            command=self._proxima_pagina,
-            width=3
+        self.tree.tag_configure("inativo", background="#ffcccc")
+
+        self.lista_produtos = ListaVirtual(
+            self.tree,
+            montar_linha=_montar_linha_produto,
+            scrollbar=scrollbar
         )
-        self.btn_proxima.pack(side="left", padx=2)
         
-        self.btn_ultima = tk.Button(
-            frame_paginacao, 
-            text=">>", 
-            command=self._ir_ultima_pagina,
-            width=3
-        )
-        self.btn_ultima.pack(side="left", padx=2)
+        # Rodapé com o total de produtos
+        frame_rodape = tk.Frame(self)
+        frame_rodape.pack(fill="x", padx=10, pady=5)
         
         self.label_total = tk.Label(
-            frame_paginacao,
+            frame_rodape,
             text="Total: 0 produtos",
             font=("Arial", 9)
         )
@@ -318,9 +300,9 @@ class TelaProdutos(tk.Toplevel):
     def _aplicar_filtros_automatico(self):
         """
         Aplica os filtros sem precisar clicar em botão.
-        Volta para página 1 e recarrega.
+        Volta para o início da lista e recarrega.
         """
-        self.pagina_atual = 1
+        self.filtros_atuais = None
         self._carregar_produtos()
 
     # =========================
@@ -377,15 +359,15 @@ class TelaProdutos(tk.Toplevel):
     def _aplicar_filtros(self):
         """
         Aplica os filtros digitados pelo usuário.
-        Volta para a página 1 e recarrega a tabela.
+        Volta para o início da lista e recarrega a tabela.
         """
-        self.pagina_atual = 1
+        self.filtros_atuais = None
         self._carregar_produtos()
 
     def _limpar_filtros(self):
         """
         Limpa todos os campos de filtro.
-        Volta para a página 1 e recarrega a tabela completa.
+        Volta para o início da lista e recarrega a tabela completa.
         """
         # Limpa os campos de texto
         self.entry_filtro_nome.delete(0, tk.END)
@@ -399,8 +381,8 @@ class TelaProdutos(tk.Toplevel):
         # Desmarca o checkbox de estoque baixo
         self.var_estoque_baixo.set(False)
         
-        # Volta para a primeira página
-        self.pagina_atual = 1
+        # Volta para o início da lista
+        self.filtros_atuais = None
         
         # Recarrega sem filtros
         self._carregar_produtos()
@@ -421,11 +403,7 @@ class TelaProdutos(tk.Toplevel):
                 estoque=int(self.entry_estoque.get() or 0)
             )
 
-            inserir_produto(produto)
-            self._carregar_produtos()
-            self._limpar()
-
-            messagebox.showinfo("Sucesso", "Produto cadastrado com sucesso!", parent=self)
+            self._gravar(inserir_produto, produto, mensagem="Produto cadastrado com sucesso!")
 
         except ValueError as e:
             messagebox.showerror("Erro", f"Valor inválido: {str(e)}", parent=self)
@@ -451,11 +429,7 @@ class TelaProdutos(tk.Toplevel):
                 ativo=1
             )
 
-            atualizar_produto(produto)
-            self._carregar_produtos()
-            self._limpar()
-
-            messagebox.showinfo("Sucesso", "Produto atualizado!", parent=self)
+            self._gravar(atualizar_produto, produto, mensagem="Produto atualizado!")
 
         except ValueError as e:
             messagebox.showerror("Erro", f"Valor inválido: {str(e)}", parent=self)
@@ -468,10 +442,7 @@ class TelaProdutos(tk.Toplevel):
             return
 
         if messagebox.askyesno("Confirmar", "Deseja desativar este produto?", parent=self):
-            desativar_produto(self.produto_selecionado_id)
-            self._carregar_produtos()
-            self._limpar()
-            messagebox.showinfo("Sucesso", "Produto desativado!", parent=self)
+            self._gravar(desativar_produto, self.produto_selecionado_id, mensagem="Produto desativado!")
 
     def _reativar(self):
         if not self.produto_selecionado_id:
@@ -479,10 +450,26 @@ class TelaProdutos(tk.Toplevel):
             return
 
         if messagebox.askyesno("Confirmar", "Deseja reativar este produto?", parent=self):
-            reativar_produto(self.produto_selecionado_id)
-            self._carregar_produtos()
+            self._gravar(reativar_produto, self.produto_selecionado_id, mensagem="Produto reativado!")
+
+    def _gravar(self, funcao, *args, mensagem):
+        """
+        Executa uma gravação na thread do banco.
+
+        Ao terminar, limpa o formulário e mostra a mensagem (a tabela é
+        recarregada pelo evento ProdutosAlterados); se falhar, mostra o erro.
+        """
+        def concluido(_):
             self._limpar()
-            messagebox.showinfo("Sucesso", "Produto reativado!", parent=self)
+            messagebox.showinfo("Sucesso", mensagem, parent=self)
+
+        executar_em_segundo_plano(
+            self,
+            funcao,
+            *args,
+            ao_concluir=concluido,
+            ao_falhar=lambda e: messagebox.showerror("Erro", str(e), parent=self)
+        )
 
     def _limpar(self):
         self.produto_selecionado_id = None
@@ -506,8 +493,11 @@ class TelaProdutos(tk.Toplevel):
     # ===== MODIFICADO: Função principal de carregamento =====
     def _carregar_produtos(self):
         """
-        Carrega TODOS os produtos do banco (aplicando filtros se houver)
-        e depois exibe apenas os da página atual.
+        Conta os produtos que atendem aos filtros e mostra o primeiro bloco.
+
+        Se os filtros ou a ordenação mudaram, volta para o início da lista;
+        senão, recarrega a partir do trecho visível (ex.: depois de salvar
+        um produto).
         """
         # Pega os valores dos filtros
         mostrar_inativos = self.var_mostrar_inativos.get()
@@ -538,8 +528,7 @@ class TelaProdutos(tk.Toplevel):
         # Verifica se o filtro de estoque baixo está marcado
         estoque_baixo = 10 if self.var_estoque_baixo.get() else None
         
-        # Busca TODOS os produtos com os filtros e ordenação
-        self.produtos_carregados = listar_produtos(
+        filtros = dict(
             ativos_apenas=not mostrar_inativos,
             filtro_nome=filtro_nome,
             filtro_categoria=filtro_categoria,
@@ -552,113 +541,48 @@ class TelaProdutos(tk.Toplevel):
             ordenar_por=self.coluna_ordenacao,
             ordem_crescente=self.ordem_crescente
         )
-        
-        # Atualiza o total de produtos
-        self.total_produtos = len(self.produtos_carregados)
-        
-        # Atualiza a exibição da tabela com a página atual
-        self._atualizar_tabela()
-        
-        # Atualiza os controles de paginação
-        self._atualizar_controles_paginacao()
 
-    # ===== Atualiza apenas a tabela =====
-    def _atualizar_tabela(self):
-        """
-        Atualiza a tabela mostrando apenas os produtos da página atual.
-        """
-        # Limpa a tabela
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        # Calcula quais produtos mostrar
-        inicio = (self.pagina_atual - 1) * self.itens_por_pagina
-        fim = inicio + self.itens_por_pagina
-        
-        # Pega apenas os produtos desta página
-        produtos_pagina = self.produtos_carregados[inicio:fim]
-        
-        # Adiciona os produtos na tabela
-        for produto in produtos_pagina:
-            total_custo = produto.estoque * (produto.preco_custo or 0)
-            total_venda = produto.estoque * (produto.preco_venda or 0)
-            
-            status = "ATIVO" if produto.ativo == 1 else "INATIVO"
-
-            self.tree.insert("", tk.END, values=(
-                produto.id,
-                status,
-                produto.nome,
-                produto.categoria,
-                produto.tamanho,
-                produto.cor,
-                produto.estoque,
-                formatar_moeda(produto.preco_custo or 0),
-                formatar_moeda(produto.preco_venda),
-                formatar_moeda(total_custo),
-                formatar_moeda(total_venda)
-            ), tags=("inativo",) if produto.ativo == 0 else ())
+        # Filtros ou ordenação diferentes: o trecho antigo não vale mais
+        if filtros != self.filtros_atuais:
+            self.lista_produtos.carregar(FontePaginada(listar_produtos_pagina, "produtos", **filtros))
+        else:
+            self.lista_produtos.recarregar()
+        self.filtros_atuais = filtros
+        self._contar_produtos()
+
+    def _contar_produtos(self):
+        """Atualiza o total de produtos dos filtros atuais."""
+        filtros_contagem = {
+            chave: valor for chave, valor in self.filtros_atuais.items()
+            if chave not in ("ordenar_por", "ordem_crescente")
+        }
+        self.consulta.executar(
+            contar_produtos,
+            **filtros_contagem,
+            ao_concluir=self._mostrar_total
+        )
 
-        self.tree.tag_configure("inativo", background="#ffcccc")
+    def _mostrar_total(self, total):
+        self.total_produtos = total
+        self.label_total.config(text=f"Total: {total} produtos")
 
-    # ===== Atualiza os controles de paginação =====
-    def _atualizar_controles_paginacao(self):
-        """
-        Atualiza os botões e labels da paginação.
-        """
-        import math
-        total_paginas = math.ceil(self.total_produtos / self.itens_por_pagina) if self.total_produtos > 0 else 1
-        
-        # Atualiza o texto da página
-        self.label_pagina.config(text=f"Página {self.pagina_atual} de {total_paginas}")
-        self.label_total.config(text=f"Total: {self.total_produtos} produtos")
-        
-        # Habilita/desabilita botões
-        if self.pagina_atual <= 1:
-            self.btn_anterior.config(state="disabled")
-            self.btn_primeira.config(state="disabled")
-        else:
-            self.btn_anterior.config(state="normal")
-            self.btn_primeira.config(state="normal")
-        
-        if self.pagina_atual >= total_paginas:
-            self.btn_proxima.config(state="disabled")
-            self.btn_ultima.config(state="disabled")
-        else:
-            self.btn_proxima.config(state="normal")
-            self.btn_ultima.config(state="normal")
-
-    # ===== Navegação entre páginas =====
-    def _proxima_pagina(self):
-        """Vai para a próxima página."""
-        import math
-        total_paginas = math.ceil(self.total_produtos / self.itens_por_pagina)
-        
-        if self.pagina_atual < total_paginas:
-            self.pagina_atual += 1
-            self._atualizar_tabela()
-            self._atualizar_controles_paginacao()
-
-    def _pagina_anterior(self):
-        """Volta para a página anterior."""
-        if self.pagina_atual > 1:
-            self.pagina_atual -= 1
-            self._atualizar_tabela()
-            self._atualizar_controles_paginacao()
-
-    def _ir_primeira_pagina(self):
-        """Vai para a primeira página."""
-        self.pagina_atual = 1
-        self._atualizar_tabela()
-        self._atualizar_controles_paginacao()
-
-    def _ir_ultima_pagina(self):
-        """Vai para a última página."""
-        import math
-        total_paginas = math.ceil(self.total_produtos / self.itens_por_pagina)
-        self.pagina_atual = total_paginas
-        self._atualizar_tabela()
-        self._atualizar_controles_paginacao()
+    def _produtos_alterados(self, evento):
+        """Recarrega o trecho visível com os filtros já aplicados."""
+        if self.filtros_atuais is None:
+            return
+        self.lista_produtos.recarregar()
+        self._contar_produtos()
+
+    def _estoque_alterado(self, evento):
+        """Recarrega só se a mudança aparece na tabela."""
+        if self.filtros_atuais is None:
+            return
+
+        # Com o filtro de estoque baixo, produtos podem entrar ou sair da lista
+        if self.filtros_atuais["estoque_baixo"] is not None:
+            self._produtos_alterados(evento)
+        elif any(self.lista_produtos.item(produto_id) is not None for produto_id in evento.produto_ids):
+            self.lista_produtos.recarregar()
 
     def _selecionar_produto(self, event):
         item = self.tree.selection()
@@ -668,7 +592,15 @@ class TelaProdutos(tk.Toplevel):
         valores = self.tree.item(item)["values"]
         produto_id = valores[0]
 
-        produto = buscar_produto_por_id(produto_id)
+        executar_em_segundo_plano(
+            self,
+            buscar_produto_por_id,
+            produto_id,
+            ao_concluir=self._preencher_formulario
+        )
+
+    def _preencher_formulario(self, produto):
+        """Mostra no formulário o produto selecionado na tabela."""
         if not produto:
             return
 
@@ -712,4 +644,28 @@ class TelaProdutos(tk.Toplevel):
             self.btn_reativar.pack_forget()
         else:
             self.btn_desativar.pack_forget()
-            self.btn_reativar.pack(side="left", padx=5)
\ No newline at end of file
+            self.btn_reativar.pack(side="left", padx=5)
+
+
+def _montar_linha_produto(produto):
+    """Converte um produto em (iid, valores, tags) para a tabela."""
+    total_custo = produto.estoque * (produto.preco_custo or 0)
+    total_venda = produto.estoque * (produto.preco_venda or 0)
+
+    status = "ATIVO" if produto.ativo == 1 else "INATIVO"
+
+    valores = (
+        produto.id,
+        status,
+        produto.nome,
+        produto.categoria,
+        produto.tamanho,
+        produto.cor,
+        produto.estoque,
+        formatar_moeda(produto.preco_custo or 0),
+        formatar_moeda(produto.preco_venda),
+        formatar_moeda(total_custo),
+        formatar_moeda(total_venda)
+    )
+
+    return produto.id, valores, ("inativo",) if produto.ativo == 0 else ()
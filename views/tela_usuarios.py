@@ -11,6 +11,7 @@ from dao.usuario_dao import (
     reativar_usuario,
     alterar_senha
 )
+from utils.treeview import reconciliar_treeview
 
 
 class TelaUsuarios(tk.Toplevel):
@@ -176,20 +177,21 @@ class TelaUsuarios(tk.Toplevel):
         self._atualizar_visibilidade_botoes()
     
     def _carregar_usuarios(self):
-        """Carrega a lista de usuários."""
-        # Limpa a árvore
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
+        """
+        Carrega a lista de usuários.
+
+        Só as linhas que mudaram são atualizadas na árvore (a seleção e
+        a rolagem são mantidas).
+        """
         # Busca usuários
         mostrar_inativos = self.var_mostrar_inativos.get()
         usuarios = listar_usuarios(ativos_apenas=not mostrar_inativos)
         
-        # Adiciona na árvore
+        linhas = []
         for usuario in usuarios:
             status = "ATIVO" if usuario.ativo == 1 else "INATIVO"
             
-            self.tree.insert("", tk.END, values=(
+            linhas.append((usuario.id, (
                 usuario.id,
                 status,
                 usuario.nome,
@@ -197,7 +199,9 @@ class TelaUsuarios(tk.Toplevel):
                 usuario.get_nivel_nome(),
                 usuario.data_criacao[:16] if usuario.data_criacao else "",
                 usuario.ultimo_acesso[:16] if usuario.ultimo_acesso else "Nunca"
-            ), tags=("inativo",) if usuario.ativo == 0 else ())
+            ), ("inativo",) if usuario.ativo == 0 else ()))
+        
+        reconciliar_treeview(self.tree, linhas)
         
         self.tree.tag_configure("inativo", background="#ffcccc")
     
@@ -2,12 +2,22 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
 
-from models.venda import Venda, ItemVenda
+from models.carrinho import Carrinho
 from models.cliente import Cliente
 from dao.vendas_dao import registrar_venda
-from dao.produtos_dao import buscar_produto_por_codigo_barras, listar_produtos
+from dao.produtos_dao import (
+    buscar_produto_por_codigo_barras,
+    buscar_produtos_por_ids,
+    listar_produtos,
+    aquecer_cache_codigo_barras,
+    descartar_cache_codigo_barras
+)
 from dao.clientes_dao import listar_clientes, inserir_cliente
+from dao import cache_produtos
+from utils.eventos import assinar_na_tela, ProdutosAlterados, EstoqueAlterado
+from utils.executor_banco import executar_em_segundo_plano, executar_no_banco
 from utils.validadores import normalizar_numero, formatar_moeda
+from views.lista_virtual import ListaVirtual, FonteLista
 
 
 class TelaVendas(tk.Toplevel):
@@ -27,21 +37,32 @@ class TelaVendas(tk.Toplevel):
         self.title("🛒 Sistema de Vendas - PDV")
         self.geometry("1100x700")
         
-        # Carrinho de compras (lista de ItemVenda)
-        self.itens_carrinho = []
+        # Carrinho de compras: itens por id do produto, totais prontos
+        self.carrinho = Carrinho()
         
         # Cliente selecionado (pode ser None)
         self.cliente_selecionado = None
         
+        # True enquanto a venda está sendo gravada (carrinho bloqueado)
+        self.gravando_venda = False
+        
         # Listas auxiliares
         self.clientes = []
         self.produtos = []
+        self.produtos_por_id = {}  # Mesmos objetos de self.produtos, pelo id
         
         self._criar_widgets()
         self._carregar_clientes()
         self._carregar_produtos()
         self._atualizar_totais()
         
+        # A tabela acompanha cada mudança no carrinho
+        self.carrinho.ao_mudar(self._carrinho_mudou)
+        
+        # Alterações feitas em outras telas (ou nesta) chegam por evento
+        assinar_na_tela(self, EstoqueAlterado, lambda evento: self._atualizar_estoques(evento.estoques))
+        assinar_na_tela(self, ProdutosAlterados, self._produtos_alterados)
+        
         # Foca no campo de busca de produto
         self.entry_busca_produto.focus()
     
@@ -67,7 +88,10 @@ class TelaVendas(tk.Toplevel):
         self.entry_busca_produto.grid(row=0, column=1, padx=5, pady=5, sticky="we")
         self.entry_busca_produto.bind("<Return>", lambda e: self._buscar_produto())
         
-        tk.Button(
+        # Controles que alteram o carrinho (bloqueados enquanto a venda é gravada)
+        self.controles_carrinho = [self.entry_busca_produto]
+        
+        btn_buscar = tk.Button(
             frame_topo, 
             text="🔍 Buscar", 
             command=self._buscar_produto,
@@ -75,14 +99,17 @@ class TelaVendas(tk.Toplevel):
             fg="white",
             font=("Arial", 9, "bold"),
             cursor="hand2"
-        ).grid(row=0, column=2, padx=2)
+        )
+        btn_buscar.grid(row=0, column=2, padx=2)
         
-        tk.Button(
+        btn_limpar_busca = tk.Button(
             frame_topo, 
             text="✖ Limpar", 
             command=self._limpar_busca,
             cursor="hand2"
-        ).grid(row=0, column=3, padx=2)
+        )
+        btn_limpar_busca.grid(row=0, column=3, padx=2)
+        self.controles_carrinho += [btn_buscar, btn_limpar_busca]
         
         tk.Label(
             frame_topo, 
@@ -168,28 +195,34 @@ class TelaVendas(tk.Toplevel):
         frame_acoes_carrinho = tk.Frame(frame_carrinho)
         frame_acoes_carrinho.pack(fill="x", pady=(10, 0))
         
-        tk.Button(
+        botao = tk.Button(
             frame_acoes_carrinho,
             text="➕ Aumentar Qtd",
             command=self._aumentar_quantidade,
             cursor="hand2"
-        ).pack(side="left", padx=2)
+        )
+        botao.pack(side="left", padx=2)
+        self.controles_carrinho.append(botao)
         
-        tk.Button(
+        botao = tk.Button(
             frame_acoes_carrinho,
             text="➖ Diminuir Qtd",
             command=self._diminuir_quantidade,
             cursor="hand2"
-        ).pack(side="left", padx=2)
+        )
+        botao.pack(side="left", padx=2)
+        self.controles_carrinho.append(botao)
         
-        tk.Button(
+        botao = tk.Button(
             frame_acoes_carrinho,
             text="🗑️ Remover Item",
             command=self._remover_item,
             bg="#f44336",
             fg="white",
             cursor="hand2"
-        ).pack(side="left", padx=2)
+        )
+        botao.pack(side="left", padx=2)
+        self.controles_carrinho.append(botao)
         
         # ========================================
         # FRAME INFERIOR - Totais e Finalização
@@ -249,7 +282,8 @@ class TelaVendas(tk.Toplevel):
         self.entry_desconto = tk.Entry(frame_desconto, width=10, font=("Arial", 10))
         self.entry_desconto.insert(0, "0")
         self.entry_desconto.pack(side="left")
-        self.entry_desconto.bind("<KeyRelease>", lambda e: self._atualizar_totais())
+        self.entry_desconto.bind("<KeyRelease>", lambda e: self._ler_desconto())
+        self.controles_carrinho.append(self.entry_desconto)
         
         self.label_desconto_valor = tk.Label(
             frame_desconto,
@@ -278,7 +312,7 @@ class TelaVendas(tk.Toplevel):
         frame_botoes = tk.Frame(self, padx=10, pady=5)
         frame_botoes.pack(fill="x", padx=10, pady=(0, 10))
         
-        tk.Button(
+        self.btn_finalizar = tk.Button(
             frame_botoes,
             text="✅ FINALIZAR VENDA",
             command=self._finalizar_venda,
@@ -287,9 +321,10 @@ class TelaVendas(tk.Toplevel):
             font=("Arial", 12, "bold"),
             height=2,
             cursor="hand2"
-        ).pack(side="left", fill="x", expand=True, padx=(0, 5))
+        )
+        self.btn_finalizar.pack(side="left", fill="x", expand=True, padx=(0, 5))
         
-        tk.Button(
+        btn_limpar_carrinho = tk.Button(
             frame_botoes,
             text="🗑️ CANCELAR/LIMPAR",
             command=self._limpar_carrinho,
@@ -298,15 +333,30 @@ class TelaVendas(tk.Toplevel):
             font=("Arial", 12, "bold"),
             height=2,
             cursor="hand2"
-        ).pack(side="left", fill="x", expand=True, padx=(5, 0))
+        )
+        btn_limpar_carrinho.pack(side="left", fill="x", expand=True, padx=(5, 0))
+        self.controles_carrinho += [self.btn_finalizar, btn_limpar_carrinho]
     
     # =========================
     # CARREGAMENTO DE DADOS
     # =========================
     
-    def _carregar_clientes(self):
-        """Carrega a lista de clientes no combobox."""
-        self.clientes = listar_clientes(ativos_apenas=True)
+    def _carregar_clientes(self, selecionar_id=None):
+        """
+        Carrega a lista de clientes no combobox (na thread do banco).
+        
+        Args:
+            selecionar_id: ID do cliente a selecionar depois de carregar
+        """
+        executar_em_segundo_plano(
+            self,
+            listar_clientes,
+            ativos_apenas=True,
+            ao_concluir=lambda clientes: self._preencher_clientes(clientes, selecionar_id)
+        )
+    
+    def _preencher_clientes(self, clientes, selecionar_id=None):
+        self.clientes = clientes
         
         nomes = ["-- Nenhum cliente selecionado --"] + [
             f"{c.id} - {c.nome}" + (f" ({c.telefone})" if c.telefone else "")
@@ -315,10 +365,74 @@ class TelaVendas(tk.Toplevel):
         
         self.combo_cliente["values"] = nomes
         self.combo_cliente.current(0)
+        
+        # Seleciona o cliente pedido (ex.: recém-cadastrado)
+        for i, c in enumerate(self.clientes):
+            if c.id == selecionar_id:
+                self.combo_cliente.current(i + 1)
+                self.cliente_selecionado = c
+                break
     
     def _carregar_produtos(self):
-        """Carrega lista de produtos para busca."""
-        self.produtos = listar_produtos(ativos_apenas=True)
+        """
+        Carrega lista de produtos para busca.
+
+        A mesma lista carrega o cache de códigos de barras: enquanto a
+        tela estiver aberta, cada leitura do leitor é resolvida em memória.
+        """
+        executar_em_segundo_plano(self, _carregar_produtos_e_cache, ao_concluir=self._guardar_produtos)
+    
+    def _guardar_produtos(self, produtos):
+        self.produtos = produtos
+        self.produtos_por_id = {produto.id: produto for produto in produtos}
+    
+    def _atualizar_estoques(self, estoques):
+        """
+        Corrige o estoque dos produtos avisados na lista em memória.
+
+        Só os produtos do evento são tocados, sem reler o catálogo.
+        O cache de códigos de barras já foi corrigido pelo próprio evento.
+        O carrinho passa a usar o novo estoque como limite das quantidades.
+        """
+        for produto_id, estoque in estoques.items():
+            produto = self.produtos_por_id.get(produto_id)
+            if produto is not None:
+                produto.estoque = estoque
+        self.carrinho.atualizar_estoques(estoques)
+    
+    def _produtos_alterados(self, evento):
+        """Relê só os produtos alterados (ex.: preço editado na tela de produtos)."""
+        executar_em_segundo_plano(
+            self,
+            buscar_produtos_por_ids,
+            evento.produto_ids,
+            ao_concluir=self._trocar_produtos
+        )
+    
+    def _trocar_produtos(self, produtos):
+        """Atualiza, acrescenta ou retira (se desativados) produtos da lista."""
+        for produto in produtos:
+            atual = self.produtos_por_id.get(produto.id)
+            
+            if produto.ativo != 1:
+                if atual is not None:
+                    del self.produtos_por_id[produto.id]
+                    self.produtos.remove(atual)
+            elif atual is not None:
+                # Mesmo objeto: quem já tem a referência vê os dados novos
+                atual.__dict__.update(produto.__dict__)
+            else:
+                self.produtos.append(produto)
+                self.produtos_por_id[produto.id] = produto
+
+        # A edição do produto pode ter mudado o estoque
+        self.carrinho.atualizar_estoques({produto.id: produto.estoque for produto in produtos})
+
+    def destroy(self):
+        """Fecha a tela e libera o cache (desativado quando a última tela de vendas fechar)."""
+        # Pela thread do banco: roda depois de um carregamento ainda pendente
+        executar_no_banco(descartar_cache_codigo_barras)
+        super().destroy()
     
     # =========================
     # BUSCA E ADIÇÃO DE PRODUTOS
@@ -330,15 +444,32 @@ class TelaVendas(tk.Toplevel):
         Se encontrar apenas 1, adiciona automaticamente ao carrinho.
         Se encontrar vários, mostra uma janela para escolher.
         """
+        if self.gravando_venda:
+            return
+
         busca = self.entry_busca_produto.get().strip()
         
         if not busca:
             messagebox.showwarning("Atenção", "Digite um código ou nome do produto.", parent=self)
             return
         
-        # Tenta buscar por código de barras primeiro
-        produto = buscar_produto_por_codigo_barras(busca)
+        # Tenta buscar por código de barras primeiro: no cache, sem esperar o banco
+        produto = cache_produtos.obter(busca)
         
+        if produto:
+            self._adicionar_ao_carrinho(produto)
+            return
+        
+        # Fora do cache, consulta o banco na thread do banco
+        executar_em_segundo_plano(
+            self,
+            buscar_produto_por_codigo_barras,
+            busca,
+            ao_concluir=lambda produto: self._mostrar_resultado_busca(busca, produto)
+        )
+    
+    def _mostrar_resultado_busca(self, busca, produto):
+        """Adiciona o produto encontrado por código ou procura pelo nome."""
         if produto:
             self._adicionar_ao_carrinho(produto)
             return
@@ -384,6 +515,7 @@ class TelaVendas(tk.Toplevel):
         
         colunas = ("nome", "tamanho", "cor", "estoque", "preco")
         tree = ttk.Treeview(frame_lista, columns=colunas, show="headings")
+        scrollbar = ttk.Scrollbar(frame_lista, orient="vertical")
         
         tree.heading("nome", text="Nome")
         tree.heading("tamanho", text="Tamanho")
@@ -397,15 +529,22 @@ class TelaVendas(tk.Toplevel):
         tree.column("estoque", width=80, anchor="center")
         tree.column("preco", width=100, anchor="e")
         
-        for p in produtos:
-            tree.insert("", tk.END, values=(
+        # Uma busca curta ("a") pode encontrar milhares de produtos:
+        # a tabela recebe só os blocos próximos da rolagem
+        lista = ListaVirtual(
+            tree,
+            montar_linha=lambda p: (p.id, (
                 p.nome,
                 p.tamanho or "",
                 p.cor or "",
                 p.estoque,
                 formatar_moeda(p.preco_venda)
-            ), tags=(p.id,))
+            ), ()),
+            scrollbar=scrollbar
+        )
+        lista.carregar(FonteLista(produtos))
         
+        scrollbar.pack(side="right", fill="y")
         tree.pack(fill="both", expand=True)
         
         def adicionar_selecionado():
@@ -414,8 +553,7 @@ class TelaVendas(tk.Toplevel):
                 messagebox.showwarning("Atenção", "Selecione um produto.", parent=janela)
                 return
             
-            produto_id = int(tree.item(selecao[0])["tags"][0])
-            produto = next(p for p in produtos if p.id == produto_id)
+            produto = lista.item(selecao[0])
             
             self._adicionar_ao_carrinho(produto)
             janela.destroy()
@@ -444,6 +582,10 @@ class TelaVendas(tk.Toplevel):
     
     def _adicionar_ao_carrinho(self, produto):
         """Adiciona um produto ao carrinho."""
+        # Busca que terminou depois de a venda ser enviada ao banco
+        if self.gravando_venda:
+            return
+        
         if produto.estoque <= 0:
             messagebox.showwarning(
                 "Estoque indisponível",
@@ -452,46 +594,28 @@ class TelaVendas(tk.Toplevel):
             )
             return
         
-        # Verifica se o produto já está no carrinho
-        for item in self.itens_carrinho:
-            if item.produto_id == produto.id:
-                # Já está no carrinho, aumenta a quantidade
-                if item.quantidade < produto.estoque:
-                    item.quantidade += 1
-                    item.calcular_subtotal()
-                    self._atualizar_lista_carrinho()
-                    self._limpar_busca()
-                    messagebox.showinfo(
-                        "Quantidade atualizada",
-                        f"Quantidade de '{produto.nome}' aumentada para {item.quantidade}.",
-                        parent=self
-                    )
-                else:
-                    messagebox.showwarning(
-                        "Estoque insuficiente",
-                        f"Não há estoque suficiente. Disponível: {produto.estoque}",
-                        parent=self
-                    )
-                return
+        ja_no_carrinho = produto.id in self.carrinho
         
-        # Produto novo no carrinho
-        item = ItemVenda(
-            produto_id=produto.id,
-            quantidade=1,
-            preco_unitario=produto.preco_venda,
-            produto_nome=f"{produto.nome} ({produto.tamanho or ''} {produto.cor or ''})"
-        )
-        item.calcular_subtotal()
+        try:
+            item = self.carrinho.adicionar(produto)
+        except ValueError as e:
+            messagebox.showwarning("Estoque insuficiente", str(e), parent=self)
+            return
         
-        self.itens_carrinho.append(item)
-        self._atualizar_lista_carrinho()
         self._limpar_busca()
         
-        messagebox.showinfo(
-            "Produto adicionado",
-            f"'{produto.nome}' adicionado ao carrinho!",
-            parent=self
-        )
+        if ja_no_carrinho:
+            messagebox.showinfo(
+                "Quantidade atualizada",
+                f"Quantidade de '{produto.nome}' aumentada para {item.quantidade}.",
+                parent=self
+            )
+        else:
+            messagebox.showinfo(
+                "Produto adicionado",
+                f"'{produto.nome}' adicionado ao carrinho!",
+                parent=self
+            )
     
     def _limpar_busca(self):
         """Limpa o campo de busca e foca nele."""
@@ -502,39 +626,55 @@ class TelaVendas(tk.Toplevel):
     # GERENCIAMENTO DO CARRINHO
     # =========================
     
-    def _atualizar_lista_carrinho(self):
-        """Atualiza a exibição da lista do carrinho."""
-        # Limpa a árvore
-        for item in self.tree_carrinho.get_children():
-            self.tree_carrinho.delete(item)
-        
-        # Adiciona os itens
-        for i, item in enumerate(self.itens_carrinho):
-            self.tree_carrinho.insert("", tk.END, values=(
-                item.produto_nome,
-                item.quantidade,
-                formatar_moeda(item.preco_unitario),
-                formatar_moeda(item.subtotal)
-            ), tags=(i,))
+    def _carrinho_mudou(self, evento, item):
+        """
+        Mostra na tabela uma mudança no carrinho.
+
+        Cada linha é identificada pelo id do produto: cada mudança mexe
+        só na linha do item, e os totais vêm prontos do carrinho.
+        """
+        if evento == "adicionado":
+            self.tree_carrinho.insert("", tk.END, iid=item.produto_id, values=self._valores_item(item))
+        elif evento == "alterado":
+            self.tree_carrinho.item(item.produto_id, values=self._valores_item(item))
+        elif evento == "removido":
+            self.tree_carrinho.delete(item.produto_id)
+        elif evento == "limpo":
+            self.tree_carrinho.delete(*self.tree_carrinho.get_children())
         
         self._atualizar_totais()
     
-    def _atualizar_totais(self):
-        """Atualiza os valores de subtotal, desconto e total."""
-        # Calcula subtotal
-        subtotal = sum(item.subtotal for item in self.itens_carrinho)
+    def _valores_item(self, item):
+        return (
+            item.produto_nome,
+            item.quantidade,
+            formatar_moeda(item.preco_unitario),
+            formatar_moeda(item.subtotal)
+        )
+    
+    def _item_selecionado(self):
+        """Item do carrinho selecionado na tabela (ou None)."""
+        selecao = self.tree_carrinho.selection()
+        if not selecao:
+            return None
         
-        # Pega desconto
+        return self.carrinho.item(int(selecao[0]))
+    
+    def _ler_desconto(self):
+        """Passa o desconto digitado para o carrinho."""
         try:
             desconto = normalizar_numero(self.entry_desconto.get())
-            if desconto < 0:
-                desconto = 0
-            if desconto > subtotal:
-                desconto = subtotal
         except:
             desconto = 0
         
-        # Calcula total
+        self.carrinho.definir_desconto(desconto)
+    
+    def _atualizar_totais(self):
+        """Atualiza os valores de subtotal, desconto e total."""
+        subtotal = self.carrinho.subtotal
+        
+        # Na tela, o desconto fica limitado ao subtotal
+        desconto = min(self.carrinho.desconto, subtotal)
         total = subtotal - desconto
         
         # Atualiza labels
@@ -544,43 +684,31 @@ class TelaVendas(tk.Toplevel):
     
     def _aumentar_quantidade(self):
         """Aumenta a quantidade do item selecionado."""
-        selecao = self.tree_carrinho.selection()
-        if not selecao:
-            messagebox.showwarning("Atenção", "Selecione um item.", parent=self)
+        if self.gravando_venda:
             return
-        
-        indice = int(self.tree_carrinho.item(selecao[0])["tags"][0])
-        item = self.itens_carrinho[indice]
-        
-        # Busca o produto para verificar estoque
-        produto = next(p for p in self.produtos if p.id == item.produto_id)
-        
-        if item.quantidade >= produto.estoque:
-            messagebox.showwarning(
-                "Estoque insuficiente",
-                f"Não há mais estoque. Disponível: {produto.estoque}",
-                parent=self
-            )
+
+        item = self._item_selecionado()
+        if not item:
+            messagebox.showwarning("Atenção", "Selecione um item.", parent=self)
             return
         
-        item.quantidade += 1
-        item.calcular_subtotal()
-        self._atualizar_lista_carrinho()
+        try:
+            self.carrinho.alterar_quantidade(item.produto_id, item.quantidade + 1)
+        except ValueError as e:
+            messagebox.showwarning("Estoque insuficiente", str(e), parent=self)
     
     def _diminuir_quantidade(self):
         """Diminui a quantidade do item selecionado."""
-        selecao = self.tree_carrinho.selection()
-        if not selecao:
+        if self.gravando_venda:
+            return
+
+        item = self._item_selecionado()
+        if not item:
             messagebox.showwarning("Atenção", "Selecione um item.", parent=self)
             return
         
-        indice = int(self.tree_carrinho.item(selecao[0])["tags"][0])
-        item = self.itens_carrinho[indice]
-        
         if item.quantidade > 1:
-            item.quantidade -= 1
-            item.calcular_subtotal()
-            self._atualizar_lista_carrinho()
+            self.carrinho.alterar_quantidade(item.produto_id, item.quantidade - 1)
         else:
             messagebox.showinfo(
                 "Remover item",
@@ -590,21 +718,20 @@ class TelaVendas(tk.Toplevel):
     
     def _remover_item(self):
         """Remove o item selecionado do carrinho."""
-        selecao = self.tree_carrinho.selection()
-        if not selecao:
+        if self.gravando_venda:
+            return
+
+        item = self._item_selecionado()
+        if not item:
             messagebox.showwarning("Atenção", "Selecione um item para remover.", parent=self)
             return
         
-        indice = int(self.tree_carrinho.item(selecao[0])["tags"][0])
-        item = self.itens_carrinho[indice]
-        
         if messagebox.askyesno(
             "Confirmar remoção",
             f"Remover '{item.produto_nome}' do carrinho?",
             parent=self
         ):
-            del self.itens_carrinho[indice]
-            self._atualizar_lista_carrinho()
+            self.carrinho.remover(item.produto_id)
     
     # =========================
     # GERENCIAMENTO DE CLIENTE
@@ -668,25 +795,25 @@ class TelaVendas(tk.Toplevel):
                 cpf_cnpj=entry_cpf.get().strip() or None
             )
             
-            try:
-                cliente_cadastrado = inserir_cliente(cliente)
+            def cadastrado(cliente_cadastrado):
                 messagebox.showinfo(
                     "Sucesso",
                     f"Cliente '{cliente_cadastrado.nome}' cadastrado!",
                     parent=janela
                 )
-                self._carregar_clientes()
                 
-                # Seleciona o cliente recém-cadastrado
-                for i, c in enumerate(self.clientes):
-                    if c.id == cliente_cadastrado.id:
-                        self.combo_cliente.current(i + 1)
-                        self.cliente_selecionado = c
-                        break
+                # Recarrega e seleciona o cliente recém-cadastrado
+                self._carregar_clientes(selecionar_id=cliente_cadastrado.id)
                 
                 janela.destroy()
-            except Exception as e:
-                messagebox.showerror("Erro", str(e), parent=janela)
+            
+            executar_em_segundo_plano(
+                janela,
+                inserir_cliente,
+                cliente,
+                ao_concluir=cadastrado,
+                ao_falhar=lambda e: messagebox.showerror("Erro", str(e), parent=janela)
+            )
         
         # Botões
         frame_botoes = tk.Frame(janela, pady=10)
@@ -715,7 +842,7 @@ class TelaVendas(tk.Toplevel):
     def _finalizar_venda(self):
         """Finaliza a venda e salva no banco de dados."""
         # Validações
-        if not self.itens_carrinho:
+        if not self.carrinho:
             messagebox.showwarning(
                 "Carrinho vazio",
                 "Adicione produtos ao carrinho antes de finalizar.",
@@ -723,15 +850,9 @@ class TelaVendas(tk.Toplevel):
             )
             return
         
-        # Calcula valores
-        subtotal = sum(item.subtotal for item in self.itens_carrinho)
-        
-        try:
-            desconto = normalizar_numero(self.entry_desconto.get())
-        except:
-            desconto = 0
-        
-        total = subtotal - desconto
+        # Valores já calculados pelo carrinho
+        self._ler_desconto()
+        total = self.carrinho.total
         
         if total < 0:
             messagebox.showerror(
@@ -753,18 +874,14 @@ class TelaVendas(tk.Toplevel):
             return
         
         # Cria a venda
-        venda = Venda(
-            total=total,
-            desconto=desconto,
+        venda = self.carrinho.criar_venda(
             forma_pagamento=self.combo_pagamento.get(),
-            cliente_id=self.cliente_selecionado.id if self.cliente_selecionado else None,
-            itens=self.itens_carrinho.copy()
+            cliente_id=self.cliente_selecionado.id if self.cliente_selecionado else None
         )
         
-        # Salva no banco
-        try:
-            venda_id = registrar_venda(venda)
-            
+        def concluida(resultado):
+            venda_id, _ = resultado
+            self._bloquear_carrinho(False)
             messagebox.showinfo(
                 "✅ Venda Finalizada!",
                 f"Venda #{venda_id} registrada com sucesso!\n\n"
@@ -773,22 +890,40 @@ class TelaVendas(tk.Toplevel):
                 parent=self
             )
             
-            # Limpa o carrinho para nova venda
-            self._limpar_carrinho()
-            
-            # Recarrega produtos (estoque foi atualizado)
-            self._carregar_produtos()
-            
-        except Exception as e:
+            # Limpa o carrinho para nova venda (o estoque dos produtos
+            # vendidos chega pelo evento VendaRegistrada)
+            self._limpar_carrinho(confirmar=False)
+        
+        def falhou(e):
+            self._bloquear_carrinho(False)
             messagebox.showerror(
                 "Erro ao finalizar venda",
                 f"Não foi possível finalizar a venda:\n\n{str(e)}",
                 parent=self
             )
+        
+        # Salva no banco (na thread do banco). O carrinho fica bloqueado
+        # até a resposta: a venda não é registrada duas vezes e nenhum
+        # item lido nesse meio-tempo se perde na limpeza do carrinho.
+        self._bloquear_carrinho(True)
+        executar_em_segundo_plano(
+            self,
+            registrar_venda,
+            venda,
+            ao_concluir=concluida,
+            ao_falhar=falhou
+        )
+    
+    def _bloquear_carrinho(self, bloquear):
+        """Bloqueia (ou libera) a leitura de produtos e a edição do carrinho."""
+        self.gravando_venda = bloquear
+        estado = "disabled" if bloquear else "normal"
+        for controle in self.controles_carrinho:
+            controle.config(state=estado)
     
-    def _limpar_carrinho(self):
+    def _limpar_carrinho(self, confirmar=True):
         """Limpa o carrinho para uma nova venda."""
-        if self.itens_carrinho:
+        if confirmar and self.carrinho:
             if not messagebox.askyesno(
                 "Limpar carrinho",
                 "Tem certeza que deseja limpar o carrinho?",
@@ -796,12 +931,18 @@ class TelaVendas(tk.Toplevel):
             ):
                 return
         
-        self.itens_carrinho = []
         self.cliente_selecionado = None
         self.combo_cliente.current(0)
         self.entry_desconto.delete(0, tk.END)
         self.entry_desconto.insert(0, "0")
         self.combo_pagamento.current(0)
         
-        self._atualizar_lista_carrinho()
-        self._limpar_busca()
\ No newline at end of file
+        self.carrinho.limpar()
+        self._limpar_busca()
+
+
+def _carregar_produtos_e_cache():
+    """Lista os produtos ativos e carrega o cache de códigos (na thread do banco)."""
+    produtos = listar_produtos(ativos_apenas=True)
+    aquecer_cache_codigo_barras(produtos)
+    return produtos